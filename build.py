@@ -9,6 +9,7 @@ Usage:
     python build.py --validate cards_FINAL.json   # Validate only, don't build
     python build.py --source cards_FINAL.json     # Use this as source, run pipeline
     python build.py --status                      # Show what would be rebuilt
+    python build.py --source cards_FINAL.json --force  # Rebuild every stage
 
 SAFE BY DEFAULT:
 - Validates input data before any processing
@@ -18,15 +19,40 @@ SAFE BY DEFAULT:
 """
 
 import argparse
-import hashlib
+import functools
+import gzip
+import importlib.util
 import json
+import multiprocessing
 import os
+import pickle
 import shutil
+import subprocess
 import sys
-from dataclasses import dataclass, asdict
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Hashing is shared with the per-card caches in scripts/pipeline/card_cache.py
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts" / "pipeline"))
+from card_cache import HASH_ALGORITHM, new_hasher
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import resource  # POSIX only: CPU time and peak RSS of stage processes
+except ImportError:
+    resource = None
+
+# ru_maxrss is in bytes on macOS and in kilobytes on Linux
+MAXRSS_PER_MB = 1024 * 1024 if sys.platform == 'darwin' else 1024
 
 
 # =============================================================================
@@ -235,6 +261,29 @@ def print_validation_report(success: bool, errors: List[str], warnings: List[str
 # CONFIGURATION
 # =============================================================================
 
+# Stages run by functions in this file (bundle, catalog) are
+# fingerprinted with it, so editing their writers re-runs them
+BUILD_SCRIPT = Path(__file__).resolve()
+
+# Final outputs, written to dist/ and copied to the webapp
+DIST_FILES = ["cards.json", "objectives.json", "recommendations.json"]
+
+# Binary card catalog written next to dist/cards.json by --catalog
+CATALOG_FILE = "cards.m4ec"
+
+# Backup retention: a backup is kept if it is one of the newest BACKUP_KEEP
+# for its file OR younger than BACKUP_MAX_AGE_DAYS
+BACKUP_KEEP = 10
+BACKUP_MAX_AGE_DAYS = 30
+
+# --watch: poll interval, and how long changes must settle before rebuilding
+WATCH_INTERVAL = 0.5
+WATCH_DEBOUNCE = 0.3
+
+# --perf-budget ignores slowdowns smaller than this (timer noise on tiny stages)
+PERF_MIN_SECONDS = 0.25
+
+
 class Config:
     """Pipeline configuration."""
     
@@ -257,11 +306,13 @@ class Config:
         self.intermediate_dir = self.root / "data" / "intermediate"
         self.dist_dir = self.root / "data" / "dist"
         self.backup_dir = self.root / "data" / "backups"
-        self.pipeline_dir = self.root / "pipeline"
+        self.pipeline_dir = self.root / "scripts" / "pipeline"
         self.webapp_data_dir = self.root / "src" / "data"
         
         # Build state
         self.build_state_file = self.intermediate_dir / ".build_state.json"
+        self.stat_cache_file = self.intermediate_dir / ".stat_cache.json"
+        self.metrics_file = self.intermediate_dir / "build_metrics.json"
     
     def ensure_dirs(self):
         """Create required directories."""
@@ -282,10 +333,16 @@ class BuildState:
     source_file: str = ""
     source_hash: str = ""
     file_hashes: Dict[str, str] = None
+    stages: Dict[str, dict] = None  # stage name -> last recorded fingerprint
+    raw_files: Dict[str, str] = None  # raw asset -> digest at last build
     
     def __post_init__(self):
         if self.file_hashes is None:
             self.file_hashes = {}
+        if self.stages is None:
+            self.stages = {}
+        if self.raw_files is None:
+            self.raw_files = {}
     
     @classmethod
     def load(cls, path: Path) -> "BuildState":
@@ -300,18 +357,740 @@ class BuildState:
     def save(self, path: Path):
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(asdict(self), f, indent=2)
+            json.dump(asdict(self), f, indent=2, sort_keys=True)
 
 
-def hash_file(path: Path) -> str:
-    """MD5 hash of a file."""
-    hasher = hashlib.md5()
+def digest_file(path: Path) -> str:
+    """Hash a file's contents (no stat cache)."""
+    hasher = new_hasher()
     with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(65536), b''):
+        for chunk in iter(lambda: f.read(1 << 20), b''):
             hasher.update(chunk)
     return hasher.hexdigest()
 
 
+class StatCache:
+    """
+    path -> (size, mtime_ns, inode, digest), stored next to .build_state.json.
+    
+    A file is only re-hashed when its stat tuple changes, so checking an
+    unchanged tree of thousands of PDFs costs one stat() per file.
+    """
+    
+    def __init__(self):
+        self.path: Optional[Path] = None
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+        self.hashed = 0  # files actually read this run
+    
+    def load(self, path: Path):
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('algorithm') == HASH_ALGORITHM:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, OSError):
+                pass
+    
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        # Drop files that no longer exist
+        self.entries = {k: v for k, v in self.entries.items() if os.path.exists(k)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'algorithm': HASH_ALGORITHM, 'entries': self.entries}, f)
+        self.dirty = False
+    
+    def digest(self, path: Path) -> str:
+        key = str(path.resolve())
+        st = os.stat(key)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        entry = self.entries.get(key)
+        if entry and entry[:3] == signature:
+            return entry[3]
+        digest = digest_file(path)
+        self.entries[key] = signature + [digest]
+        self.dirty = True
+        self.hashed += 1
+        return digest
+
+
+STAT_CACHE = StatCache()
+
+
+def hash_file(path: Path) -> str:
+    """Digest of a file, re-hashed only if its stat tuple changed."""
+    return STAT_CACHE.digest(path)
+
+
+def hash_path(path: Path) -> Optional[str]:
+    """
+    Hash a file or a whole directory tree.
+    Returns None if the path does not exist.
+    
+    Directories hash their sorted (relative path, file hash) pairs, so
+    adding, removing, renaming or editing any file changes the digest.
+    """
+    if path.is_file():
+        return hash_file(path)
+    if not path.is_dir():
+        return None
+    
+    hasher = new_hasher()
+    for f in sorted(p for p in path.rglob('*') if p.is_file()):
+        hasher.update(f.relative_to(path).as_posix().encode('utf-8'))
+        hasher.update(hash_file(f).encode('ascii'))
+    return hasher.hexdigest()
+
+
+def raw_asset_digests(config: Config) -> Dict[str, str]:
+    """Digest of every raw asset (card PDFs, objective images, card images)."""
+    roots = [config.raw_dir]
+    if config.card_images_dir:
+        roots.append(config.card_images_dir)
+    digests = {}
+    for root in roots:
+        if root.exists():
+            for f in sorted(p for p in root.rglob('*') if p.is_file()):
+                digests[rel_path(config, f)] = hash_file(f)
+    return digests
+
+
+def diff_raw_assets(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Added / removed / modified raw assets between two snapshots."""
+    return {
+        'added': sorted(k for k in new if k not in old),
+        'removed': sorted(k for k in old if k not in new),
+        'modified': sorted(k for k in new if k in old and old[k] != new[k]),
+    }
+
+
+def print_raw_asset_changes(config: Config, state: BuildState):
+    """Report exactly which raw assets changed since the last build."""
+    start = time.perf_counter()
+    current = raw_asset_digests(config)
+    changes = diff_raw_assets(state.raw_files, current)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    total = sum(len(v) for v in changes.values())
+    print(f"\nRaw assets: {len(current)} files, {total} changed since last build "
+          f"({elapsed_ms:.0f} ms, {STAT_CACHE.hashed} re-hashed)")
+    if not state.raw_files:
+        print("  (no snapshot from a previous build)")
+        return
+    for kind, marker in (('added', '+'), ('removed', '-'), ('modified', '~')):
+        for path in changes[kind][:20]:
+            print(f"  {marker} {path}")
+        if len(changes[kind]) > 20:
+            print(f"  {marker} ... and {len(changes[kind]) - 20} more {kind}")
+
+
+# =============================================================================
+# STAGE GRAPH - Incremental builds
+# =============================================================================
+
+@dataclass
+class Stage:
+    """
+    One node in the build DAG.
+    
+    A stage is skipped when its input hashes, code hash and config hash all
+    match the last recorded run AND its outputs still hash to what that run
+    produced (so deleting or hand-editing an output forces a rebuild).
+    """
+    name: str
+    run: Callable[[], bool]
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    code: List[Path] = field(default_factory=list)     # scripts the stage runs
+    config: List[Path] = field(default_factory=list)   # corrections, taxonomy, ...
+    params: Dict[str, str] = field(default_factory=dict)  # CLI options that change output
+    deps: List[str] = field(default_factory=list)
+    # True if run() does CPU-bound Python work in the build process itself.
+    # Parallel builds send these to a process pool (run must be picklable);
+    # stages that shell out to a script only wait, so they run on threads.
+    cpu: bool = False
+    # Watch mode: card lists read from / kept in CARD_MEMORY instead of files
+    memory_inputs: List[str] = field(default_factory=list)
+    memory: bool = False
+
+
+def rel_path(config: Config, path: Path) -> str:
+    """Path relative to project root (stable key for build state)."""
+    try:
+        return path.resolve().relative_to(config.root).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def combined_hash(paths: List[Path], params: Dict[str, str] = None) -> str:
+    """Single digest over several files plus optional parameters."""
+    hasher = new_hasher()
+    for path in paths:
+        hasher.update(path.name.encode('utf-8'))
+        hasher.update((hash_path(path) or '-').encode('ascii'))
+    for key in sorted(params or {}):
+        hasher.update(f"{key}={params[key]}".encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def stage_fingerprint(config: Config, stage: Stage) -> dict:
+    """Everything that decides whether a stage's outputs are still valid."""
+    inputs = {rel_path(config, p): hash_path(p) for p in stage.inputs}
+    inputs.update({f"memory:{name}": CARD_MEMORY.digest(name) for name in stage.memory_inputs})
+    return {
+        'inputs': inputs,
+        'code': combined_hash(stage.code),
+        'config': combined_hash(stage.config, stage.params),
+    }
+
+
+def output_hashes(config: Config, stage: Stage) -> Dict[str, Optional[str]]:
+    return {rel_path(config, p): hash_path(p) for p in stage.outputs}
+
+
+def stage_is_current(config: Config, stage: Stage, state: BuildState,
+                     fingerprint: dict) -> bool:
+    """True if the recorded run of this stage is still valid."""
+    record = state.stages.get(stage.name)
+    if not record:
+        return False
+    if stage.memory and not CARD_MEMORY.holds(stage.name, fingerprint):
+        return False
+    for key in ('inputs', 'code', 'config'):
+        if record.get(key) != fingerprint[key]:
+            return False
+    outputs = output_hashes(config, stage)
+    if any(h is None for h in outputs.values()):
+        return False
+    return record.get('outputs') == outputs
+
+
+def topo_order(stages: List[Stage]) -> List[Stage]:
+    """
+    Order stages so every stage runs after its deps.
+    Ties keep declaration order, so the order is deterministic.
+    """
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{s.name}' depends on unknown stage(s): {missing}")
+    
+    ordered = []
+    done = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [s for s in remaining if all(d in done for d in s.deps)]
+        if not ready:
+            raise ValueError(f"Cycle in stage graph: {[s.name for s in remaining]}")
+        for s in ready:
+            ordered.append(s)
+            done.add(s.name)
+        remaining = [s for s in remaining if s.name not in done]
+    return ordered
+
+
+def run_script(config: Config, script: str, *args) -> bool:
+    """Run a pipeline script with the current interpreter."""
+    cmd = [sys.executable, str(config.pipeline_dir / script)] + [str(a) for a in args]
+    if hasattr(os, 'wait4'):
+        # wait4 gives this child's own CPU time and peak RSS, even when
+        # other stages are running concurrently
+        proc = subprocess.Popen(cmd, cwd=config.pipeline_dir)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = returncode = os.waitstatus_to_exitcode(status)
+        record_child_usage(usage.ru_utime + usage.ru_stime, usage.ru_maxrss / MAXRSS_PER_MB)
+    else:
+        returncode = subprocess.run(cmd, cwd=config.pipeline_dir).returncode
+    if returncode != 0:
+        print(f"  [X] {script} exited with code {returncode}")
+        return False
+    return True
+
+
+# =============================================================================
+# BUILD METRICS - Per-stage timing, memory and throughput
+# =============================================================================
+
+_stage_usage = threading.local()
+
+
+def record_child_usage(cpu_s: float, peak_rss_mb: float):
+    """Attribute a finished child process to the stage running on this thread."""
+    children = getattr(_stage_usage, 'children', None)
+    if children is not None:
+        children.append((cpu_s, peak_rss_mb))
+
+
+def measured_run(run: Callable[[], bool]) -> Tuple[bool, dict]:
+    """
+    Run a stage and measure it. Executes on the worker thread (or pool
+    process) that runs the stage, so CPU time is this stage's own:
+    thread CPU time plus the CPU time of every script it launched.
+    
+    Peak RSS is the largest child's peak for script stages. Stages that
+    work in-process get process_peak_rss_mb instead: the high-water mark of
+    the process they ran in, which also covers earlier stages in it.
+    (tracemalloc would give a per-stage peak, but slows a stage ~6x.)
+    """
+    _stage_usage.children = []
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        ok = run()
+    finally:
+        children = _stage_usage.children
+        _stage_usage.children = None
+    
+    usage = {
+        'wall_s': round(time.perf_counter() - wall_start, 3),
+        'cpu_s': round(time.thread_time() - cpu_start + sum(c for c, _ in children), 3),
+    }
+    if children:
+        usage['peak_rss_mb'] = round(max(m for _, m in children), 1)
+    elif resource:
+        usage['process_peak_rss_mb'] = round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / MAXRSS_PER_MB, 1)
+    return ok, usage
+
+
+def count_cards(path: Path) -> Optional[int]:
+    """Cards (or objectives) in a pipeline JSON file, else None."""
+    if path.suffix != '.json' or not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        if isinstance(data.get('cards'), list):
+            return len(data['cards'])
+        if isinstance(data.get('total_cards'), int):
+            return data['total_cards']
+        if 'schemes' in data or 'strategies' in data:
+            return len(data.get('schemes') or {}) + len(data.get('strategies') or {})
+    return None
+
+
+class CardCounter:
+    """count_cards memoized by content digest, so each file is parsed once per build."""
+    
+    def __init__(self):
+        self.counts: Dict[str, Optional[int]] = {}
+    
+    def total(self, paths: List[Path]) -> Optional[int]:
+        counts = []
+        for path in paths:
+            if not path.exists():
+                continue
+            digest = hash_path(path)
+            if digest not in self.counts:
+                self.counts[digest] = count_cards(path)
+            counts.append(self.counts[digest])
+        counts = [c for c in counts if c is not None]
+        return max(counts) if counts else None
+
+
+def stage_metrics(stage: Stage, usage: dict, counter: CardCounter) -> dict:
+    """Structured metrics record for one stage run."""
+    record = dict(usage)
+    record['cards_in'] = counter.total(stage.inputs) or (
+        CARD_MEMORY.count(stage.memory_inputs[0]) if stage.memory_inputs else None)
+    record['cards_out'] = counter.total(stage.outputs) or (
+        CARD_MEMORY.count(stage.name) if stage.memory else None)
+    cards = record['cards_out'] or record['cards_in']
+    record['cards_per_s'] = round(cards / usage['wall_s'], 1) if cards and usage['wall_s'] else None
+    record['finished'] = datetime.now().isoformat()
+    return record
+
+
+def load_metrics(config: Config) -> dict:
+    if config.metrics_file.exists():
+        try:
+            with open(config.metrics_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {}
+
+
+def find_regressions(previous: Dict[str, dict], current: Dict[str, dict],
+                     budget_pct: float) -> List[str]:
+    """Stages whose wall time grew by more than budget_pct over their last run."""
+    regressions = []
+    for name, record in current.items():
+        base = previous.get(name)
+        if not base or not base.get('wall_s'):
+            continue
+        delta = record['wall_s'] - base['wall_s']
+        if delta > PERF_MIN_SECONDS and delta / base['wall_s'] * 100 > budget_pct:
+            regressions.append(name)
+    return regressions
+
+
+def print_metrics_report(previous: Dict[str, dict], current: Dict[str, dict]):
+    """
+    Per-stage table, compared with each stage's previous run. Process-wide
+    peaks (in-process stages) are marked with '*'.
+    """
+    if not current:
+        return
+    print(f"\n{'Stage':20} {'Wall':>8} {'CPU':>8} {'RSS MB':>9} {'In':>6} {'Out':>6} {'Cards/s':>9}  vs last")
+    process_wide = False
+    for name, r in current.items():
+        if r.get('peak_rss_mb') is not None:
+            rss = f"{r['peak_rss_mb']:8.1f} "
+        elif r.get('process_peak_rss_mb') is not None:
+            rss = f"{r['process_peak_rss_mb']:8.1f}*"
+            process_wide = True
+        else:
+            rss = f"{'-':>8} "
+        base = previous.get(name)
+        if base and base.get('wall_s'):
+            change = f"{(r['wall_s'] - base['wall_s']) / base['wall_s'] * 100:+.0f}%"
+        else:
+            change = "new"
+        print(f"{name:20} {r['wall_s']:7.2f}s {r['cpu_s']:7.2f}s {rss} "
+              f"{r['cards_in'] if r['cards_in'] is not None else '-':>6} "
+              f"{r['cards_out'] if r['cards_out'] is not None else '-':>6} "
+              f"{r['cards_per_s'] if r['cards_per_s'] is not None else '-':>9}  {change}")
+    if process_wide:
+        print("* peak RSS of the whole build process, not just this stage")
+
+
+def save_metrics(config: Config, previous: dict, current: Dict[str, dict],
+                 regressions: List[str], total_wall_s: float):
+    """
+    Write build_metrics.json. Each stage keeps its most recent run, so
+    skipped stages keep their old numbers as the baseline. Stages that
+    blew the perf budget keep their old baseline too; run_build also drops
+    their build state, so the next build re-runs them and the regression
+    keeps failing until it is fixed.
+    """
+    stages = dict(previous.get('stages', {}))
+    stages.update({k: v for k, v in current.items() if k not in regressions})
+    with open(config.metrics_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'last_build': datetime.now().isoformat(),
+            'total_wall_s': round(total_wall_s, 3),
+            'ran': list(current),
+            'regressions': {k: current[k] for k in regressions},
+            'stages': stages,
+        }, f, indent=2)
+
+
+def build_stage_graph(config: Config, source_path: Optional[Path] = None,
+                      skip_webapp: bool = False, catalog: bool = False,
+                      jobs: int = 1) -> List[Stage]:
+    """
+    The card pipeline as a DAG:
+    
+        parse -> repair_all -> fix_cards -> tag_extractor -> ability_parser
+              -> role_classifier_v2 -> enrich_meta -> bundle
+        crew_cards ---------------------------------------> bundle
+        upgrade_cards ------------------------------------> bundle
+        objectives
+    
+    With a source file, "parse" copies the source into the pipeline instead
+    of parsing PDFs and the raw-asset scans (crew_cards, upgrade_cards,
+    objectives) are left out. The scans have no deps, so a parallel build
+    runs them alongside the card chain. PDF parsing and objective OCR can
+    run at the same time, so they split the `jobs` worker processes between
+    them (PDF parsing gets all of them when there is no OCR stage).
+    """
+    pipe = config.pipeline_dir
+    inter = config.intermediate_dir
+    
+    extracted = inter / "cards_extracted.json"
+    repaired = inter / "cards_repaired.json"
+    fixed = inter / "cards_fixed.json"
+    tagged = inter / "cards_tagged.json"
+    parsed = inter / "cards_parsed.json"
+    roles = inter / "cards_roles.json"
+    dist_files = [config.dist_dir / name for name in DIST_FILES]
+    # Per-card result caches: a dirty stage only recomputes changed cards
+    card_cache = inter / ".card_cache"
+    
+    stages = []
+    
+    if source_path:
+        stages.append(Stage(
+            name="parse",
+            run=lambda: inject_source(config, source_path),
+            inputs=[source_path],
+            outputs=[extracted],
+        ))
+    else:
+        parse_args = ['--input', config.card_pdfs_dir, '--output', extracted,
+                      '--cache', inter / ".parse_cache"]
+        params = {}
+        parse_inputs = [config.card_pdfs_dir]
+        if config.card_images_dir:
+            parse_args += ['--images-dir', config.card_images_dir]
+            params['images_dir'] = str(config.card_images_dir)
+            # Front images are the health fallback: an edited image re-runs parse
+            parse_inputs.append(config.card_images_dir)
+        ocr_jobs = jobs // 2 if objective_ocr_enabled(config) else 0
+        parse_jobs = jobs - ocr_jobs
+        if parse_jobs > 1:
+            # Not a param: worker count does not change the output
+            parse_args += ['--workers', str(parse_jobs)]
+        stages.append(Stage(
+            name="parse",
+            run=lambda: run_script(config, "parse_cards.py", *parse_args),
+            inputs=parse_inputs,
+            outputs=[extracted],
+            code=[pipe / "parse_cards.py", pipe / "keyword_matcher.py"],
+            params=params,
+        ))
+        stages += build_scan_stages(config, ocr_jobs)
+    
+    stages.append(Stage(
+        name="repair_all",
+        run=lambda: run_script(config, "repair_all.py", extracted, '--output', repaired, '--quiet'),
+        inputs=[extracted], outputs=[repaired],
+        code=[pipe / "repair_all.py"],
+        deps=["parse"],
+    ))
+    stages.append(Stage(
+        name="fix_cards",
+        run=lambda: run_script(config, "fix_cards.py", '--input', repaired, '--output', fixed,
+                               '--corrections', pipe / "corrections.json"),
+        inputs=[repaired], outputs=[fixed],
+        code=[pipe / "fix_cards.py"],
+        config=[pipe / "corrections.json"],
+        deps=["repair_all"],
+    ))
+    stages.append(Stage(
+        name="tag_extractor",
+        run=lambda: run_script(config, "tag_extractor.py", '--input', fixed, '--output', tagged,
+                               '--cache', card_cache / "tag_extractor.json"),
+        inputs=[fixed], outputs=[tagged],
+        code=[pipe / "tag_extractor.py", pipe / "card_cache.py"],
+        deps=["fix_cards"],
+    ))
+    stages.append(Stage(
+        name="ability_parser",
+        run=lambda: run_script(config, "ability_parser.py", tagged, '-o', parsed,
+                               '--cache', card_cache / "ability_parser.json"),
+        inputs=[tagged], outputs=[parsed],
+        code=[pipe / "ability_parser.py", pipe / "card_cache.py"],
+        deps=["tag_extractor"],
+    ))
+    stages.append(Stage(
+        name="role_classifier_v2",
+        run=lambda: run_script(config, "role_classifier_v2.py", parsed, '-o', roles,
+                               '--corrections', pipe / "corrections_roles.json",
+                               '--cache', card_cache / "role_classifier_v2.json"),
+        inputs=[parsed], outputs=[roles],
+        code=[pipe / "role_classifier_v2.py", pipe / "card_cache.py"],
+        config=[pipe / "corrections_roles.json"],
+        deps=["ability_parser"],
+    ))
+    stages.append(Stage(
+        name="enrich_meta",
+        run=lambda: run_enrichment(config, roles),
+        inputs=[roles], outputs=dist_files,
+        code=[pipe / "enrich_meta.py", pipe / "faction_meta.py"],
+        deps=["role_classifier_v2"],
+    ))
+    
+    bundled = [s for s in stages if s.outputs and s.outputs[0].parent == config.dist_dir]
+    bundle_files = [p for s in bundled for p in s.outputs]
+    
+    if catalog:
+        stages.append(Stage(
+            name="catalog",
+            run=lambda: write_dist_artifacts(config, bundle_files),
+            inputs=bundle_files,
+            outputs=dist_artifact_paths(config, bundle_files),
+            code=[pipe / "card_catalog.py", BUILD_SCRIPT],
+            deps=[s.name for s in bundled],
+        ))
+    
+    if not skip_webapp:
+        stages.append(Stage(
+            name="bundle",
+            run=lambda: copy_to_webapp(config, [p.name for p in bundle_files]),
+            inputs=bundle_files,
+            outputs=[config.webapp_data_dir / p.name for p in bundle_files],
+            code=[BUILD_SCRIPT],
+            deps=[s.name for s in bundled],
+        ))
+    
+    return topo_order(stages)
+
+
+def objective_ocr_enabled(config: Config) -> bool:
+    """Whether build_scan_stages will add the objective OCR stage."""
+    return (config.objective_images_dir.exists()
+            and importlib.util.find_spec("pytesseract") is not None)
+
+
+def build_scan_stages(config: Config, jobs: int = 1) -> List[Stage]:
+    """
+    Raw-asset scans that do not depend on the card chain or each other.
+    Crew/upgrade cards come from image filenames and are bundled as-is;
+    objective OCR (needs pytesseract) is written to intermediate/ for review,
+    with its OCR text cached in intermediate/.ocr_cache and spread over
+    `jobs` worker processes.
+    """
+    pipe = config.pipeline_dir
+    stages = []
+    
+    if config.card_images_dir and config.card_images_dir.exists():
+        for name in ("crew_cards", "upgrade_cards"):
+            script = f"parse_{name.split('_')[0]}_cards_safe.py"
+            out = config.dist_dir / f"{name}.json"
+            stages.append(Stage(
+                name=name,
+                run=functools.partial(run_script, config, script,
+                                      '-i', config.card_images_dir, '-o', out),
+                inputs=[config.card_images_dir],
+                outputs=[out],
+                code=[pipe / script],
+            ))
+    
+    if config.objective_images_dir.exists():
+        if importlib.util.find_spec("pytesseract") is None:
+            print("  [!] pytesseract not installed, skipping objective OCR stage")
+        else:
+            out = config.intermediate_dir / "objectives_ocr.json"
+            ocr_args = ['--input', config.objective_images_dir, '--output', out,
+                        '--cache', config.intermediate_dir / ".ocr_cache"]
+            if jobs > 1:
+                ocr_args += ['--workers', str(jobs)]
+            stages.append(Stage(
+                name="objectives",
+                run=functools.partial(run_script, config, "parse_objective_cards.py", *ocr_args),
+                inputs=[config.objective_images_dir],
+                outputs=[out],
+                code=[pipe / "parse_objective_cards.py"],
+            ))
+    
+    return stages
+
+
+def run_stages(config: Config, stages: List[Stage], state: BuildState,
+               force: bool = False, jobs: int = 1,
+               metrics: Optional[Dict[str, dict]] = None) -> bool:
+    """
+    Run the stage graph, skipping stages whose fingerprint is unchanged.
+    State is saved after every stage so an interrupted build resumes from
+    the first stage that did not finish.
+    
+    With jobs > 1, stages whose deps are done run concurrently (at most
+    `jobs` at a time). Every stage writes its own outputs and the state is
+    only touched from this thread, so results do not depend on which stage
+    finishes first. Fingerprints are taken when a stage becomes ready, so
+    they always see the finished outputs of its deps.
+    
+    If a metrics dict is given, each stage that runs adds its record
+    (see stage_metrics).
+    """
+    pending = list(stages)
+    done: Set[str] = set()
+    running = {}
+    failed = False
+    counter = CardCounter()
+    
+    threads = ThreadPoolExecutor(max_workers=max(1, jobs))
+    processes = None
+    
+    def submit(stage: Stage):
+        nonlocal processes
+        if stage.cpu and jobs > 1:
+            if processes is None:
+                processes = ProcessPoolExecutor(max_workers=jobs,
+                                                mp_context=multiprocessing.get_context("spawn"))
+            return processes.submit(measured_run, stage.run)
+        return threads.submit(measured_run, stage.run)
+    
+    try:
+        while pending or running:
+            # Start (or skip) every stage whose deps are done, in graph order
+            progressed = True
+            while progressed and not failed:
+                progressed = False
+                for stage in list(pending):
+                    if len(running) >= max(1, jobs):
+                        break
+                    if not all(d in done for d in stage.deps):
+                        continue
+                    pending.remove(stage)
+                    progressed = True
+                    fingerprint = stage_fingerprint(config, stage)
+                    if not force and stage_is_current(config, stage, state, fingerprint):
+                        print(f"\n[{stage.name}] up to date, skipping")
+                        done.add(stage.name)
+                        continue
+                    print(f"\n[{stage.name}] running...")
+                    running[submit(stage)] = (stage, fingerprint)
+            
+            if not running:
+                break
+            
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(finished, key=lambda f: stages.index(running[f][0])):
+                stage, fingerprint = running.pop(future)
+                try:
+                    ok, usage = future.result()
+                except Exception as e:
+                    print(f"  [X] Stage '{stage.name}' raised {type(e).__name__}: {e}")
+                    ok = False
+                if not ok:
+                    print(f"  [X] Stage '{stage.name}' failed")
+                    failed = True
+                    continue
+                
+                outputs = output_hashes(config, stage)
+                missing = [p for p, h in outputs.items() if h is None]
+                if missing:
+                    print(f"  [X] Stage '{stage.name}' did not produce: {missing}")
+                    failed = True
+                    continue
+                
+                state.stages[stage.name] = dict(fingerprint, outputs=outputs,
+                                                finished=datetime.now().isoformat())
+                state.file_hashes.update({k: v for k, v in fingerprint['inputs'].items() if v})
+                state.file_hashes.update(outputs)
+                state.save(config.build_state_file)
+                done.add(stage.name)
+                print(f"  -> [{stage.name}] done in {usage['wall_s']:.2f}s (cpu {usage['cpu_s']:.2f}s)")
+                if metrics is not None:
+                    metrics[stage.name] = stage_metrics(stage, usage, counter)
+    finally:
+        threads.shutdown(wait=True)
+        if processes is not None:
+            processes.shutdown(wait=True)
+    
+    return not failed and not pending
+
+
+def print_stage_status(config: Config, stages: List[Stage], state: BuildState):
+    """Show which stages would run on the next build."""
+    print(f"\nStages:")
+    for stage in stages:
+        fingerprint = stage_fingerprint(config, stage)
+        if stage_is_current(config, stage, state, fingerprint):
+            print(f"  [OK] {stage.name}")
+        elif stage.name not in state.stages:
+            print(f"  [--] {stage.name} (never built)")
+        else:
+            record = state.stages[stage.name]
+            reasons = [k for k in ('inputs', 'code', 'config')
+                       if record.get(k) != fingerprint[k]]
+            print(f"  [!!] {stage.name} (changed: {', '.join(reasons) or 'outputs'})")
+
+
 # =============================================================================
 # PIPELINE - Source Injection Mode
 # =============================================================================
@@ -319,7 +1098,7 @@ def hash_file(path: Path) -> str:
 def inject_source(config: Config, source_path: Path) -> bool:
     """
     Inject a source-of-truth JSON into the pipeline.
-    Skips extraction steps, goes straight to enrichment.
+    Skips PDF extraction; the repair/fix/enrichment stages run on it.
     """
     print(f"\n[inject] Using source: {source_path}")
     
@@ -330,28 +1109,26 @@ def inject_source(config: Config, source_path: Path) -> bool:
     shutil.copy(source_path, dest)
     print(f"  -> Copied to {dest}")
     
-    # Also copy as "fixed" since we're skipping fix steps
-    for stage in ["cards_fixed.json", "cards_repaired.json", "cards_stationed.json"]:
-        stage_dest = config.intermediate_dir / stage
-        shutil.copy(source_path, stage_dest)
-        print(f"  -> {stage}")
-    
     return True
 
 
-def run_enrichment(config: Config, source_path: Path) -> bool:
+def run_enrichment(config: Config, cards_path: Path) -> bool:
     """
-    Run only the enrichment/tagging steps on validated source data.
+    Add faction meta to the classified cards and write dist/.
     """
     print(f"\n[enrich] Running enrichment pipeline...")
     
-    # For now, just copy source to final location
-    # TODO: Run tag_extractor, crew_recommender, etc.
-    
     cards_dest = config.dist_dir / "cards.json"
-    shutil.copy(source_path, cards_dest)
+    if not run_script(config, "enrich_meta.py", '--cards', cards_path, '--output-cards', cards_dest):
+        return False
     print(f"  -> {cards_dest}")
     
+    write_placeholders(config)
+    return True
+
+
+def write_placeholders(config: Config):
+    """Create placeholder objectives/recommendations in dist/ if missing."""
     # Create placeholder objectives if not exists
     obj_dest = config.dist_dir / "objectives.json"
     if not obj_dest.exists():
@@ -365,38 +1142,639 @@ def run_enrichment(config: Config, source_path: Path) -> bool:
         with open(rec_dest, 'w') as f:
             json.dump({"synergies": {}, "roles": {}}, f)
         print(f"  -> {rec_dest} (placeholder)")
+
+
+def backup_file(config: Config, path: Path) -> Path:
+    """
+    Content-addressed backup. The content is stored once as
+    backups/objects/<digest>; each backup is a timestamped hardlink to it
+    (or a .ref pointer file holding the digest where hardlinks fail).
+    """
+    digest = hash_file(path)
+    objects = config.backup_dir / "objects"
+    objects.mkdir(parents=True, exist_ok=True)
+    blob = objects / digest
+    if not blob.exists():
+        shutil.copy2(path, blob)
     
-    return True
+    entry = config.backup_dir / f"{path.name}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
+    if entry.exists() or entry.with_name(entry.name + ".ref").exists():
+        return entry
+    try:
+        os.link(blob, entry)
+    except OSError:
+        entry = entry.with_name(entry.name + ".ref")
+        entry.write_text(digest, encoding='utf-8')
+    return entry
+
+
+def prune_backups(config: Config, filename: str) -> int:
+    """
+    Apply the retention policy to one file's backups, then delete objects
+    nothing points to any more. Returns the number of backups removed.
+    """
+    entries = sorted(config.backup_dir.glob(f"{filename}.*.bak*"), key=lambda p: p.name, reverse=True)
+    cutoff = datetime.now().timestamp() - BACKUP_MAX_AGE_DAYS * 86400
+    removed = 0
+    for i, entry in enumerate(entries):
+        stamp = entry.name[len(filename) + 1:].split('.')[0]
+        try:
+            created = datetime.strptime(stamp, '%Y%m%d_%H%M%S').timestamp()
+        except ValueError:
+            continue  # not one of ours
+        if i >= BACKUP_KEEP and created < cutoff:
+            entry.unlink()
+            removed += 1
+    
+    objects = config.backup_dir / "objects"
+    if objects.exists():
+        referenced = {ref.read_text(encoding='utf-8').strip()
+                      for ref in config.backup_dir.glob("*.bak.ref")}
+        for blob in objects.iterdir():
+            if blob.stat().st_nlink == 1 and blob.name not in referenced:
+                blob.unlink()
+    return removed
 
 
-def copy_to_webapp(config: Config) -> bool:
-    """Copy dist files to webapp src/data/."""
+def copy_to_webapp(config: Config, filenames: List[str] = DIST_FILES) -> bool:
+    """
+    Copy dist files to webapp src/data/.
+    
+    Files whose content already matches are left untouched, so the dev
+    server does not reload for a no-op build. Replaced files are backed up
+    first (see backup_file).
+    """
     print(f"\n[bundle] Copying to webapp...")
     
     if not config.webapp_data_dir.exists():
         print(f"  [!] Webapp dir not found: {config.webapp_data_dir}")
         return True  # Not an error, just skip
     
-    for filename in ["cards.json", "objectives.json", "recommendations.json"]:
+    for filename in filenames:
         src = config.dist_dir / filename
         dst = config.webapp_data_dir / filename
         if src.exists():
-            # Backup existing
             if dst.exists():
-                backup = config.backup_dir / f"{filename}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak"
-                config.backup_dir.mkdir(parents=True, exist_ok=True)
-                shutil.copy(dst, backup)
-                print(f"  -> Backed up existing {filename}")
-            shutil.copy(src, dst)
+                if hash_file(src) == hash_file(dst):
+                    print(f"  -> src/data/{filename} (unchanged)")
+                    continue
+                # Backup existing
+                backup_file(config, dst)
+                pruned = prune_backups(config, filename)
+                print(f"  -> Backed up existing {filename}" +
+                      (f" (pruned {pruned} old)" if pruned else ""))
+            # Write then rename, so watchers never see a half-written file
+            tmp = dst.with_name(dst.name + ".tmp")
+            shutil.copy(src, tmp)
+            os.replace(tmp, dst)
             print(f"  -> src/data/{filename}")
     
     return True
 
 
+# =============================================================================
+# DIST ARTIFACTS - Binary catalog + pre-compressed variants
+# =============================================================================
+
+def use_pipeline_modules(config: Config):
+    """Make scripts/pipeline importable from build.py."""
+    if str(config.pipeline_dir) not in sys.path:
+        sys.path.insert(0, str(config.pipeline_dir))
+
+
+def compressed_variants(path: Path) -> List[Path]:
+    """.gz always, .br when the brotli module is installed."""
+    suffixes = ['.gz'] + (['.br'] if brotli else [])
+    return [path.with_name(path.name + suffix) for suffix in suffixes]
+
+
+def dist_artifact_paths(config: Config, dist_files: List[Path]) -> List[Path]:
+    catalog_path = config.dist_dir / CATALOG_FILE
+    return [catalog_path] + [v for p in dist_files + [catalog_path] for v in compressed_variants(p)]
+
+
+def compress_bytes(data: bytes, suffix: str) -> bytes:
+    if suffix == '.gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)  # mtime=0: reproducible
+    return brotli.compress(data, quality=11)
+
+
+def decompress_bytes(data: bytes, suffix: str) -> bytes:
+    return gzip.decompress(data) if suffix == '.gz' else brotli.decompress(data)
+
+
+def best_time_ms(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def write_dist_artifacts(config: Config, dist_files: List[Path]) -> bool:
+    """
+    Write dist/cards.m4ec (binary catalog, see card_catalog.py) plus a
+    .gz/.br copy of every dist artifact, then report size and load time
+    of each cards format so we can choose what ships.
+    """
+    use_pipeline_modules(config)
+    import card_catalog
+    
+    print(f"\n[catalog] Writing binary catalog and compressed variants...")
+    cards_path = config.dist_dir / "cards.json"
+    catalog_path = config.dist_dir / CATALOG_FILE
+    cards_raw = cards_path.read_bytes()
+    catalog_raw = card_catalog.dumps(json.loads(cards_raw))
+    catalog_path.write_bytes(catalog_raw)
+    
+    payloads = {cards_path: cards_raw, catalog_path: catalog_raw}
+    for path in dist_files + [catalog_path]:
+        data = payloads.get(path) or path.read_bytes()
+        for variant in compressed_variants(path):
+            packed = compress_bytes(data, variant.suffix)
+            variant.write_bytes(packed)
+            payloads[variant] = packed
+    
+    # Size / load-time comparison for the cards payload
+    loaders = {'.json': json.loads, '.m4ec': card_catalog.loads}
+    rows = []
+    for base in (cards_path, catalog_path):
+        load = loaders[base.suffix]
+        raw = payloads[base]
+        rows.append((base.name, len(raw), best_time_ms(lambda: load(raw))))
+        for variant in compressed_variants(base):
+            packed = payloads[variant]
+            rows.append((variant.name, len(packed),
+                         best_time_ms(lambda: load(decompress_bytes(packed, variant.suffix)))))
+    
+    json_size, json_ms = rows[0][1], rows[0][2]
+    print(f"  {'Format':24} {'Size':>10} {'vs JSON':>8} {'Load':>9} {'vs JSON':>8}")
+    for name, size, ms in rows:
+        print(f"  {name:24} {size / 1024:8.0f}KB {size / json_size:7.0%} {ms:7.1f}ms {ms / json_ms:7.0%}")
+    if not brotli:
+        print("  (install brotli for .br variants)")
+    return True
+
+
+# =============================================================================
+# IN-PROCESS PIPELINE - One card list, no JSON round-trips
+# =============================================================================
+
+# Stages fused into a single in-process stage by --in-process
+IN_PROCESS_STAGES = ["repair_all", "fix_cards", "tag_extractor", "ability_parser",
+                     "role_classifier_v2", "enrich_meta"]
+
+
+def write_json(path: Path, data: Any):
+    """Write pipeline JSON the same way the stage scripts do."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def card_list(data: Any) -> List[dict]:
+    """Handle both list and {cards: [...]} formats."""
+    return data.get('cards', []) if isinstance(data, dict) else data
+
+
+def step_repair_all(config: Config, data: Any) -> Optional[Any]:
+    from repair_all import repair_all_cards
+    data, repair_stats = repair_all_cards(data)
+    if repair_stats['validation']['enforcer_count'] == 0:
+        print("  [X] Zero Enforcers detected - station inference failed")
+        return None
+    return data
+
+
+def step_fix_cards(config: Config, data: Any) -> Any:
+    from fix_cards import CardFixer
+    return CardFixer(corrections_file=str(config.pipeline_dir / "corrections.json")).fix_cards(data)
+
+
+def step_tag_extractor(config: Config, data: Any) -> Any:
+    from card_cache import CardResultCache
+    import tag_extractor
+    cache = CardResultCache.for_stage(
+        config.intermediate_dir / ".card_cache" / "tag_extractor.json", 'tag_extractor',
+        tag_extractor.__file__, salt=tag_extractor.TAXONOMY, output_fields=tag_extractor.OUTPUT_FIELDS
+    )
+    enriched, _ = tag_extractor.enrich_cards(
+        card_list(data), tag_extractor.TagExtractor(tag_extractor.TAXONOMY),
+        tag_extractor.RoleInferencer(), cache
+    )
+    cache.save()
+    if isinstance(data, dict):
+        data['cards'] = enriched
+        data['enrichment_version'] = '1.0'
+    else:
+        data = enriched
+    print(f"  Cache: {cache.summary()}")
+    return data
+
+
+def step_ability_parser(config: Config, data: Any) -> Any:
+    from card_cache import CardResultCache
+    import ability_parser
+    cache = CardResultCache.for_stage(
+        config.intermediate_dir / ".card_cache" / "ability_parser.json", 'ability_parser',
+        ability_parser.__file__, output_fields=ability_parser.OUTPUT_FIELDS
+    )
+    ability_parser.parse_all_cards(card_list(data), ability_parser.AbilityParser(), cache)
+    cache.save()
+    print(f"  Cache: {cache.summary()}")
+    return data
+
+
+def step_role_classifier_v2(config: Config, data: Any) -> Any:
+    from card_cache import CardResultCache
+    import role_classifier_v2
+    cache = CardResultCache.for_stage(
+        config.intermediate_dir / ".card_cache" / "role_classifier_v2.json", 'role_classifier_v2',
+        role_classifier_v2.__file__, output_fields=role_classifier_v2.OUTPUT_FIELDS
+    )
+    corrections = role_classifier_v2.load_corrections(config.pipeline_dir / "corrections_roles.json")
+    cards, _ = role_classifier_v2.classify_all_cards(card_list(data), corrections, cache)
+    cache.save()
+    for card in cards:
+        card.pop('_role_scores', None)
+    print(f"  Cache: {cache.summary()}")
+    return data
+
+
+def step_enrich_meta(config: Config, data: Any) -> Any:
+    import enrich_meta
+    return enrich_meta.enrich_cards(data)
+
+
+# The card stages as functions of the card list, in pipeline order; each
+# returns the new list (or None on failure). Shared by --in-process and
+# watch mode.
+IN_PROCESS_STEPS = {
+    "repair_all": step_repair_all,
+    "fix_cards": step_fix_cards,
+    "tag_extractor": step_tag_extractor,
+    "ability_parser": step_ability_parser,
+    "role_classifier_v2": step_role_classifier_v2,
+    "enrich_meta": step_enrich_meta,
+}
+
+# Intermediate file names written by --write-intermediates, per step
+CHECKPOINT_NAMES = {"repair_all": "repaired", "fix_cards": "fixed", "tag_extractor": "tagged",
+                    "ability_parser": "parsed", "role_classifier_v2": "roles"}
+
+
+def run_in_process(config: Config, cards_path: Path, write_intermediates: bool = False) -> bool:
+    """
+    Run repair_all -> fix_cards -> tag_extractor -> ability_parser
+    -> role_classifier_v2 -> enrich_meta by importing each stage's core
+    function and passing one card list through them.
+    
+    The cards are loaded once and dist/cards.json is written once.
+    Intermediate files are only written with write_intermediates (debugging).
+    """
+    use_pipeline_modules(config)
+    
+    print(f"\n[in-process] Loading {cards_path}...")
+    with open(cards_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    for name in IN_PROCESS_STAGES:
+        start = time.perf_counter()
+        data = IN_PROCESS_STEPS[name](config, data)
+        if data is None:
+            return False
+        checkpoint = CHECKPOINT_NAMES.get(name, name)
+        print(f"  [{checkpoint}] {len(card_list(data))} cards in {time.perf_counter() - start:.2f}s")
+        if write_intermediates and name in CHECKPOINT_NAMES:
+            path = config.intermediate_dir / f"cards_{checkpoint}.json"
+            write_json(path, data)
+            print(f"    -> {path}")
+    
+    cards_dest = config.dist_dir / "cards.json"
+    write_json(cards_dest, data)
+    print(f"  -> {cards_dest}")
+    
+    write_placeholders(config)
+    return True
+
+
+def fuse_in_process(config: Config, stages: List[Stage],
+                    write_intermediates: bool = False) -> List[Stage]:
+    """
+    Replace the IN_PROCESS_STAGES of a stage graph with one "in_process"
+    stage. Its fingerprint covers every fused script and config file, so
+    incremental skipping still works.
+    """
+    fused = [s for s in stages if s.name in IN_PROCESS_STAGES]
+    rest = [s for s in stages if s.name not in IN_PROCESS_STAGES]
+    
+    code, conf = [], []
+    for stage in fused:
+        code += [p for p in stage.code if p not in code]
+        conf += [p for p in stage.config if p not in conf]
+    
+    cards_path = fused[0].inputs[0]
+    merged = Stage(
+        name="in_process",
+        run=functools.partial(run_in_process, config, cards_path, write_intermediates),
+        inputs=fused[0].inputs,
+        outputs=fused[-1].outputs,
+        code=code,
+        config=conf,
+        deps=fused[0].deps,
+        cpu=True,
+    )
+    
+    for stage in rest:
+        stage.deps = list(dict.fromkeys(
+            merged.name if d in IN_PROCESS_STAGES else d for d in stage.deps
+        ))
+    
+    return topo_order(rest + [merged])
+
+
+# =============================================================================
+# WATCH MODE PIPELINE - Card lists kept in memory between rebuilds
+# =============================================================================
+
+class CardMemory:
+    """
+    Watch mode: the card stages' output card lists, kept in memory between
+    rebuilds instead of going through data/intermediate/*.json.
+    
+    An entry keeps the fingerprint of the run that produced it, so a stage
+    whose inputs, code and config are unchanged is skipped (see
+    stage_is_current) and the next stage reads the kept list. A digest of
+    the list's contents is the next stage's input hash, so, as with files,
+    an output that comes out the same stops the cascade.
+    
+    Stages change the list they are given, so each list is also kept
+    pickled; the list from the latest run is handed on without a copy.
+    """
+    
+    def __init__(self):
+        self.entries: Dict[str, dict] = {}
+    
+    def holds(self, name: str, fingerprint: dict) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry['fingerprint'] == fingerprint
+    
+    def digest(self, name: str) -> Optional[str]:
+        entry = self.entries.get(name)
+        return entry['digest'] if entry else None
+    
+    def count(self, name: str) -> Optional[int]:
+        entry = self.entries.get(name)
+        return entry['cards'] if entry else None
+    
+    def put(self, name: str, fingerprint: dict, data: Any):
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        hasher = new_hasher()
+        hasher.update(payload)
+        self.entries[name] = {'fingerprint': fingerprint, 'digest': hasher.hexdigest(),
+                              'cards': len(card_list(data)), 'payload': payload, 'live': data}
+    
+    def take(self, name: str) -> Any:
+        """A stage's card list, for the next stage to change."""
+        entry = self.entries[name]
+        data, entry['live'] = entry['live'], None
+        return data if data is not None else pickle.loads(entry['payload'])
+
+
+CARD_MEMORY = CardMemory()
+
+
+def run_memory_stage(config: Config, stage: Stage, source: Optional[Path]) -> bool:
+    """
+    Watch mode: run one card stage on the card list in CARD_MEMORY (or
+    loaded from `source`, for the first one). The last stage writes
+    dist/cards.json without indentation: json.dump with indent=2 is the
+    pure-Python encoder and took longer than the stage itself.
+    """
+    fingerprint = stage_fingerprint(config, stage)
+    use_pipeline_modules(config)
+    if source:
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = CARD_MEMORY.take(stage.memory_inputs[0])
+    
+    data = IN_PROCESS_STEPS[stage.name](config, data)
+    if data is None:
+        return False
+    
+    if stage.memory:
+        CARD_MEMORY.put(stage.name, fingerprint, data)
+        print(f"  -> {len(card_list(data))} cards kept in memory")
+    else:
+        cards_dest = config.dist_dir / "cards.json"
+        with open(cards_dest, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False))
+        print(f"  -> {cards_dest}")
+        write_placeholders(config)
+    return True
+
+
+def memory_stages(config: Config, stages: List[Stage]) -> List[Stage]:
+    """
+    Watch mode: run the IN_PROCESS_STAGES of a stage graph in this process
+    on card lists kept in CARD_MEMORY. They stay separate stages, so a
+    rebuild still only runs the stages whose fingerprint changed, but the
+    cards are not reloaded or re-serialised between them.
+    """
+    by_name = {s.name: s for s in stages}
+    previous = None
+    for name in IN_PROCESS_STAGES:
+        stage = by_name[name]
+        source = None
+        if previous is None:
+            source = stage.inputs[0]
+        else:
+            stage.inputs = []
+            stage.memory_inputs = [previous]
+        if name != IN_PROCESS_STAGES[-1]:
+            stage.outputs = []
+            stage.memory = True
+        stage.cpu = False
+        stage.run = functools.partial(run_memory_stage, config, stage, source)
+        previous = name
+    return stages
+
+
 # =============================================================================
 # CLI
 # =============================================================================
 
+def run_build(config: Config, args, source_path: Optional[Path] = None,
+              memory: bool = False) -> bool:
+    """
+    Run the stage graph and record build state. With memory (watch mode),
+    the card stages pass their card lists in memory (see memory_stages).
+    """
+    config.ensure_dirs()
+    state = BuildState.load(config.build_state_file)
+    STAT_CACHE.load(config.stat_cache_file)
+    
+    print("=" * 60)
+    print("STEP 2: Run pipeline stages" if source_path else "Run pipeline stages")
+    print("=" * 60)
+    
+    start = time.perf_counter()
+    stages = build_stage_graph(config, source_path, args.skip_webapp, args.catalog, args.jobs)
+    if args.in_process:
+        stages = fuse_in_process(config, stages, args.write_intermediates)
+    elif memory:
+        stages = memory_stages(config, stages)
+    previous = load_metrics(config)
+    metrics: Dict[str, dict] = {}
+    try:
+        ok = run_stages(config, stages, state, force=args.force, jobs=args.jobs, metrics=metrics)
+        
+        # Metrics in graph order, compared with each stage's last run
+        metrics = {s.name: metrics[s.name] for s in stages if s.name in metrics}
+        print_metrics_report(previous.get('stages', {}), metrics)
+        regressions = []
+        if args.perf_budget is not None:
+            regressions = find_regressions(previous.get('stages', {}), metrics, args.perf_budget)
+        save_metrics(config, previous, metrics, regressions, time.perf_counter() - start)
+        
+        if not ok:
+            print("ERROR: Pipeline failed")
+            return False
+        if regressions:
+            # Forget the regressed runs so the next build measures them again
+            for name in regressions:
+                state.stages.pop(name, None)
+            state.save(config.build_state_file)
+            print(f"\nERROR: Over perf budget ({args.perf_budget:g}%): {', '.join(regressions)}")
+            return False
+        
+        # Save build state
+        state.last_build = datetime.now().isoformat()
+        state.source_file = str(source_path) if source_path else ""
+        state.source_hash = hash_file(source_path) if source_path else ""
+        state.raw_files = raw_asset_digests(config)
+        state.save(config.build_state_file)
+    finally:
+        STAT_CACHE.save()
+    
+    print("\n" + "=" * 60)
+    print(f"BUILD COMPLETE ({time.perf_counter() - start:.2f}s)")
+    print("=" * 60)
+    print(f"Source: {source_path or config.card_pdfs_dir}")
+    print(f"Output: {config.dist_dir}")
+    if not args.skip_webapp:
+        print(f"Webapp: {config.webapp_data_dir}")
+    
+    return True
+
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+def watched_paths(config: Config, source_path: Optional[Path]) -> List[Path]:
+    """Raw assets, pipeline config/code, and the source file."""
+    paths = []
+    if config.raw_dir.exists():
+        paths += [p for p in config.raw_dir.rglob('*') if p.is_file()]
+    paths += sorted(config.pipeline_dir.glob('*.json'))
+    paths += sorted(config.pipeline_dir.glob('*.py'))
+    if source_path:
+        paths.append(source_path)
+    return paths
+
+
+def stat_snapshot(paths: List[Path]) -> Dict[str, tuple]:
+    """path -> (size, mtime_ns, inode); stat only, nothing is read."""
+    snapshot = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        snapshot[str(path)] = (st.st_size, st.st_mtime_ns, st.st_ino)
+    return snapshot
+
+
+def changed_paths(old: Dict[str, tuple], new: Dict[str, tuple]) -> List[str]:
+    return sorted(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+
+def forget_pipeline_modules(config: Config):
+    """Drop imported pipeline modules so --in-process picks up code edits."""
+    pipe = str(config.pipeline_dir)
+    for name, module in list(sys.modules.items()):
+        if getattr(module, '__file__', None) and str(Path(module.__file__).parent) == pipe:
+            del sys.modules[name]
+
+
+def validate_source(source_path: Path) -> bool:
+    print("=" * 60)
+    print("STEP 1: Validate source data")
+    print("=" * 60)
+    
+    success, errors, warnings, stats = validate_cards(source_path)
+    print_validation_report(success, errors, warnings, stats)
+    if not success:
+        print("BUILD BLOCKED - Fix validation errors first")
+    return success
+
+
+def watch(config: Config, args, source_path: Optional[Path] = None):
+    """
+    Build, then poll the watched files and rebuild on change.
+    
+    Polling is stat-based (no extra dependencies). A burst of changes is
+    debounced: the rebuild starts once nothing has changed for
+    WATCH_DEBOUNCE seconds. Each rebuild is an ordinary incremental build,
+    so only the stages whose inputs, code or config changed run again.
+    The card stages run in this process on card lists kept in memory
+    between rebuilds (see memory_stages), unless --in-process fuses them.
+    """
+    if not source_path or validate_source(source_path):
+        run_build(config, args, source_path, memory=True)
+    
+    snapshot = stat_snapshot(watched_paths(config, source_path))
+    print(f"\n[watch] Watching {len(snapshot)} files (Ctrl+C to stop)...")
+    
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = stat_snapshot(watched_paths(config, source_path))
+            changed = changed_paths(snapshot, current)
+            if not changed:
+                continue
+            
+            # Debounce: wait until the burst settles
+            detected = time.perf_counter()
+            while True:
+                time.sleep(WATCH_DEBOUNCE)
+                settled = stat_snapshot(watched_paths(config, source_path))
+                more = changed_paths(current, settled)
+                if not more:
+                    break
+                changed = sorted(set(changed) | set(more))
+                current = settled
+            snapshot = current
+            
+            shown = ', '.join(rel_path(config, Path(p)) for p in changed[:5])
+            extra = f" (+{len(changed) - 5} more)" if len(changed) > 5 else ""
+            print(f"\n[watch] Changed: {shown}{extra}")
+            
+            if any(p.endswith('.py') for p in changed):
+                forget_pipeline_modules(config)
+            if source_path and str(source_path) in changed and not validate_source(source_path):
+                continue
+            
+            ok = run_build(config, args, source_path, memory=True)
+            latency = time.perf_counter() - detected
+            print(f"\n[watch] {'Rebuilt' if ok else 'Build FAILED'} in {latency:.2f}s "
+                  f"after change; watching...")
+    except KeyboardInterrupt:
+        print("\n[watch] Stopped")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Malifaux 4E Build Pipeline - Validates before building",
@@ -406,6 +1784,12 @@ Examples:
   python build.py --validate cards_FINAL.json   # Just validate, don't build
   python build.py --source cards_FINAL.json     # Use as source, run pipeline
   python build.py --status                      # Show build status
+  python build.py --from-pdfs                   # Parse PDFs, run full pipeline
+  python build.py --source cards_FINAL.json --force  # Ignore build state
+  python build.py --source cards_FINAL.json --in-process  # No JSON round-trips
+  python build.py --from-pdfs --jobs 4          # Run independent stages in parallel
+  python build.py --source cards_FINAL.json --watch  # Rebuild on change
+  python build.py --source cards_FINAL.json --perf-budget 20  # Fail on >20% stage slowdowns
         """
     )
     
@@ -421,6 +1805,22 @@ Examples:
                         help='Card images directory')
     parser.add_argument('--skip-webapp', action='store_true',
                         help='Skip copying to webapp src/data/')
+    parser.add_argument('--from-pdfs', action='store_true',
+                        help='Build from data/raw/card_pdfs (runs parse_cards.py)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every stage, ignoring build state')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and rebuild affected stages when inputs change')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Run up to N independent stages at once and parse PDFs with N workers (default: 1)')
+    parser.add_argument('--catalog', action='store_true',
+                        help='Also write dist/cards.m4ec and .gz/.br variants of dist files')
+    parser.add_argument('--perf-budget', type=float, metavar='PCT', default=None,
+                        help='Fail if any stage is more than PCT%% slower than its last run')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run the card stages in one process on one in-memory list')
+    parser.add_argument('--write-intermediates', action='store_true',
+                        help='With --in-process, also write data/intermediate/cards_*.json')
     
     args = parser.parse_args()
     
@@ -437,67 +1837,31 @@ Examples:
             print(f"ERROR: Source file not found: {args.source}")
             sys.exit(1)
         
-        # ALWAYS validate first
-        print("=" * 60)
-        print("STEP 1: Validate source data")
-        print("=" * 60)
-        
-        success, errors, warnings, stats = validate_cards(args.source)
-        print_validation_report(success, errors, warnings, stats)
+        config = Config(args.root, args.images_dir)
+        if args.watch:
+            watch(config, args, args.source)
+            sys.exit(0)
         
-        if not success:
-            print("BUILD BLOCKED - Fix validation errors first")
+        # ALWAYS validate first
+        if not validate_source(args.source):
             sys.exit(1)
         
         # Proceed with build
+        sys.exit(0 if run_build(config, args, args.source) else 1)
+    
+    # Full build from raw PDFs
+    if args.from_pdfs:
         config = Config(args.root, args.images_dir)
-        config.ensure_dirs()
-        
-        print("=" * 60)
-        print("STEP 2: Inject source into pipeline")
-        print("=" * 60)
-        
-        if not inject_source(config, args.source):
-            print("ERROR: Failed to inject source")
-            sys.exit(1)
-        
-        print("=" * 60)
-        print("STEP 3: Run enrichment")
-        print("=" * 60)
-        
-        if not run_enrichment(config, args.source):
-            print("ERROR: Enrichment failed")
-            sys.exit(1)
-        
-        if not args.skip_webapp:
-            print("=" * 60)
-            print("STEP 4: Copy to webapp")
-            print("=" * 60)
-            
-            copy_to_webapp(config)
-        
-        # Save build state
-        state = BuildState(
-            last_build=datetime.now().isoformat(),
-            source_file=str(args.source),
-            source_hash=hash_file(args.source)
-        )
-        state.save(config.build_state_file)
-        
-        print("\n" + "=" * 60)
-        print("BUILD COMPLETE")
-        print("=" * 60)
-        print(f"Source: {args.source}")
-        print(f"Output: {config.dist_dir}")
-        if not args.skip_webapp:
-            print(f"Webapp: {config.webapp_data_dir}")
-        
-        sys.exit(0)
+        if args.watch:
+            watch(config, args)
+            sys.exit(0)
+        sys.exit(0 if run_build(config, args) else 1)
     
     # Status mode
     if args.status:
         config = Config(args.root, args.images_dir)
         state = BuildState.load(config.build_state_file)
+        STAT_CACHE.load(config.stat_cache_file)
         
         print("=" * 60)
         print("BUILD STATUS")
@@ -512,18 +1876,27 @@ Examples:
         
         # Check dist files
         print(f"\nDist files:")
-        for filename in ["cards.json", "objectives.json", "recommendations.json"]:
+        for filename in DIST_FILES:
             path = config.dist_dir / filename
             if path.exists():
                 print(f"  [OK] {filename}")
             else:
                 print(f"  [--] {filename} (missing)")
         
+        # Which stages would re-run
+        source = Path(state.source_file) if state.source_file else None
+        stages = build_stage_graph(config, source, args.skip_webapp, args.catalog, args.jobs)
+        if args.in_process:
+            stages = fuse_in_process(config, stages)
+        print_stage_status(config, stages, state)
+        print_raw_asset_changes(config, state)
+        STAT_CACHE.save()
+        
         sys.exit(0)
     
     # No arguments - show help
     parser.print_help()
-    print("\n[!] Specify --source FILE to build, or --validate FILE to check data")
+    print("\n[!] Specify --source FILE or --from-pdfs to build, or --validate FILE to check data")
 
 
 if __name__ == '__main__':
@@ -23,6 +23,8 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from card_cache import CardResultCache
+
 
 # =============================================================================
 # CONDITION TOKENS - What conditions can be applied
@@ -1254,6 +1256,61 @@ class AbilityParser:
         return list(events)
 
 
+# =============================================================================
+# BATCH PARSING
+# =============================================================================
+
+# Fields written by parse_all_cards - excluded from the per-card cache key
+OUTPUT_FIELDS = ['parsed', '_parsed_abilities', '_parsed_attacks', '_parsed_tactical']
+
+
+def parse_all_cards(cards: List[Dict], ability_parser: AbilityParser,
+                    cache: Optional[CardResultCache] = None) -> List[Dict]:
+    """
+    Parse every card and attach 'parsed' plus the detailed _parsed_* fields.
+    
+    If a cache is given, unchanged cards reuse their stored parse (and its
+    contribution to ability_parser.stats) instead of being re-parsed.
+    """
+    for card in cards:
+        cached = cache.get(card) if cache else None
+        if cached is not None:
+            parsed = cached['parsed']
+            for effect_type, count in cached['stats'].items():
+                ability_parser.stats[effect_type] += count
+        else:
+            before = dict(ability_parser.stats)
+            parsed = ability_parser.parse_card(card)
+            if cache:
+                stats_delta = {k: v - before.get(k, 0) for k, v in ability_parser.stats.items()
+                               if v != before.get(k, 0)}
+                cache.put(card, {'parsed': parsed, 'stats': stats_delta})
+        
+        # Add parsed data to card
+        card['parsed'] = {
+            'conditions_applied': parsed['conditions_applied'],
+            'conditions_removed': parsed['conditions_removed'],
+            'markers_created': parsed['markers_created'],
+            'markers_consumed': parsed['markers_consumed'],
+            'marker_interactions': parsed['marker_interactions'],
+            'trigger_events': parsed['trigger_events'],
+            'trigger_suits_needed': parsed['trigger_suits_needed'],
+            'has_bonus_actions': parsed['has_bonus_actions'],
+            'grants_bonus_action': parsed['grants_bonus_action'],
+            'keyword_synergies': parsed['keyword_synergies'],
+            'effect_costs': parsed['effect_costs'],
+            'buffs_characteristics': parsed['buffs_characteristics'],
+            'benefits_from_conditions': parsed['benefits_from_conditions'],
+        }
+        
+        # Keep detailed parsed data if needed
+        card['_parsed_abilities'] = parsed['parsed_abilities']
+        card['_parsed_attacks'] = parsed['parsed_attacks']
+        card['_parsed_tactical'] = parsed['parsed_tactical']
+    
+    return cards
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -1314,13 +1371,16 @@ def main():
     parser.add_argument('-o', '--output', type=Path, help='Output JSON with parsed data')
     parser.add_argument('--debug', type=str, metavar='NAME', help='Debug a specific card')
     parser.add_argument('--stats', action='store_true', help='Show parsing statistics')
+    parser.add_argument('--cache', type=Path, help='Per-card result cache file')
     
     args = parser.parse_args()
     
     # Load cards
     print(f"Loading: {args.input}")
     with open(args.input, 'r', encoding='utf-8') as f:
-        cards = json.load(f)
+        data = json.load(f)
+    # Handle both list and {cards: [...]} formats
+    cards = data.get('cards', []) if isinstance(data, dict) else data
     print(f"Loaded {len(cards)} cards")
     
     # Debug mode
@@ -1331,31 +1391,13 @@ def main():
     # Parse all cards
     print(f"\nParsing abilities and actions...")
     ability_parser = AbilityParser()
+    cache = CardResultCache.for_stage(args.cache, 'ability_parser', __file__,
+                                      output_fields=OUTPUT_FIELDS)
     
-    for card in cards:
-        parsed = ability_parser.parse_card(card)
-        
-        # Add parsed data to card
-        card['parsed'] = {
-            'conditions_applied': parsed['conditions_applied'],
-            'conditions_removed': parsed['conditions_removed'],
-            'markers_created': parsed['markers_created'],
-            'markers_consumed': parsed['markers_consumed'],
-            'marker_interactions': parsed['marker_interactions'],
-            'trigger_events': parsed['trigger_events'],
-            'trigger_suits_needed': parsed['trigger_suits_needed'],
-            'has_bonus_actions': parsed['has_bonus_actions'],
-            'grants_bonus_action': parsed['grants_bonus_action'],
-            'keyword_synergies': parsed['keyword_synergies'],
-            'effect_costs': parsed['effect_costs'],
-            'buffs_characteristics': parsed['buffs_characteristics'],
-            'benefits_from_conditions': parsed['benefits_from_conditions'],
-        }
-        
-        # Keep detailed parsed data if needed
-        card['_parsed_abilities'] = parsed['parsed_abilities']
-        card['_parsed_attacks'] = parsed['parsed_attacks']
-        card['_parsed_tactical'] = parsed['parsed_tactical']
+    parse_all_cards(cards, ability_parser, cache)
+    if cache.enabled:
+        cache.save()
+        print(f"  Cache: {cache.summary()}")
     
     # Print stats
     print(f"\n{'='*60}")
@@ -1387,7 +1429,7 @@ def main():
     # Save output
     if args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(cards, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"\nSaved to: {args.output}")
     else:
         print(f"\nUse -o FILE to save output")
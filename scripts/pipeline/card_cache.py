@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Malifaux 4E Per-Card Result Cache
+
+Lets the enrichment stages (tag_extractor, ability_parser, role_classifier_v2)
+skip cards whose input did not change since the last run.
+
+Each entry is keyed by a hash of:
+- the card's source fields (everything except the stage's own output fields)
+- a stage salt (taxonomy, config - anything else that changes the result)
+- the stage version (hash of the stage script, so code edits invalidate)
+
+Only entries used in the current run are written back, so the cache file
+never grows beyond one entry per card.
+
+Usage (from a stage script):
+    cache = CardResultCache.for_stage(args.cache, 'tag_extractor', __file__,
+                                      output_fields=['extracted_tags', ...])
+    result = cache.get(card)
+    if result is None:
+        result = compute(card)
+        cache.put(card, result)
+    cache.save()
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Saved with persisted digests (build.py's stat cache), so switching algorithm invalidates them
+HASH_ALGORITHM = "xxh3_128" if xxhash else "blake2b-128"
+
+
+def new_hasher():
+    """Fast non-cryptographic digest: xxh3-128 if xxhash is installed, else BLAKE2b-128."""
+    if xxhash:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def file_version(path: str) -> str:
+    """Short hash of a script's source, used as the stage version."""
+    hasher = new_hasher()
+    with open(path, 'rb') as f:
+        hasher.update(f.read())
+    return hasher.hexdigest()[:12]
+
+
+def stable_hash(value: Any) -> str:
+    """Hash any JSON-serializable value independent of dict ordering."""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    hasher = new_hasher()
+    hasher.update(data.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+class CardResultCache:
+    """Persistent card-hash -> stage result map for one pipeline stage."""
+
+    def __init__(self, path: Optional[Path], stage: str, version: str,
+                 salt: str = "", output_fields: Iterable[str] = ()):
+        self.path = Path(path) if path else None
+        self.stage = stage
+        self.version = version
+        self.salt = salt
+        self.output_fields = set(output_fields)
+        self.entries: Dict[str, Any] = {}
+        self.used: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('stage') == stage and data.get('version') == version:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, OSError):
+                self.entries = {}
+
+    @classmethod
+    def for_stage(cls, path: Optional[str], stage: str, script_file: str,
+                  salt: Any = "", output_fields: Iterable[str] = ()) -> "CardResultCache":
+        """Build a cache versioned by the calling script's source."""
+        return cls(
+            Path(path) if path else None,
+            stage,
+            version=file_version(script_file),
+            salt=stable_hash(salt) if salt else "",
+            output_fields=output_fields,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def key(self, card: Dict) -> str:
+        """Hash of the card's source fields plus stage salt."""
+        source = {k: v for k, v in card.items() if k not in self.output_fields}
+        return stable_hash([self.salt, source])
+
+    def get(self, card: Dict) -> Optional[Any]:
+        """Cached result for this card, or None if the card is dirty."""
+        if not self.enabled:
+            self.misses += 1
+            return None
+        k = self.key(card)
+        if k in self.entries:
+            self.hits += 1
+            self.used[k] = self.entries[k]
+            return self.entries[k]
+        self.misses += 1
+        return None
+
+    def put(self, card: Dict, result: Any):
+        if self.enabled:
+            self.used[self.key(card)] = result
+
+    def save(self):
+        """Write back only the entries used in this run."""
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'stage': self.stage,
+                'version': self.version,
+                'entries': self.used,
+            }, f, ensure_ascii=False)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        return f"{self.hits}/{total} cards reused, {self.misses} recomputed"
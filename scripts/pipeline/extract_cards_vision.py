@@ -18,20 +18,61 @@ Example:
 Usage:
     export ANTHROPIC_API_KEY='your-key'
     python extract_cards_vision_v3.py -i ./Malifaux4eDB-images -o cards.json
+    python extract_cards_vision_v3.py -i ./Malifaux4eDB-images -o cards.json --concurrency 8 --rpm 50 --tpm 30000
+
+Requests go out from --concurrency workers through a token-bucket limiter
+(requests/min and input tokens/min), so throughput is set by the rate
+limits rather than by round-trip latency. 429/5xx responses are retried
+with jittered exponential backoff, honoring retry-after. --base-url points
+the client at another endpoint, e.g. a local stub server for testing;
+the Transport class is the seam for other clients.
+
+Responses are cached by image content, model and prompt (--cache, default
+.vision_cache next to the output), so re-running over unchanged images makes
+no API calls, and a renamed image is not paid for twice.
+
+Images are downsized to --max-edge and re-encoded (--image-format jpeg/webp,
+--image-quality) before upload, in a thread pool that works ahead of the
+requests; the encoded images are cached in <cache>/images/.
+
+Each run writes metrics (requests/min, API round-trip and rate-limiter
+queueing percentiles, retries and rate-limit waits, tokens and bytes per
+card, ETA) to <output>.telemetry.json
+and prints a summary line every 10 cards.
+
+Fix up an existing run without redoing it (results are merged into --output):
+    python extract_cards_vision_v3.py -i ./Malifaux4eDB-images -o cards.json --reextract failed
+    python extract_cards_vision_v3.py -i ./Malifaux4eDB-images -o cards.json --reextract changed --reextract faction:Guild
 """
 
+import abc
 import anthropic
+import asyncio
 import base64
+import email.utils
+import hashlib
+import io
 import json
 import os
+import random
 import sys
+import threading
 import time
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, NamedTuple
 from dataclasses import dataclass, field
 import argparse
 
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
 # Card types we care about
 VALID_CARD_TYPES = {'Stat', 'Crew', 'Upgrade'}
 
@@ -54,10 +95,20 @@ class CardPair:
     front_path: Path
     back_path: Optional[Path] = None
     
+    # Image content hashes (see hash_pair)
+    front_digest: Optional[str] = None
+    back_digest: Optional[str] = None
+    
     # Unique identifier
     @property
     def id(self) -> str:
         return f"{self.faction}_{self.keyword}_{self.card_name}".replace(' ', '_')
+    
+    # Results key: the front image's path under the root (cross-listed cards
+    # share a file name across keyword folders)
+    @property
+    def key(self) -> str:
+        return f"{self.faction}/{self.keyword}/{self.front_path.name if self.front_path else ''}"
 
 def parse_card_path(file_path: Path, root_dir: Path) -> Optional[CardPair]:
     """
@@ -162,6 +213,32 @@ def find_card_pairs(root_dir: str, card_type_filter: Optional[str] = None) -> Li
     
     return sorted(valid_pairs, key=lambda x: (x.faction, x.keyword, x.card_name))
 
+def file_digest(path) -> str:
+    """BLAKE2b-128 of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def hash_pair(pair: CardPair) -> CardPair:
+    """Fill in the pair's image digests."""
+    pair.front_digest = file_digest(pair.front_path) if pair.front_path else None
+    pair.back_digest = file_digest(pair.back_path) if pair.back_path else None
+    return pair
+
+# Vision input cost: ~width*height/750 tokens per image, after the API
+# scales the image to fit 1568px on the long edge (about 1,600 tokens max)
+IMAGE_TOKENS_MAX = 1600
+IMAGE_MAX_EDGE = 1568
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Approximate input tokens for one image (the maximum if its size is unknown)."""
+    if not width or not height:
+        return IMAGE_TOKENS_MAX
+    scale = min(1.0, IMAGE_MAX_EDGE / max(width, height))
+    return min(IMAGE_TOKENS_MAX, int(width * scale * height * scale / 750) + 1)
+
 def encode_image(image_path: str) -> Tuple[str, str]:
     """Read and base64 encode an image file."""
     suffix = Path(image_path).suffix.lower()
@@ -263,51 +340,547 @@ RULES:
 - Copy ability text exactly as shown
 """
 
-def extract_card_pair(
-    client: anthropic.Anthropic, 
-    pair: CardPair, 
-    model: str = "claude-sonnet-4-20250514"
-) -> dict:
-    """Extract card data from front+back image pair."""
+FRONT_LABEL = "FRONT OF CARD:"
+BACK_LABEL = "BACK OF CARD:"
+FRONT_ONLY_NOTE = "(No back image - extract from front only)"
+MAX_TOKENS = 4096
+
+# Everything about the request that isn't the images, the model or the
+# card's path metadata (see card_prompt); part of the response cache key,
+# so editing the prompt re-extracts every card
+PROMPT_DIGEST = hashlib.blake2b(
+    json.dumps([EXTRACTION_PROMPT_TEMPLATE, FRONT_LABEL, BACK_LABEL, FRONT_ONLY_NOTE, MAX_TOKENS]).encode('utf-8'),
+    digest_size=16,
+).hexdigest()
+
+# =============================================================================
+# IMAGE PREPARATION
+# =============================================================================
+
+# --image-format: PIL format, media type, cache file extension
+IMAGE_FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg', '.jpg'),
+    'webp': ('WEBP', 'image/webp', '.webp'),
+}
+
+@dataclass
+class ImagePayload:
+    """One card side as sent to the API."""
+    data: str  # base64
+    media_type: str
+    width: int
+    height: int
+    source_bytes: int  # size of the image file it came from
+    seconds: float  # time to prepare it
+
+class ImagePreparer:
+    """
+    Downsizes card images to max_edge on the long side and re-encodes them
+    (JPEG or WebP at `quality`) before base64, on a thread pool so it
+    overlaps with requests in flight. Encoded images are cached by source
+    digest and settings: <cache_dir>/<digest>-<spec><ext>. The 'original'
+    format sends the files unchanged.
+    """
+    
+    def __init__(self, image_format: str = 'jpeg', quality: int = 85, max_edge: int = IMAGE_MAX_EDGE,
+                 cache_dir: Optional[str] = None, threads: int = 4):
+        if image_format != 'original' and not HAS_PIL:
+            print("Warning: Pillow not installed, sending original images (pip install pillow)")
+            image_format = 'original'
+        self.format = image_format
+        self.quality = quality
+        self.max_edge = max_edge
+        self.spec = 'original' if image_format == 'original' else f"{image_format}-q{quality}-{max_edge}"
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        self.pending: Dict[int, asyncio.Future] = {}
     
+    def prepare(self, path: Path, digest: Optional[str]) -> ImagePayload:
+        start = time.perf_counter()
+        source_bytes = path.stat().st_size
+        if self.format == 'original':
+            data, media_type = encode_image(str(path))
+            width = height = 0
+            if HAS_PIL:
+                with Image.open(path) as img:
+                    width, height = img.size
+            return ImagePayload(data, media_type, width, height, source_bytes,
+                                time.perf_counter() - start)
+        
+        pil_format, media_type, ext = IMAGE_FORMATS[self.format]
+        cached = self.cache_dir / f"{digest}-{self.spec}{ext}" if self.cache_dir and digest else None
+        if cached and cached.exists():
+            encoded = cached.read_bytes()
+            with Image.open(io.BytesIO(encoded)) as img:
+                width, height = img.size
+        else:
+            with Image.open(path) as img:
+                img = img.convert('RGB')
+                scale = self.max_edge / max(img.size)
+                if scale < 1:
+                    img = img.resize((round(img.width * scale), round(img.height * scale)), Image.LANCZOS)
+                width, height = img.size
+                buf = io.BytesIO()
+                img.save(buf, pil_format, quality=self.quality)
+                encoded = buf.getvalue()
+            if cached:
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                # Pool threads may encode the same image (cross-listed cards) at once
+                tmp = cached.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+                tmp.write_bytes(encoded)
+                os.replace(tmp, cached)
+        data = base64.standard_b64encode(encoded).decode('utf-8')
+        return ImagePayload(data, media_type, width, height, source_bytes, time.perf_counter() - start)
+    
+    def prepare_pair(self, pair: CardPair) -> Tuple[ImagePayload, Optional[ImagePayload]]:
+        front = self.prepare(pair.front_path, pair.front_digest)
+        back = self.prepare(pair.back_path, pair.back_digest) if pair.back_path else None
+        return front, back
+    
+    def prefetch(self, pair: CardPair):
+        """Start preparing a pair's images in the background (from the event loop)."""
+        if id(pair) not in self.pending:
+            loop = asyncio.get_running_loop()
+            self.pending[id(pair)] = loop.run_in_executor(self.pool, self.prepare_pair, pair)
+    
+    async def get(self, pair: CardPair) -> Tuple[ImagePayload, Optional[ImagePayload]]:
+        """A pair's prepared images, prefetched or prepared now."""
+        self.prefetch(pair)
+        return await self.pending.pop(id(pair))
+    
+    def close(self):
+        self.pool.shutdown()
+
+# =============================================================================
+# TELEMETRY
+# =============================================================================
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100), None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))]
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+class Telemetry:
+    """
+    Metrics for an extraction run: per-card timings (API round trip of the
+    attempt that succeeded, rate limiter queueing and retry sleeps kept
+    apart), tokens (from response usage) and upload size, plus per-attempt
+    round trips and request, retry and rate-limit counters.
+    line() is the live progress summary; write() saves summary() and the
+    per-card records to a sidecar JSON, at most every WRITE_INTERVAL
+    seconds unless forced. The ETA uses the completion rate over the last
+    ETA_WINDOW cards.
+    """
+    
+    ETA_WINDOW = 20
+    WRITE_INTERVAL = 10.0
+    
+    def __init__(self, total: int = 0, path: Optional[str] = None, settings: Optional[dict] = None):
+        self.total = total
+        self.path = Path(path) if path else None
+        self.settings = settings or {}
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.start = time.monotonic()
+        self.last_write = 0.0
+        self.limiter: Optional[RateLimiter] = None
+        
+        self.cards: List[dict] = []  # one record per card sent to the API
+        self.attempts: List[dict] = []  # one record per HTTP attempt
+        self.recent = deque(maxlen=self.ETA_WINDOW)  # completion times
+        self.done = 0
+        self.cached = 0
+        self.failed = 0
+        
+        self.requests = 0  # HTTP attempts, including retries
+        self.retries = 0
+        self.rate_limited = 0
+        self.retry_wait = 0.0
+        self.rate_limit_wait = 0.0  # the part of retry_wait spent on 429s
+    
+    def record_attempt(self, status: Optional[int], round_trip: float):
+        self.requests += 1
+        self.attempts.append({'status': status, 'round_trip': round(round_trip, 3)})
+    
+    def record_card(self, front: str, timing: "RequestTiming", total: float, prepare: float,
+                    image_bytes: int, source_bytes: int, usage: dict):
+        self.cards.append({
+            'front': front,
+            'round_trip': round(timing.round_trip, 3),
+            'queue_wait': round(timing.queue_wait, 3),
+            'retry_wait': round(timing.retry_wait, 3),
+            'attempts': timing.attempts,
+            'total': round(total, 3),
+            'prepare': round(prepare, 3),
+            'image_bytes': image_bytes,
+            'source_bytes': source_bytes,
+            'input_tokens': usage.get('input_tokens'),
+            'output_tokens': usage.get('output_tokens'),
+        })
+    
+    def card_done(self, failed: bool = False):
+        self.done += 1
+        self.failed += failed
+        self.recent.append(time.monotonic())
+    
+    def eta(self) -> Optional[float]:
+        """Seconds left at the recent completion rate (None until it can be estimated)."""
+        if len(self.recent) < 2 or self.recent[-1] == self.recent[0]:
+            return None
+        rate = (len(self.recent) - 1) / (self.recent[-1] - self.recent[0])
+        return max(0, self.total - self.done) / rate
+    
+    def summary(self) -> dict:
+        elapsed = time.monotonic() - self.start
+        minutes = elapsed / 60 if elapsed > 0 else float('inf')
+        round_trips = [c['round_trip'] for c in self.cards]
+        queue_waits = [c['queue_wait'] for c in self.cards]
+        totals = [c['total'] for c in self.cards]
+        sent = len(self.cards) or 1
+        
+        def mean_of(key: str) -> Optional[float]:
+            values = [c[key] for c in self.cards if c[key] is not None]
+            return round(sum(values) / len(values), 1) if values else None
+        
+        return {
+            'elapsed_s': round(elapsed, 1),
+            'cards_total': self.total,
+            'cards_done': self.done,
+            'cards_sent': len(self.cards),
+            'cards_cached': self.cached,
+            'cards_failed': self.failed,
+            'cards_per_min': round(self.done / minutes, 2),
+            'requests': self.requests,
+            'requests_per_min': round(self.requests / minutes, 2),
+            'round_trip_s': {f'p{q}': percentile(round_trips, q) for q in (50, 95, 99)},
+            'queue_wait_s': {f'p{q}': percentile(queue_waits, q) for q in (50, 95, 99)},
+            'card_s': {f'p{q}': percentile(totals, q) for q in (50, 95, 99)},
+            'queue_wait_total_s': round(sum(queue_waits), 1),
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'retry_wait_s': round(self.retry_wait, 1),
+            'rate_limit_wait_s': round(self.rate_limit_wait, 1),
+            'limiter_wait_s': round(self.limiter.waited, 1) if self.limiter else 0.0,
+            'input_tokens': sum(c['input_tokens'] or 0 for c in self.cards),
+            'output_tokens': sum(c['output_tokens'] or 0 for c in self.cards),
+            'input_tokens_per_card': mean_of('input_tokens'),
+            'output_tokens_per_card': mean_of('output_tokens'),
+            'image_bytes': sum(c['image_bytes'] for c in self.cards),
+            'image_bytes_per_card': sum(c['image_bytes'] for c in self.cards) // sent,
+            'source_bytes_per_card': sum(c['source_bytes'] for c in self.cards) // sent,
+            'prepare_s_per_card': round(sum(c['prepare'] for c in self.cards) / sent, 3),
+            'eta_s': None if self.eta() is None else round(self.eta()),
+        }
+    
+    def line(self) -> str:
+        s = self.summary()
+        rtt, queue = s['round_trip_s'], s['queue_wait_s']
+        parts = [f"{s['cards_done']}/{s['cards_total']}", f"{s['requests_per_min']:.1f} req/min"]
+        if rtt['p50'] is not None:
+            parts.append(f"round trip p50 {rtt['p50']:.1f}s p95 {rtt['p95']:.1f}s p99 {rtt['p99']:.1f}s")
+            parts.append(f"queued p50 {queue['p50']:.1f}s p95 {queue['p95']:.1f}s")
+        parts.append(f"{s['retries']} retries ({s['rate_limited']} rate limited)")
+        if s['input_tokens_per_card'] is not None:
+            parts.append(f"{s['input_tokens_per_card']:,.0f} in/{s['output_tokens_per_card'] or 0:,.0f} out tokens/card")
+        if s['cards_sent']:
+            parts.append(f"{s['image_bytes_per_card'] / 1024:,.0f} KB/card")
+        if s['eta_s'] is not None and s['cards_done'] < s['cards_total']:
+            parts.append(f"ETA {format_duration(s['eta_s'])}")
+        return ', '.join(parts)
+    
+    def write(self, force: bool = False):
+        now = time.monotonic()
+        if not self.path or (not force and now - self.last_write < self.WRITE_INTERVAL):
+            return
+        self.last_write = now
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({
+                'started': self.started,
+                'updated': datetime.now().isoformat(timespec='seconds'),
+                'settings': self.settings,
+                'summary': self.summary(),
+                'cards': self.cards,
+                'attempts': self.attempts,
+            }, f, indent=2)
+        os.replace(tmp, self.path)
+
+# =============================================================================
+# TRANSPORT
+# =============================================================================
+
+class TransportError(Exception):
+    """The request never got an HTTP response (connection reset, timeout); retryable."""
+
+class ApiError(Exception):
+    """The API refused the request, or it still failed after all retries."""
+
+@dataclass
+class ApiResponse:
+    """One HTTP exchange with the Messages API."""
+    status: int
+    headers: Dict[str, str]
+    body: dict  # the message on success, the error object otherwise
+
+class Transport(abc.ABC):
+    """
+    Sends one Messages API request (the keyword arguments of
+    messages.create) and returns the raw response. Retries and rate
+    limiting live in VisionClient, so a transport only moves bytes; a test
+    can plug in a stub that returns canned responses.
+    """
+    
+    @abc.abstractmethod
+    async def send(self, request: dict) -> ApiResponse:
+        """One HTTP exchange; raises TransportError if there is no response."""
+    
+    async def close(self):
+        pass
+
+class AnthropicTransport(Transport):
+    """The Anthropic SDK's async client with its own retries turned off."""
+    
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 300.0):
+        self.client = anthropic.AsyncAnthropic(base_url=base_url, max_retries=0, timeout=timeout)
+    
+    async def send(self, request: dict) -> ApiResponse:
+        try:
+            raw = await self.client.messages.with_raw_response.create(**request)
+        except anthropic.APIStatusError as e:
+            body = e.body if isinstance(e.body, dict) else {'error': {'message': str(e)}}
+            return ApiResponse(e.status_code, dict(e.response.headers), body)
+        except anthropic.APIConnectionError as e:
+            raise TransportError(str(e)) from e
+        message = await raw.parse()
+        return ApiResponse(raw.status_code, dict(raw.headers), message.model_dump())
+    
+    async def close(self):
+        await self.client.close()
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class TokenBucket:
+    """
+    Refills per_minute units per minute. It holds burst_seconds' worth, so a
+    run starts with a short burst rather than a whole minute's allowance.
+    """
+    
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if it can be taken now)."""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)  # an oversized request waits for a full bucket
+        return max(0.0, (amount - self.level) / self.rate)
+    
+    def take(self, amount: float):
+        self.level -= amount  # may go negative when actual usage exceeds the estimate
+
+class RateLimiter:
+    """
+    Requests/min and input tokens/min buckets shared by all workers, plus a
+    global pause set from retry-after when the API says we are over the
+    limit. Workers are admitted one at a time, in arrival order.
+    """
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.paused_until = 0.0
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: int):
+        async with self._lock:
+            while True:
+                delay = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1) if self.requests else 0.0,
+                    self.tokens.wait_time(tokens) if self.tokens else 0.0,
+                )
+                if delay <= 0:
+                    break
+                self.waited += delay
+                await asyncio.sleep(delay)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+    
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the response reports real usage."""
+        if self.tokens:
+            self.tokens.take(actual - estimated)
+    
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def retry_after_seconds(headers: Dict[str, str]) -> Optional[float]:
+    """The retry-after header (seconds or an HTTP date), if present."""
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class RequestTiming:
+    """Where one VisionClient.create call's time went."""
+    queue_wait: float = 0.0  # waiting in RateLimiter.acquire, over all attempts
+    retry_wait: float = 0.0  # backoff sleeps between attempts
+    round_trip: float = 0.0  # send to response, for the attempt that succeeded
+    attempts: int = 0
+
+class VisionClient:
+    """
+    Sends requests through a Transport under the shared RateLimiter,
+    retrying transport errors, 429, 408/409 and 5xx/529 responses with
+    full-jitter exponential backoff. A retry-after header sets the minimum
+    wait, and on 429 pauses every worker for that long.
+    """
+    
+    RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+    
+    def __init__(self, transport: Transport, limiter: RateLimiter, telemetry: Optional[Telemetry] = None,
+                 max_retries: int = 6, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.transport = transport
+        self.limiter = limiter
+        self.telemetry = telemetry or Telemetry()
+        self.telemetry.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    async def create(self, request: dict, estimated_tokens: int,
+                     timing: Optional[RequestTiming] = None) -> dict:
+        """
+        Send request (messages.create arguments); returns the message JSON.
+        Each attempt's round trip goes to telemetry; timing, if given, is
+        filled in with this call's queueing, retry sleeps and round trip.
+        """
+        timing = timing or RequestTiming()
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            await self.limiter.acquire(estimated_tokens)
+            sent = time.perf_counter()
+            timing.queue_wait += sent - start
+            timing.attempts += 1
+            retry_after = status = None
+            try:
+                response = await self.transport.send(request)
+            except TransportError as e:
+                error = f"connection error: {e}"
+            else:
+                status = response.status
+            timing.round_trip = time.perf_counter() - sent
+            self.telemetry.record_attempt(status, timing.round_trip)
+            if status is not None:
+                if response.status == 200:
+                    usage = response.body.get('usage') or {}
+                    if 'input_tokens' in usage:
+                        self.limiter.settle(estimated_tokens, usage['input_tokens'])
+                    return response.body
+                message = (response.body.get('error') or {}).get('message', '')
+                error = f"HTTP {response.status}: {message}".rstrip(': ')
+                if response.status not in self.RETRY_STATUSES:
+                    raise ApiError(error)
+                headers = {k.lower(): v for k, v in response.headers.items()}
+                retry_after = retry_after_seconds(headers)
+                if response.status == 429:
+                    self.telemetry.rate_limited += 1
+                    self.limiter.pause(retry_after if retry_after is not None else self.backoff(attempt))
+            
+            if attempt == self.max_retries:
+                raise ApiError(f"{error} (gave up after {attempt + 1} attempts)")
+            delay = self.backoff(attempt)
+            if retry_after is not None:
+                # Never sooner than the server asks; jitter so waiters don't return in lockstep
+                delay = max(retry_after + random.uniform(0, self.backoff_base), delay)
+            self.telemetry.retries += 1
+            self.telemetry.retry_wait += delay
+            timing.retry_wait += delay
+            if status == 429:
+                self.telemetry.rate_limit_wait += delay
+            await asyncio.sleep(delay)
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+def card_prompt(pair: CardPair) -> str:
+    """The extraction prompt, filled in with the pair's path metadata."""
+    return EXTRACTION_PROMPT_TEMPLATE.format(
+        faction=pair.faction,
+        keyword=pair.keyword,
+        card_name=pair.card_name,
+        card_type=pair.card_type
+    )
+
+def build_request(pair: CardPair, model: str, front: ImagePayload,
+                  back: Optional[ImagePayload]) -> Tuple[dict, int]:
+    """messages.create arguments for a card pair, and its estimated input tokens."""
     content = []
+    tokens = 0
     
     # Add front image
-    if pair.front_path:
-        front_data, front_type = encode_image(str(pair.front_path))
-        content.append({"type": "text", "text": "FRONT OF CARD:"})
-        content.append({
-            "type": "image",
-            "source": {"type": "base64", "media_type": front_type, "data": front_data}
-        })
+    content.append({"type": "text", "text": FRONT_LABEL})
+    content.append({
+        "type": "image",
+        "source": {"type": "base64", "media_type": front.media_type, "data": front.data}
+    })
+    tokens += estimate_image_tokens(front.width, front.height)
     
     # Add back image
-    if pair.back_path:
-        back_data, back_type = encode_image(str(pair.back_path))
-        content.append({"type": "text", "text": "BACK OF CARD:"})
+    if back:
+        content.append({"type": "text", "text": BACK_LABEL})
         content.append({
             "type": "image",
-            "source": {"type": "base64", "media_type": back_type, "data": back_data}
+            "source": {"type": "base64", "media_type": back.media_type, "data": back.data}
         })
+        tokens += estimate_image_tokens(back.width, back.height)
     else:
-        content.append({"type": "text", "text": "(No back image - extract from front only)"})
+        content.append({"type": "text", "text": FRONT_ONLY_NOTE})
     
     # Add extraction prompt with expected values
-    prompt = EXTRACTION_PROMPT_TEMPLATE.format(
-        faction=pair.faction,
-        keyword=pair.keyword,
-        card_name=pair.card_name,
-        card_type=pair.card_type
-    )
-    content.append({"type": "text", "text": prompt})
-    
-    message = client.messages.create(
-        model=model,
-        max_tokens=4096,
-        messages=[{"role": "user", "content": content}]
-    )
+    content.append({"type": "text", "text": card_prompt(pair)})
+    tokens += sum(len(c['text']) for c in content if c['type'] == 'text') // 4
     
-    response_text = message.content[0].text.strip()
+    request = {
+        'model': model,
+        'max_tokens': MAX_TOKENS,
+        'messages': [{"role": "user", "content": content}],
+    }
+    return request, tokens
+
+def parse_card_response(pair: CardPair, model: str, message: dict) -> dict:
+    """Card dict (with _source/_validation) from a message, or an _error entry."""
+    response_text = message['content'][0]['text'].strip()
     
     # Strip markdown code blocks
     if response_text.startswith('```'):
@@ -319,11 +892,14 @@ def extract_card_pair(
         
         # Add source metadata
         card_data['_source'] = {
+            'key': pair.key,
             'front': pair.front_path.name if pair.front_path else None,
             'back': pair.back_path.name if pair.back_path else None,
             'path_faction': pair.faction,
             'path_keyword': pair.keyword,
-            'path_card_type': pair.card_type
+            'path_card_type': pair.card_type,
+            'front_digest': pair.front_digest,
+            'back_digest': pair.back_digest,
         }
         card_data['_extraction_model'] = model
         
@@ -341,23 +917,320 @@ def extract_card_pair(
             '_error': f'JSON parse error: {e}',
             '_raw_response': response_text[:1000],
             '_source': {
+                'key': pair.key,
                 'front': pair.front_path.name if pair.front_path else None,
                 'back': pair.back_path.name if pair.back_path else None,
+                'front_digest': pair.front_digest,
+                'back_digest': pair.back_digest,
             }
         }
 
+class ResponseCache:
+    """
+    Raw model responses, one JSON blob per entry:
+    <cache_dir>/<key[:2]>/<key>.json
+    
+    The key hashes the front and back image contents, the model id,
+    PROMPT_DIGEST, the prompt as sent (card_prompt: the path's faction,
+    keyword, name and type, which the model echoes back) and how the
+    images are encoded (ImagePreparer.spec). A renamed image with the same
+    path metadata is still a hit; a changed image, prompt or encoding is a
+    miss, and so is the same image cross-listed under another keyword.
+    Validation is always applied fresh from the current pair. Responses
+    that don't parse as a card are not cached, so they are retried.
+    """
+    
+    def __init__(self, cache_dir: str, image_spec: str = 'original'):
+        self.dir = Path(cache_dir)
+        self.image_spec = image_spec
+        self.refresh = False  # write only: every get() misses
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, pair: CardPair, model: str) -> str:
+        parts = [model, PROMPT_DIGEST, card_prompt(pair), self.image_spec,
+                 pair.front_digest or '', pair.back_digest or '']
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def entry_path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+    
+    def has(self, pair: CardPair, model: str) -> bool:
+        return not self.refresh and self.entry_path(self.key(pair, model)).exists()
+    
+    def get(self, pair: CardPair, model: str) -> Optional[dict]:
+        if self.refresh:
+            self.misses += 1
+            return None
+        try:
+            with open(self.entry_path(self.key(pair, model)), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['message']
+    
+    def put(self, pair: CardPair, model: str, message: dict):
+        path = self.entry_path(self.key(pair, model))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': model,
+                'prompt': PROMPT_DIGEST,
+                'front': pair.front_path.name if pair.front_path else None,
+                'back': pair.back_path.name if pair.back_path else None,
+                'message': message,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.misses} API calls"
+
+async def extract_card_pair(
+    client: VisionClient,
+    pair: CardPair, 
+    preparer: ImagePreparer,
+    model: str = "claude-sonnet-4-20250514",
+    cache: Optional[ResponseCache] = None,
+) -> dict:
+    """Extract card data from front+back image pair."""
+    if cache:
+        message = cache.get(pair, model)
+        if message is not None:
+            client.telemetry.cached += 1
+            return parse_card_response(pair, model, message)
+    front, back = await preparer.get(pair)
+    start = time.perf_counter()
+    request, tokens = build_request(pair, model, front, back)
+    timing = RequestTiming()
+    message = await client.create(request, tokens, timing)
+    images = [image for image in (front, back) if image]
+    client.telemetry.record_card(
+        pair.front_path.name,
+        timing,
+        total=time.perf_counter() - start,
+        prepare=sum(image.seconds for image in images),
+        image_bytes=sum(len(image.data) for image in images),
+        source_bytes=sum(image.source_bytes for image in images),
+        usage=message.get('usage') or {},
+    )
+    card_data = parse_card_response(pair, model, message)
+    if cache and '_error' not in card_data:
+        cache.put(pair, model, message)
+    return card_data
+
+async def extract_pairs(client: VisionClient, preparer: ImagePreparer, pairs: List[CardPair],
+                        model: str, concurrency: int, on_result,
+                        cache: Optional[ResponseCache] = None) -> None:
+    """
+    Extract pairs with `concurrency` workers; on_result(index, pair,
+    card_data, failed) is called as each finishes (in completion order),
+    with failed=True and an _error entry if the request itself failed.
+    The preparer works up to 2 x concurrency cards ahead of the workers,
+    skipping cards whose response is cached.
+    """
+    queue = list(enumerate(pairs))
+    queue.reverse()  # pop() from the end keeps input order
+    lookahead = max(1, concurrency) * 2
+    prefetched = 0
+    
+    def prefetch(upto: int):
+        nonlocal prefetched
+        while prefetched < min(upto, len(pairs)):
+            pair = pairs[prefetched]
+            if not (cache and cache.has(pair, model)):
+                preparer.prefetch(pair)
+            prefetched += 1
+    
+    async def worker():
+        while queue:
+            index, pair = queue.pop()
+            prefetch(index + 1 + lookahead)
+            front_name = pair.front_path.name if pair.front_path else 'unknown'
+            try:
+                card_data = await extract_card_pair(client, pair, preparer, model, cache)
+            except Exception as e:
+                on_result(index, pair, {'_error': str(e), '_source': {'key': pair.key, 'front': front_name}}, True)
+            else:
+                on_result(index, pair, card_data, False)
+    
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+# =============================================================================
+# CHECKPOINT JOURNAL
+# =============================================================================
+
+def card_front(card_data: dict) -> Optional[str]:
+    return (card_data.get('_source') or {}).get('front')
+
+def card_key(card_data: dict) -> Optional[str]:
+    """
+    The pair a result belongs to (CardPair.key). Results from before the
+    key was recorded get it back from their path metadata; without that,
+    the front image name is all there is.
+    """
+    source = card_data.get('_source') or {}
+    if source.get('key'):
+        return source['key']
+    front = source.get('front')
+    if front and source.get('path_faction') and source.get('path_keyword'):
+        return f"{source['path_faction']}/{source['path_keyword']}/{front}"
+    return front
+
+class Journal:
+    """
+    Append-only checkpoint for extraction runs: one JSON line per finished
+    card ({"card": {...}}) or failed request ({"error": {...}}), fsync'd as
+    it is written. A checkpoint costs one line however far into the run we
+    are, and resuming streams the lines once. Entries are keyed by
+    CardPair.key (card_key); a later line for the same card supersedes an earlier one.
+    """
+    
+    def __init__(self, path: str, fresh: bool = False):
+        self.path = Path(path)
+        self.cards: Dict[str, dict] = {}   # pair key -> card data (incl. JSON parse errors)
+        self.errors: Dict[str, dict] = {}  # pair key -> failed request, until it succeeds
+        if fresh and self.path.exists():
+            self.path.unlink()
+        self._load()
+        self._file = open(self.path, 'ab')
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            offset = 0
+            for line in iter(f.readline, b''):
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    if line.endswith(b'\n'):
+                        print(f"  Warning: skipping bad line at byte {offset} of {self.path}")
+                    else:
+                        f.truncate(offset)  # torn write from an interrupted run
+                        break
+                offset += len(line)
+    
+    def _apply(self, entry: dict):
+        if 'card' in entry:
+            key = card_key(entry['card'])
+            self.cards[key] = entry['card']
+            self.errors.pop(key, None)
+            # A legacy entry known only by front name is superseded too
+            front = card_front(entry['card'])
+            if front != key:
+                self.cards.pop(front, None)
+        else:
+            self.errors[card_key(entry['error'])] = entry['error']
+    
+    def append(self, card: dict = None, error: dict = None, sync: bool = True):
+        entry = {'card': card} if card is not None else {'error': error}
+        self._file.write(json.dumps(entry).encode('utf-8') + b'\n')
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self._apply(entry)
+    
+    def sync(self):
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        self._file.close()
+    
+    def compact(self, output_file: str, pairs: List[CardPair]) -> List[dict]:
+        """
+        Write the journal's cards to output_file in the usual format (a JSON
+        list, indent=2), in pair order; cards not in this run's pairs
+        (e.g. other card types) follow in journal order.
+        """
+        order = {p.key: i for i, p in enumerate(pairs)}
+        results = sorted(self.cards.values(), key=lambda c: order.get(card_key(c), len(order)))
+        tmp = Path(output_file).with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp, output_file)
+        return results
+
+# =============================================================================
+# RE-EXTRACTION
+# =============================================================================
+
+VALIDATION_FLAGS = ('faction_match', 'keyword_match', 'name_match')
+
+def image_changed(card_data: dict, pair: CardPair) -> Optional[bool]:
+    """Whether the pair's images differ from those the result was made from (None if not recorded)."""
+    source = card_data.get('_source') or {}
+    if 'front_digest' not in source:
+        return None
+    return (source['front_digest'], source.get('back_digest')) != (pair.front_digest, pair.back_digest)
+
+def parse_selector(selector: str):
+    """
+    A --reextract selector as a predicate on (pair, previous result or None):
+    
+      failed             no result, an extraction error, or any validation flag false
+      failed:FLAG        FLAG (faction_match, keyword_match, name_match) false
+      changed            an image changed since its result was extracted
+      faction:NAME       cards in a faction folder
+      keyword:NAME       cards in a keyword folder
+      id:ID[,ID...]      CardPair ids or front image names; id:@FILE reads one per line
+    
+    Raises ValueError for an unknown selector.
+    """
+    kind, _, arg = selector.partition(':')
+    if kind == 'failed':
+        if arg and arg not in VALIDATION_FLAGS:
+            raise ValueError(f"unknown validation flag '{arg}' (expected one of {', '.join(VALIDATION_FLAGS)})")
+        flags = [arg] if arg else VALIDATION_FLAGS
+        return lambda pair, card: (card is None or '_error' in card or
+                                   any(not (card.get('_validation') or {}).get(f, True) for f in flags))
+    if kind == 'changed' and not arg:
+        return lambda pair, card: card is not None and bool(image_changed(card, pair))
+    if kind == 'faction' and arg:
+        return lambda pair, card: pair.faction.lower() == arg.lower()
+    if kind == 'keyword' and arg:
+        return lambda pair, card: pair.keyword.lower() == arg.lower()
+    if kind == 'id' and arg:
+        if arg.startswith('@'):
+            with open(arg[1:], 'r') as f:
+                ids = {line.strip() for line in f if line.strip()}
+        else:
+            ids = {i.strip() for i in arg.split(',') if i.strip()}
+        return lambda pair, card: pair.id in ids or (pair.front_path and pair.front_path.name in ids)
+    raise ValueError(f"unknown selector '{selector}'")
+
+def select_pairs(pairs: List[CardPair], existing_results: Dict[str, dict],
+                 selectors: List[str]) -> List[CardPair]:
+    """Pairs matching any of the selectors (see parse_selector), in pair order."""
+    predicates = [parse_selector(s) for s in selectors]
+    selected = []
+    for pair in pairs:
+        card = existing_results.get(pair.key)
+        if any(predicate(pair, card) for predicate in predicates):
+            selected.append(pair)
+    return selected
+
 def process_batch(
     input_dir: str, 
     output_file: str, 
     model: str, 
     card_type: Optional[str] = None,
     limit: Optional[int] = None, 
-    resume: bool = True
+    resume: bool = True,
+    concurrency: int = 4,
+    requests_per_minute: float = 50,
+    tokens_per_minute: float = 30000,
+    transport: Optional[Transport] = None,
+    cache_dir: Optional[str] = None,
+    image_format: str = 'jpeg',
+    image_quality: int = 85,
+    max_edge: int = IMAGE_MAX_EDGE,
+    reextract: Optional[List[str]] = None,
 ):
     """Process all card pairs."""
     
-    client = anthropic.Anthropic()
-    
     # Find all card pairs
     pairs = find_card_pairs(input_dir, card_type_filter=card_type)
     
@@ -392,72 +1265,109 @@ def process_batch(
     print(f"Front only: {len(pairs) - complete}")
     print(f"{'='*60}\n")
     
-    # Load existing results if resuming
-    existing_results = {}
-    if resume and os.path.exists(output_file):
+    # Checkpoints go to a journal next to the output; resume streams it
+    journal_file = str(Path(output_file).with_suffix('.journal.jsonl'))
+    journal = Journal(journal_file, fresh=not resume)
+    if resume and not journal.cards and os.path.exists(output_file):
+        # Output from before the journal: import it once
         with open(output_file, 'r') as f:
             data = json.load(f)
             for c in data:
-                src = c.get('_source', {})
-                if src.get('front'):
-                    existing_results[src['front']] = c
-        print(f"Loaded {len(existing_results)} existing results\n")
+                if card_front(c):
+                    journal.append(card=c, sync=False)
+        journal.sync()
+    existing_results = dict(journal.cards)
+    if existing_results:
+        print(f"Loaded {len(existing_results)} existing results from {journal_file}\n")
     
-    results = list(existing_results.values())
     errors = []
     
-    for i, pair in enumerate(pairs):
-        front_name = pair.front_path.name if pair.front_path else 'unknown'
+    for pair in pairs:
+        hash_pair(pair)
+    
+    if reextract:
+        # Only the selected cards; results replace the old ones in the output
+        todo = select_pairs(pairs, existing_results, reextract)
+        print(f"Re-extracting {len(todo)} of {len(pairs)} cards ({' '.join(reextract)})\n")
+    else:
+        todo = []
+        for i, pair in enumerate(pairs):
+            # Skip if already processed, unless an image changed since (cards
+            # from before image digests were recorded are taken as unchanged)
+            if pair.key in existing_results and not image_changed(existing_results[pair.key], pair):
+                print(f"[{i+1}/{len(pairs)}] Skipping {pair.card_name} (cached)")
+                continue
+            todo.append(pair)
+    
+    preparer = ImagePreparer(image_format, image_quality, max_edge,
+                             cache_dir=cache_dir and str(Path(cache_dir) / 'images'),
+                             threads=max(2, min(concurrency, os.cpu_count() or 1)))
+    cache = ResponseCache(cache_dir, preparer.spec) if cache_dir else None
+    if cache and reextract:
+        cache.refresh = True  # re-extracting means asking again, not replaying
+    
+    telemetry_file = str(Path(output_file).with_suffix('.telemetry.json'))
+    telemetry = Telemetry(len(todo), telemetry_file, settings={
+        'model': model,
+        'concurrency': concurrency,
+        'requests_per_minute': requests_per_minute,
+        'tokens_per_minute': tokens_per_minute,
+        'images': preparer.spec,
+        'reextract': reextract,
+    })
+    
+    done = 0
+    
+    def on_result(index: int, pair: CardPair, card_data: dict, failed: bool):
+        nonlocal done
+        done += 1
+        back_status = "✓" if pair.back_path else "front-only"
+        print(f"[{done}/{len(todo)}] {pair.faction}/{pair.keyword}/{pair.card_name} ({back_status})")
         
-        # Skip if already processed
-        if front_name in existing_results:
-            print(f"[{i+1}/{len(pairs)}] Skipping {pair.card_name} (cached)")
-            continue
+        if failed:
+            print(f"  ✗ Error: {card_data['_error']}")
+        elif '_error' in card_data:
+            print(f"  ⚠ Error: {card_data['_error'][:50]}...")
+            errors.append(card_data)
+        else:
+            # Show validation status
+            val = card_data.get('_validation', {})
+            issues = [k for k, v in val.items() if not v]
+            if issues:
+                print(f"  ⚠ Validation: {', '.join(issues)}")
+            else:
+                print(f"  ✓ OK: Df:{card_data.get('defense')} Sp:{card_data.get('speed')} HP:{card_data.get('health')}")
         
-        back_status = "✓" if pair.back_path else "front-only"
-        print(f"[{i+1}/{len(pairs)}] {pair.faction}/{pair.keyword}/{pair.card_name} ({back_status})")
+        if failed:
+            errors.append(card_data)
+            journal.append(error=card_data)
+        else:
+            journal.append(card=card_data)
         
+        telemetry.card_done(failed)
+        if done % 10 == 0:
+            print(f"  [{telemetry.line()}]\n")
+        telemetry.write()
+    
+    async def run():
+        client = VisionClient(transport or AnthropicTransport(),
+                              RateLimiter(requests_per_minute, tokens_per_minute), telemetry)
         try:
-            card_data = extract_card_pair(client, pair, model)
-            
-            if '_error' in card_data:
-                print(f"  ⚠ Error: {card_data['_error'][:50]}...")
-                errors.append(card_data)
-            else:
-                # Show validation status
-                val = card_data.get('_validation', {})
-                issues = [k for k, v in val.items() if not v]
-                if issues:
-                    print(f"  ⚠ Validation: {', '.join(issues)}")
-                else:
-                    print(f"  ✓ OK: Df:{card_data.get('defense')} Sp:{card_data.get('speed')} HP:{card_data.get('health')}")
-            
-            results.append(card_data)
-            
-            # Save progress every 10 cards
-            if (i + 1) % 10 == 0:
-                with open(output_file, 'w') as f:
-                    json.dump(results, f, indent=2)
-                print(f"  [Progress saved: {len(results)} cards]\n")
-            
-            time.sleep(0.5)
-            
-        except anthropic.RateLimitError:
-            print("  ⚠ Rate limited, waiting 60s...")
-            time.sleep(60)
-            try:
-                card_data = extract_card_pair(client, pair, model)
-                results.append(card_data)
-            except Exception as e:
-                errors.append({'_error': str(e), '_source': {'front': front_name}})
-            
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            errors.append({'_error': str(e), '_source': {'front': front_name}})
+            await extract_pairs(client, preparer, todo, model, concurrency, on_result, cache)
+        finally:
+            await client.transport.close()
+            preparer.close()
+    
+    try:
+        if todo:
+            asyncio.run(run())
+    finally:
+        journal.close()
+        if todo:
+            telemetry.write(force=True)
     
-    # Final save
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    # Final save: the journal compacted into the output format
+    results = journal.compact(output_file, pairs)
     
     # Summary
     print(f"\n{'='*60}")
@@ -466,6 +1376,35 @@ def process_batch(
     print(f"Total processed: {len(results)}")
     print(f"Errors: {len(errors)}")
     print(f"Output: {output_file}")
+    if todo:
+        t = telemetry.summary()
+        print(f"Extracted {t['cards_done']} cards in {format_duration(t['elapsed_s'])} "
+              f"({t['cards_per_min']:.1f} cards/min, {t['requests_per_min']:.1f} requests/min, "
+              f"{concurrency} workers)")
+        print(f"Retries: {t['retries']} ({t['rate_limited']} rate limited), waits: "
+              f"{t['limiter_wait_s']:.1f}s rate limiter, {t['rate_limit_wait_s']:.1f}s after 429s (summed over workers)")
+    if todo and telemetry.cards:
+        kb = t['image_bytes_per_card'] / 1024
+        source_kb = t['source_bytes_per_card'] * 4 / 3 / 1024  # as base64
+        saving = ""
+        if preparer.format != 'original':
+            change = kb / source_kb - 1
+            saving = f" ({abs(change):.0%} {'more' if change > 0 else 'less'} than the original files)"
+        print(f"Images ({preparer.spec}): {kb:,.0f} KB/card sent{saving}, "
+              f"{t['prepare_s_per_card'] * 1000:.0f} ms/card to prepare")
+        rtt, queue, card = t['round_trip_s'], t['queue_wait_s'], t['card_s']
+        print(f"API round trip (successful attempt): p50 {rtt['p50']:.2f}s, "
+              f"p95 {rtt['p95']:.2f}s, p99 {rtt['p99']:.2f}s")
+        print(f"Queued in rate limiter: p50 {queue['p50']:.2f}s, p95 {queue['p95']:.2f}s, "
+              f"{t['queue_wait_total_s']:.1f}s total")
+        print(f"Per card (queueing, retries and round trips): p50 {card['p50']:.2f}s, "
+              f"p95 {card['p95']:.2f}s, p99 {card['p99']:.2f}s")
+        if t['input_tokens_per_card'] is not None:
+            print(f"Tokens: {t['input_tokens']:,} in, {t['output_tokens']:,} out "
+                  f"({t['input_tokens_per_card']:,.0f}/{t['output_tokens_per_card'] or 0:,.0f} per card)")
+        print(f"Telemetry: {telemetry_file}")
+    if cache:
+        print(f"Response cache: {cache.summary()}")
     
     # Validation summary
     valid_results = [r for r in results if '_validation' in r]
@@ -505,6 +1444,29 @@ def main():
                         help='List detected pairs and exit')
     parser.add_argument('--faction', '-f',
                         help='Filter by faction name')
+    parser.add_argument('--concurrency', '-c', type=int, default=4,
+                        help='Requests in flight at once (default: 4)')
+    parser.add_argument('--rpm', type=float, default=50,
+                        help='Requests per minute limit, 0 for none (default: 50)')
+    parser.add_argument('--tpm', type=float, default=30000,
+                        help='Input tokens per minute limit, 0 for none (default: 30000)')
+    parser.add_argument('--base-url',
+                        help='API base URL (e.g. a local stub server for testing)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Response cache directory (default: .vision_cache next to --output)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always call the API')
+    parser.add_argument('--image-format', choices=['jpeg', 'webp', 'original'], default='jpeg',
+                        help='Re-encode images before upload (default: jpeg)')
+    parser.add_argument('--image-quality', type=int, default=85,
+                        help='JPEG/WebP quality (default: 85)')
+    parser.add_argument('--reextract', action='append', metavar='SELECTOR',
+                        help='Re-extract only matching cards and merge them into --output: failed, '
+                             'failed:FLAG, changed, faction:NAME, keyword:NAME, id:ID[,ID...] or '
+                             'id:@FILE (repeatable; a card matching any is re-extracted)')
+    parser.add_argument('--max-edge', type=int, default=IMAGE_MAX_EDGE,
+                        help=f'Downsize images to this long edge in px (default: {IMAGE_MAX_EDGE}, '
+                             f'the size the API scales to anyway)')
     
     args = parser.parse_args()
     
@@ -528,6 +1490,15 @@ def main():
             print(f"    {p.card_name} ({p.card_type}) [back:{back}]")
         return
     
+    if args.reextract:
+        if args.no_resume:
+            parser.error("--reextract merges into existing results; it can't be used with --no-resume")
+        try:
+            for selector in args.reextract:
+                parse_selector(selector)
+        except (ValueError, OSError) as e:
+            parser.error(f"--reextract: {e}")
+    
     if not os.environ.get('ANTHROPIC_API_KEY'):
         print("Error: ANTHROPIC_API_KEY not set")
         sys.exit(1)
@@ -542,7 +1513,16 @@ def main():
         model=args.model,
         card_type=args.card_type,
         limit=args.limit,
-        resume=not args.no_resume
+        resume=not args.no_resume,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        transport=AnthropicTransport(base_url=args.base_url),
+        cache_dir=None if args.no_cache else (args.cache or str(Path(args.output).parent / '.vision_cache')),
+        image_format=args.image_format,
+        image_quality=args.image_quality,
+        max_edge=args.max_edge,
+        reextract=args.reextract,
     )
 
 if __name__ == '__main__':
@@ -254,9 +254,15 @@ class CardFixer:
         
         return cards
     
-    def fix_cards(self, cards_data: Dict) -> Dict:
+    def fix_cards(self, cards_data: Any) -> Any:
         """Apply all corrections to card data."""
-        cards = cards_data.get('cards', [])
+        # Handle both list and {cards: [...]} formats
+        if isinstance(cards_data, list):
+            cards = cards_data
+            is_dict_format = False
+        else:
+            cards = cards_data.get('cards', [])
+            is_dict_format = True
         
         print(f"\nProcessing {len(cards)} cards...")
         
@@ -272,10 +278,13 @@ class CardFixer:
         cards = self.add_missing_cards(cards)
         
         # Re-sort by faction, subfaction, name
-        cards.sort(key=lambda c: (c.get('faction', ''), c.get('subfaction', ''), c.get('name', '')))
+        cards.sort(key=lambda c: (c.get('faction') or '', c.get('subfaction') or '', c.get('name') or ''))
         
-        cards_data['cards'] = cards
-        cards_data['total_cards'] = len(cards)
+        if is_dict_format:
+            cards_data['cards'] = cards
+            cards_data['total_cards'] = len(cards)
+        else:
+            cards_data = cards
         
         # Print summary
         print(f"\nCorrections applied:")
@@ -373,7 +382,8 @@ Examples:
     with open(args.input, 'r', encoding='utf-8') as f:
         cards_data = json.load(f)
     
-    print(f"Loaded {cards_data.get('total_cards', len(cards_data.get('cards', [])))} cards from {args.input}")
+    cards_list = cards_data.get('cards', []) if isinstance(cards_data, dict) else cards_data
+    print(f"Loaded {len(cards_list)} cards from {args.input}")
     
     # Apply corrections
     fixer = CardFixer(corrections_file=args.corrections, verbose=args.verbose)
@@ -383,7 +393,8 @@ Examples:
     with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(fixed_data, f, indent=2, ensure_ascii=False)
     
-    print(f"\nWrote {fixed_data['total_cards']} cards to {args.output}")
+    fixed_list = fixed_data.get('cards', []) if isinstance(fixed_data, dict) else fixed_data
+    print(f"\nWrote {len(fixed_list)} cards to {args.output}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Malifaux 4E Keyword Matcher
+
+Multi-pattern substring matcher (Aho-Corasick) for keyword detection.
+All spellings of all keywords - canonical, alternate, OCR-doubled - go
+into one automaton, built once per process, and a single left-to-right
+pass over the text reports every hit.
+
+The automaton is stored as a full DFA (every state has its failure
+transitions folded in), so scanning is one dict lookup per character
+with no failure-link walking.
+
+Usage:
+    from keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher([('aaccaaddeemmiicc', 'Academic'), ('academic', 'Academic')])
+    matcher.values(text.lower())              # {'Academic'}
+    for start, end, value in matcher.iter_matches(text.lower()):
+        ...
+
+    python keyword_matcher.py cards.json --bench
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over (pattern, value) pairs."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, Any]]] = [[]]
+        self.patterns: List[Tuple[str, Any]] = []
+
+        # Trie of all patterns
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            self.patterns.append((pattern, value))
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((len(pattern), value))
+
+        # Breadth-first: failure links, inherited outputs, and each state's
+        # full transition table (its failure state's table plus its own edges;
+        # the failure state is shallower, so its table is already complete)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = []
+        for child in goto[0].values():
+            delta[child] = {**delta[0], **goto[child]}
+            queue.append(child)
+        for state in queue:  # grows while iterating
+            for ch, child in goto[state].items():
+                target = delta[fail[state]].get(ch, 0)
+                fail[child] = target
+                outputs[child] = outputs[child] + outputs[target]
+                delta[child] = {**delta[target], **goto[child]}
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Every (start, end, value) occurrence, including overlapping ones."""
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for length, value in outputs[state]:
+                    yield i + 1 - length, i + 1, value
+
+    def values(self, text: str) -> Set[Any]:
+        """Set of values with at least one occurrence in text."""
+        delta, outputs = self._delta, self._outputs
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(value for _, value in outputs[state])
+        return found
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+def is_word_match(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is bounded like regex \\b...\\b (word/non-word change at both ends)."""
+    def word(i: int) -> bool:
+        return 0 <= i < len(text) and (text[i].isalnum() or text[i] == '_')
+    return word(start - 1) != word(start) and word(end - 1) != word(end)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def bench(fn, texts: List[str], min_seconds: float = 0.5) -> float:
+    """Scans per second of fn over texts."""
+    scans = 0
+    start = time.perf_counter()
+    while True:
+        for text in texts:
+            fn(text)
+        scans += len(texts)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return scans / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the keyword matcher on card raw_text')
+    parser.add_argument('input', type=Path, help='Cards JSON with raw_text (e.g. cards_extracted.json)')
+    parser.add_argument('--bench', action='store_true', help='Compare scans/sec with a per-pattern loop')
+    args = parser.parse_args()
+
+    from parse_cards import MalifauxCardParser
+    from repair_keywords import keyword_matcher as repair_matcher
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # Handle both list and {cards: [...]} formats
+    cards = data if isinstance(data, list) else data.get('cards', [])
+    texts = [c['raw_text'].lower() for c in cards if c.get('raw_text')]
+    if not texts:
+        print("No raw_text in input")
+        return 1
+
+    word, doubled = MalifauxCardParser.keyword_matchers()
+    repair = repair_matcher()
+    print(f"{len(texts)} texts, {sum(map(len, texts)) // len(texts)} chars average")
+    for name, matcher in (('parse_cards words', word), ('parse_cards doubled', doubled),
+                          ('repair_keywords', repair)):
+        patterns = [p for p, _ in matcher.patterns]
+        print(f"  {name} ({len(patterns)} patterns)")
+        if args.bench:
+            loop = bench(lambda t: [p for p in patterns if p in t], texts)
+            automaton = bench(matcher.values, texts)
+            print(f"    per-pattern loop: {loop:10,.0f} scans/s")
+            print(f"    automaton:        {automaton:10,.0f} scans/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,12 +6,24 @@ Extracts structured data from M4E stat card PDFs.
 Usage:
     python parse_cards.py --input /path/to/pdfs --output ../src/data/cards.json
     python parse_cards.py --input /path/to/pdfs --output cards.json --overrides health_overrides.json
+    python parse_cards.py --input /path/to/pdfs --output cards.json --workers 4
+    python parse_cards.py --input /path/to/pdfs --output cards.json --cache .parse_cache
+    python parse_cards.py --input /path/to/pdfs --output cards.json --layout
+    python parse_cards.py --input /path/to/pdfs --output cards.json --stream cards.jsonl
+    python parse_cards.py --input /path/to/pdfs --output cards.json --verify-health
 
 File naming convention expected:
     M4E_Stat_{Faction}_{Subfaction}_{CardName}.pdf
     M4E_Stat_{Faction}_{Subfaction}_{CardName}_front.png
     M4E_Stat_{Faction}_{Subfaction}_{CardName}_back.png
 
+Health:
+    Counted from the health track's vector objects on page 1 of the PDF.
+    Only when that finds nothing is the front PNG decoded (--images-dir, or
+    next to the PDF) and its pips counted. --verify-health decodes the
+    image for every card and prints a warning where the two disagree (the
+    PDF value is kept).
+
 Health Overrides:
     Create a JSON file with card IDs or image base names as keys and health values:
     {
@@ -22,15 +34,25 @@ Health Overrides:
 
 import os
 import re
+import sys
 import json
+import time
 import argparse
+import contextlib
+import functools
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional
 from dataclasses import dataclass, field, asdict
 
+from keyword_matcher import KeywordMatcher, is_word_match
+
 # Try to import pdfplumber, provide helpful error if missing
 try:
     import pdfplumber
+    from pdfplumber.utils import extract_words
 except ImportError:
     print("Error: pdfplumber not installed. Run: pip install pdfplumber")
     exit(1)
@@ -124,6 +146,25 @@ class Card:
     raw_text: str = ""
 
 
+@dataclass
+class PdfContent:
+    """What read_pdf() gets out of a PDF's bytes, before any path-based fields."""
+    page1_text: str = ""
+    page2_text: str = ""
+    pdf_name: Optional[str] = None
+    stats: dict = field(default_factory=dict)
+    keywords: list = field(default_factory=list)
+    characteristics: list = field(default_factory=list)
+    minion_limit: Optional[int] = None
+    abilities: list = field(default_factory=list)
+    attack_actions: list = field(default_factory=list)
+    tactical_actions: list = field(default_factory=list)
+    base_size: Optional[str] = None
+    station: Optional[int] = None
+    vector_health: Optional[int] = None
+    vector_soulstone: Optional[bool] = None
+
+
 class MalifauxCardParser:
     """Parser for Malifaux 4E stat card PDFs."""
     
@@ -154,6 +195,62 @@ class MalifauxCardParser:
         'wizz bang': 'Wizz-Bang',
     }
     
+    # Comprehensive keyword list - all M4E HIRING keywords
+    # NOTE: Creature types (Living, Undead, Construct, Beast, Spirit, Nightmare, Tyrant, Elemental)
+    # are CHARACTERISTICS, not keywords - they are extracted separately
+    # IMPORTANT: Use canonical hyphenated forms where applicable (Big-Hat, not Big Hat)
+    HIRING_KEYWORDS = [
+        # Universal keywords
+        'Versatile', 
+        # Special type keywords (these ARE keywords, not characteristics)
+        'Golem', 'Gamin', 'Effigy', 'Emissary',
+        # ═══════════════════════════════════════════════════════════════
+        # FACTION-SPECIFIC HIRING KEYWORDS - Complete M4E List
+        # ═══════════════════════════════════════════════════════════════
+        # Arcanists
+        'Academic', 'December', 'Foundry', 'Oxfordian', 'Performer',
+        'Showgirl', 'Star Theater', 'Wildfire', 'Witness',
+        # Bayou
+        'Bayou', 'Big-Hat', 'Kin', 'Sooey', 'Swampfiend', 'Tricksy', 'Wizz-Bang',
+        # Explorer's Society  
+        'Boundary', 'Descendant', 'Explorer', 'Seeker', 'Wastrel',
+        # Guild
+        'Augmented', 'Elite', 'Executioner', 'Family', 'Guard', 
+        'Journalist', 'Marshal', 'Witch-Hunter',
+        # Neverborn
+        'Cavalier', 'Chimera', 'Fae', 'Mimic', 'Nightmare', 'Woe',
+        # Outcasts
+        'Amalgam', 'Bandit', 'Crossroads', 'Freikorps', 'Mercenary', 
+        'Obliteration', 'Pioneer', 'Plague', 'Tormented',
+        # Resurrectionists
+        'Ancestor', 'Brood', 'Forgotten', 'Redchapel', 'Revenant', 
+        'Returned', 'Transmortis', 'Urami',
+        # Ten Thunders
+        'Honeypot', 'Last Blossom', 'Monk', 'Oni', 'Qi and Gong',
+        'Retainer', 'Tri-Chi',
+        # Cross-faction / Special
+        'Savage', 'Frontier', 'Rare',
+        # Faction names (some models have these as keywords)
+        'Guild', 'Arcanist', 'Neverborn', 'Resurrectionist', 
+        'Ten Thunders', 'Outcast', 'Bayou', "Explorer's Society",
+        # ═══════════════════════════════════════════════════════════════
+        # ALTERNATE SPELLINGS - Check both forms for robustness
+        # ═══════════════════════════════════════════════════════════════
+        'Big Hat',       # In case OCR produces non-hyphenated
+        'Witch Hunter',  # In case OCR produces non-hyphenated
+        'Tri Chi',       # In case OCR produces non-hyphenated
+    ]
+    
+    # Health track geometry on page 1, as fractions of the page size
+    # (same layout the image crop in extract_health_from_image relies on)
+    HEALTH_BAND_TOP = 0.88          # track sits in the bottom 12% of the card
+    PIP_DIAMETER = (0.035, 0.075)   # pip size relative to page width
+    SOULSTONE_MAX_X = 0.10          # soulstone icon is left of the first pip
+    TRACK_MAX_X = 0.93              # ignore the right frame edge
+    
+    # Image fallback decodes card fronts at 1/IMAGE_SCALE resolution
+    IMAGE_SCALE = 2
+    
     # Common keywords in Malifaux
     COMMON_KEYWORDS = [
         'Versatile', 'Unique', 'Totem', 'Enforcer', 'Minion', 'Henchman', 'Master',
@@ -163,11 +260,18 @@ class MalifauxCardParser:
         'Ancestor', 'Last Blossom', 'Oni', 'Urami', 'Savage', 'Swampfiend',
     ]
     
-    def __init__(self, verbose: bool = False, overrides_file: str = None, images_dir: str = None):
+    def __init__(self, verbose: bool = False, overrides_file: str = None, images_dir: str = None,
+                 layout: bool = False, verify_health: bool = False):
         self.verbose = verbose
+        self.layout = layout
+        self.verify_health = verify_health
         self.health_overrides = {}
         self.overrides_applied = 0
+        self.overrides_file = overrides_file
         self.images_dir = Path(images_dir) if images_dir else None
+        # Image health results by image hash; persisted when a parse cache is used
+        self.image_results: Dict[str, tuple] = {}
+        self.image_cache_dir: Optional[Path] = None
         
         if self.images_dir:
             print(f"Using images directory: {self.images_dir}")
@@ -548,81 +652,53 @@ class MalifauxCardParser:
         # Use improved characteristics extraction
         characteristics, minion_limit = self.extract_characteristics_improved(text)
         
-        # Comprehensive keyword list - all M4E HIRING keywords
-        # NOTE: Creature types (Living, Undead, Construct, Beast, Spirit, Nightmare, Tyrant, Elemental)
-        # are CHARACTERISTICS, not keywords - they are extracted separately
-        # IMPORTANT: Use canonical hyphenated forms where applicable (Big-Hat, not Big Hat)
-        keyword_list = [
-            # Universal keywords
-            'Versatile', 
-            # Special type keywords (these ARE keywords, not characteristics)
-            'Golem', 'Gamin', 'Effigy', 'Emissary',
-            # ═══════════════════════════════════════════════════════════════
-            # FACTION-SPECIFIC HIRING KEYWORDS - Complete M4E List
-            # ═══════════════════════════════════════════════════════════════
-            # Arcanists
-            'Academic', 'December', 'Foundry', 'Oxfordian', 'Performer',
-            'Showgirl', 'Star Theater', 'Wildfire', 'Witness',
-            # Bayou
-            'Bayou', 'Big-Hat', 'Kin', 'Sooey', 'Swampfiend', 'Tricksy', 'Wizz-Bang',
-            # Explorer's Society  
-            'Boundary', 'Descendant', 'Explorer', 'Seeker', 'Wastrel',
-            # Guild
-            'Augmented', 'Elite', 'Executioner', 'Family', 'Guard', 
-            'Journalist', 'Marshal', 'Witch-Hunter',
-            # Neverborn
-            'Cavalier', 'Chimera', 'Fae', 'Mimic', 'Nightmare', 'Woe',
-            # Outcasts
-            'Amalgam', 'Bandit', 'Crossroads', 'Freikorps', 'Mercenary', 
-            'Obliteration', 'Pioneer', 'Plague', 'Tormented',
-            # Resurrectionists
-            'Ancestor', 'Brood', 'Forgotten', 'Redchapel', 'Revenant', 
-            'Returned', 'Transmortis', 'Urami',
-            # Ten Thunders
-            'Honeypot', 'Last Blossom', 'Monk', 'Oni', 'Qi and Gong',
-            'Retainer', 'Tri-Chi',
-            # Cross-faction / Special
-            'Savage', 'Frontier', 'Rare',
-            # Faction names (some models have these as keywords)
-            'Guild', 'Arcanist', 'Neverborn', 'Resurrectionist', 
-            'Ten Thunders', 'Outcast', 'Bayou', "Explorer's Society",
-            # ═══════════════════════════════════════════════════════════════
-            # ALTERNATE SPELLINGS - Check both forms for robustness
-            # ═══════════════════════════════════════════════════════════════
-            'Big Hat',       # In case OCR produces non-hyphenated
-            'Witch Hunter',  # In case OCR produces non-hyphenated
-            'Tri Chi',       # In case OCR produces non-hyphenated
-        ]
-        
-        for kw in keyword_list:
-            # Check in keyword section only
-            if re.search(rf'\b{re.escape(kw)}\b', keyword_section, re.IGNORECASE):
-                if kw not in keywords and kw not in characteristics:
-                    keywords.append(kw)
-            else:
-                # Check for doubled version in raw keyword section
-                doubled = ''.join(c+c for c in kw)
-                doubled_lower = doubled.lower()
-                raw_lower = raw_keyword_section.lower()
-                
-                # Check if full or partial doubled appears in text
-                # OR if text contains start of doubled (for truncated patterns)
-                if doubled_lower in raw_lower:
-                    if kw not in keywords and kw not in characteristics:
-                        keywords.append(kw)
-                else:
-                    # Check for partial matches (text might have truncated doubled version)
-                    # Take first 8-16 chars of doubled and check both directions
-                    for length in [16, 14, 12, 10, 8]:
-                        partial = doubled_lower[:min(length, len(doubled_lower))]
-                        if len(partial) >= 8:
-                            if partial in raw_lower or raw_lower.replace('\n', '').replace(' ', '') in doubled_lower:
-                                if kw not in keywords and kw not in characteristics:
-                                    keywords.append(kw)
-                                break
+        # One pass per section over all spellings (see keyword_matchers)
+        word_matcher, doubled_matcher = self.keyword_matchers()
+        found = set()
+        section_lower = keyword_section.lower()
+        for start, end, kw in word_matcher.iter_matches(section_lower):
+            if kw not in found and is_word_match(section_lower, start, end):
+                found.add(kw)
+        raw_lower = raw_keyword_section.lower()
+        found |= doubled_matcher.values(raw_lower)
+        
+        # A short raw section that is itself part of a doubled keyword
+        raw_compressed = raw_lower.replace('\n', '').replace(' ', '')
+        if len(raw_compressed) <= 2 * max(map(len, self.HIRING_KEYWORDS)):
+            found.update(kw for kw in self.HIRING_KEYWORDS
+                         if len(kw) >= 4 and raw_compressed in self.doubled(kw).lower())
+        
+        for kw in self.HIRING_KEYWORDS:
+            if kw in found and kw not in keywords and kw not in characteristics:
+                keywords.append(kw)
         
         return keywords, characteristics, minion_limit
     
+    @staticmethod
+    def doubled(text: str) -> str:
+        """OCR-doubled spelling: "Kin" -> "KKiinn"."""
+        return ''.join(c + c for c in text)
+    
+    _keyword_matchers = None
+    
+    @classmethod
+    def keyword_matchers(cls) -> tuple:
+        """
+        (word matcher, doubled matcher) over HIRING_KEYWORDS, built once per process.
+        
+        The word matcher finds keywords in cleaned text (callers check word
+        boundaries). The doubled matcher finds OCR-doubled spellings in raw
+        text: the first 8 doubled chars for keywords of 4+ letters (so a
+        truncated spelling still matches), the full doubled form otherwise.
+        """
+        if cls._keyword_matchers is None:
+            words = KeywordMatcher((kw.lower(), kw) for kw in cls.HIRING_KEYWORDS)
+            doubled = KeywordMatcher(
+                ((cls.doubled(kw).lower()[:8] if len(kw) >= 4 else cls.doubled(kw).lower()), kw)
+                for kw in cls.HIRING_KEYWORDS)
+            cls._keyword_matchers = (words, doubled)
+        return cls._keyword_matchers
+    
     def normalize_keywords(self, keywords: list) -> list:
         """Normalize keywords to canonical forms (handle hyphen vs space variations)."""
         normalized = []
@@ -632,12 +708,13 @@ class MalifauxCardParser:
                 normalized.append(canonical)
         return normalized
     
-    def extract_abilities(self, text: str) -> list:
+    def extract_abilities(self, text: str, doubled: bool = True) -> list:
         """Extract passive abilities from front of card."""
         abilities = []
         
         # Clean doubled text
-        text = self.clean_doubled_text(text)
+        if doubled:
+            text = self.clean_doubled_text(text)
         
         # Abilities follow pattern: "Name: Description text."
         # They appear after the stats and keywords
@@ -742,153 +819,188 @@ class MalifauxCardParser:
             return f"{match.group(1)}mm"
         return None
     
-    def extract_health_from_image(self, image_path: str) -> Optional[int]:
+    def detect_health_track(self, image_path: str, scale: int = None) -> tuple:
         """
-        Extract health pip count from the bottom of a card front image.
-        
-        Uses HoughCircles detection to find the circular health pips at the
-        bottom of the card. The soulstone indicator (leftmost circle) is
-        filtered out based on its x position.
+        Health pips and soulstone indicator from one decode of a card front image.
         
-        Args:
-            image_path: Path to the card front PNG image
+        The PNG is decoded straight to grayscale at 1/scale resolution
+        (IMREAD_REDUCED_GRAYSCALE_2 by default), cropped to the bottom 12%
+        of the card, and searched once with HoughCircles; the full-size
+        pixel parameters are divided by the scale. The leftmost circle
+        (x < 75 at full size) is the soulstone indicator, the rest of the
+        row are the health pips. Results are cached by parser version, image
+        hash and scale (in memory, and under <cache>/images/ when a parse
+        cache is in use), so detector changes are not served stale results.
         
         Returns:
-            Health value (int) or None if extraction failed
+            (health or None, soulstone indicator found)
         """
         if not HAS_CV2:
             self.log("OpenCV not available, skipping image-based health extraction")
-            return None
+            return None, False
         
         if not os.path.exists(image_path):
             self.log(f"Health image not found: {image_path}")
-            return None
+            return None, False
+        
+        digest = file_digest(image_path)
+        key = self.image_cache_key(digest, scale)
+        scale = scale or self.IMAGE_SCALE
+        if key in self.image_results:
+            return self.image_results[key]
+        cache_file = self.image_cache_dir / digest[:2] / f"{key}.json" if self.image_cache_dir else None
+        if cache_file and cache_file.exists():
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    result = tuple(json.load(f))
+                self.image_results[key] = result
+                return result
+            except (OSError, json.JSONDecodeError, TypeError):
+                pass
         
         try:
-            # Load image with OpenCV
-            img = cv2.imread(image_path)
-            if img is None:
-                self.log(f"Failed to load image: {image_path}")
-                return None
-            
-            height, width = img.shape[:2]
-            
-            # Crop to bottom 12% of card (where health pips are)
-            bottom_start = int(height * 0.88)
-            bottom_region = img[bottom_start:height, :]
-            region_height = bottom_region.shape[0]
-            
-            # Convert to grayscale and blur for better circle detection
-            gray = cv2.cvtColor(bottom_region, cv2.COLOR_BGR2GRAY)
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-            
-            # Use HoughCircles for robust circle detection
-            # This works better than contour detection for tightly-packed pips
-            circles = cv2.HoughCircles(
-                blurred,
-                cv2.HOUGH_GRADIENT,
-                dp=1,
-                minDist=35,      # Min distance between circle centers
-                param1=50,       # Canny high threshold
-                param2=30,       # Accumulator threshold
-                minRadius=15,    # Min radius for health pips
-                maxRadius=25     # Max radius for health pips
-            )
-            
-            if circles is None:
-                return None
-            
-            circles = np.uint16(np.around(circles))
-            sorted_circles = sorted(circles[0], key=lambda c: c[0])
-            
-            # Filter to pip y-range (middle of cropped region, where pips are)
-            pip_circles = [c for c in sorted_circles 
-                         if region_height * 0.5 < c[1] < region_height * 0.9]
-            
-            # Filter out soulstone diamond (leftmost circle, typically x < 75)
-            pip_circles = [c for c in pip_circles if c[0] > 75]
-            
-            # Filter out any circles in the right frame edge
-            pip_circles = [c for c in pip_circles if c[0] < width - 50]
-            
-            health = len(pip_circles)
-            
-            # Sanity check: health should be between 1 and 20
-            if 1 <= health <= 20:
-                return health
-            
-            return None
-            
+            result = self._detect_health_track(image_path, scale)
         except Exception as e:
             self.log(f"Error extracting health from image: {e}")
-            return None
+            return None, False
+        
+        self.image_results[key] = result
+        if cache_file:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(list(result), f)
+            os.replace(tmp, cache_file)
+        return result
     
-    def extract_soulstone_cache_from_image(self, image_path: str) -> bool:
-        """
-        Detect if the card has a soulstone cache indicator.
+    def image_cache_key(self, image_digest: str, scale: int = None) -> str:
+        """Cache key of one detect_health_track result."""
+        return f"{parser_version()[:16]}-{image_digest}-{scale or self.IMAGE_SCALE}"
+    
+    def _detect_health_track(self, image_path: str, scale: int) -> tuple:
+        # Decode once, already grayscale and downscaled by the codec
+        flags = {1: cv2.IMREAD_GRAYSCALE, 2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+                 4: cv2.IMREAD_REDUCED_GRAYSCALE_4, 8: cv2.IMREAD_REDUCED_GRAYSCALE_8}
+        gray = cv2.imread(image_path, flags[scale])
+        if gray is None:
+            self.log(f"Failed to load image: {image_path}")
+            return None, False
+        
+        height, width = gray.shape[:2]
+        
+        # Crop to bottom 12% of card (where health pips are)
+        bottom_start = int(height * 0.88)
+        band = gray[bottom_start:height, :]
+        region_height = band.shape[0]
+        
+        # Blur for better circle detection (kernel scaled with the image, kept odd)
+        k = max(3, (5 // scale) | 1)
+        blurred = cv2.GaussianBlur(band, (k, k), 0)
+        
+        # Use HoughCircles for robust circle detection
+        # This works better than contour detection for tightly-packed pips.
+        # Full-resolution values: minDist=35, minRadius=15, maxRadius=25
+        circles = cv2.HoughCircles(
+            blurred,
+            cv2.HOUGH_GRADIENT,
+            dp=1,
+            minDist=35 / scale,          # Min distance between circle centers
+            param1=50,                   # Canny high threshold
+            param2=30 / scale ** 0.5,    # Accumulator threshold (fewer edge pixels per circle)
+            minRadius=int(15 / scale),   # Min radius for health pips
+            maxRadius=-(-25 // scale)    # Max radius for health pips (rounded up)
+        )
         
-        The soulstone cache is indicated by a diamond/circle at the leftmost
-        position of the health track (x < 75). Masters and Henchmen have this.
+        if circles is None:
+            return None, False
         
-        Args:
-            image_path: Path to the card front PNG image
+        circles = np.around(circles[0]).astype(int)
+        soulstone_x = 75 / scale
         
-        Returns:
-            True if soulstone cache detected, False otherwise
+        # Soulstone indicator: leftmost position, lower part of the band
+        soulstone = any(c[0] < soulstone_x and region_height * 0.3 < c[1] < region_height * 0.95
+                        for c in circles)
+        
+        # Filter to pip y-range (middle of cropped region, where pips are),
+        # drop the soulstone position and the right frame edge
+        pip_circles = [c for c in circles
+                       if region_height * 0.5 < c[1] < region_height * 0.9
+                       and soulstone_x < c[0] < width - 50 / scale]
+        
+        health = len(pip_circles)
+        
+        # Sanity check: health should be between 1 and 20
+        return (health if 1 <= health <= 20 else None), soulstone
+    
+    def extract_health_from_image(self, image_path: str) -> Optional[int]:
+        """Health pip count from a card front image (see detect_health_track)."""
+        return self.detect_health_track(image_path)[0]
+    
+    def extract_soulstone_cache_from_image(self, image_path: str) -> bool:
+        """Soulstone cache indicator in a card front image (see detect_health_track)."""
+        return self.detect_health_track(image_path)[1]
+    
+    def extract_health_from_geometry(self, page) -> tuple:
         """
-        if not HAS_CV2:
-            return False
+        Health pips and soulstone icon from page 1's vector objects.
         
-        if not os.path.exists(image_path):
-            return False
+        Pips are drawn as round curves of a fixed size in one row along the
+        bottom of the card; the soulstone cache icon is a curve of the same
+        size left of the track. If the track is not vector art (e.g. a
+        flattened card image), the numbers printed in the pips are used
+        instead when they form a clean 1..N sequence.
         
-        try:
-            # Load image with OpenCV
-            img = cv2.imread(image_path)
-            if img is None:
-                return False
-            
-            height, width = img.shape[:2]
-            
-            # Crop to bottom 12% of card (where health pips are)
-            bottom_start = int(height * 0.88)
-            bottom_region = img[bottom_start:height, :]
-            region_height = bottom_region.shape[0]
-            
-            # Convert to grayscale and blur for better circle detection
-            gray = cv2.cvtColor(bottom_region, cv2.COLOR_BGR2GRAY)
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-            
-            # Use HoughCircles to find circles
-            circles = cv2.HoughCircles(
-                blurred,
-                cv2.HOUGH_GRADIENT,
-                dp=1,
-                minDist=35,
-                param1=50,
-                param2=30,
-                minRadius=15,
-                maxRadius=25
-            )
-            
-            if circles is None:
-                return False
-            
-            circles = np.uint16(np.around(circles))
-            
-            # Check for a circle in the leftmost position (x < 75)
-            # This is where the soulstone cache indicator appears
-            for circle in circles[0]:
-                x, y = circle[0], circle[1]
-                # Check if in the soulstone position (leftmost) and correct y-range
-                if x < 75 and region_height * 0.3 < y < region_height * 0.95:
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            self.log(f"Error detecting soulstone cache: {e}")
-            return False
+        Returns:
+            (health or None, soulstone icon seen or None if undetermined)
+        """
+        width, height = float(page.width), float(page.height)
+        band_top = height * self.HEALTH_BAND_TOP
+        min_d, max_d = (width * f for f in self.PIP_DIAMETER)
+        
+        # Round pip-sized curves in the band, one per center (outline and
+        # fill are often separate paths)
+        centers = []
+        for obj in page.curves:
+            w, h = obj['x1'] - obj['x0'], obj['bottom'] - obj['top']
+            if obj['top'] < band_top or not (min_d <= w <= max_d and min_d <= h <= max_d):
+                continue
+            if abs(w - h) > 0.15 * max(w, h):
+                continue
+            cx, cy = (obj['x0'] + obj['x1']) / 2, (obj['top'] + obj['bottom']) / 2
+            if not any(abs(cx - x) < min_d / 2 and abs(cy - y) < min_d / 2 for x, y in centers):
+                centers.append((cx, cy))
+        
+        if centers:
+            # The track is the most populated row
+            rows = {}
+            for cx, cy in centers:
+                row = next((y for y in rows if abs(y - cy) < min_d / 2), cy)
+                rows.setdefault(row, []).append(cx)
+            row_y = max(rows, key=lambda y: len(rows[y]))
+            xs = rows[row_y]
+            soulstone = any(x < width * self.SOULSTONE_MAX_X for x in xs)
+            pips = [x for x in xs if width * self.SOULSTONE_MAX_X <= x < width * self.TRACK_MAX_X]
+            if 1 <= len(pips) <= 20:
+                return len(pips), soulstone
+        
+        # No vector pips: read the track numbers by position. Doubled text
+        # layers repeat each char at the same spot, so dedupe by position.
+        chars = {}
+        for ch in page.chars:
+            if ch['top'] >= band_top and ch['text'].isdigit():
+                chars[(round(ch['x0']), round(ch['top']))] = ch
+        numbers, current, last_x1 = [], "", None
+        for ch in sorted(chars.values(), key=lambda c: c['x0']):
+            if last_x1 is not None and ch['x0'] - last_x1 > ch['size'] * 0.3:
+                numbers.append(int(current))
+                current = ""
+            current += ch['text']
+            last_x1 = ch['x1']
+        if current:
+            numbers.append(int(current))
+        if numbers and numbers == list(range(1, len(numbers) + 1)) and len(numbers) <= 20:
+            return len(numbers), None
+        return None, None
     
     def extract_health(self, text: str) -> Optional[int]:
         """
@@ -909,8 +1021,234 @@ class MalifauxCardParser:
                     pass
         return None
     
-    def parse_pdf(self, pdf_path: str) -> Optional[Card]:
-        """Parse a single PDF and return a Card object."""
+    def card_location(self, pdf_path: str) -> tuple:
+        """
+        (faction, subfaction) from the folder structure.
+        Expected: .../images/{Faction}/{Subfaction}/filename.pdf
+        """
+        path_parts = Path(pdf_path).parts
+        faction = ""
+        subfaction = ""
+        
+        # Find "images" folder and extract faction/subfaction from path after it
+        try:
+            images_idx = [p.lower() for p in path_parts].index('images')
+            if images_idx + 1 < len(path_parts):
+                faction = path_parts[images_idx + 1]
+            if images_idx + 2 < len(path_parts) - 1:  # -1 because last part is filename
+                subfaction = path_parts[images_idx + 2]
+        except ValueError:
+            # "images" not in path, try to use last two directories
+            if len(path_parts) >= 3:
+                faction = path_parts[-3]  # grandparent folder
+                subfaction = path_parts[-2]  # parent folder
+        return faction, subfaction
+    
+    def find_front_image(self, pdf_path: str) -> Optional[Path]:
+        """
+        Front PNG used for health extraction, or None.
+        Tries images_dir first (separate images repo), then the PDF's own folder.
+        """
+        faction, subfaction = self.card_location(pdf_path)
+        image_base = Path(pdf_path).stem
+        if self.images_dir:
+            # Use the images directory with faction/subfaction structure
+            rel = f"{faction}/{subfaction}/{image_base}_front.png" if subfaction else f"{faction}/{image_base}_front.png"
+            front_image_path = self.images_dir / rel
+            if front_image_path.exists():
+                return front_image_path
+            self.log(f"  Image not found at {front_image_path}")
+        
+        # Fallback: check same directory as PDF
+        front_image_path = Path(pdf_path).parent / f"{image_base}_front.png"
+        return front_image_path if front_image_path.exists() else None
+    
+    def front_image_digest(self, pdf_path: str) -> str:
+        """Content hash of the front image used for health, or '' if there is none."""
+        image = self.find_front_image(pdf_path)
+        return file_digest(image) if image else ''
+    
+    STAT_LABELS = {'DF': 'defense', 'SP': 'speed', 'WP': 'willpower', 'SZ': 'size'}
+    
+    def layout_lines(self, page) -> tuple:
+        """
+        Layout mode: (words, lines of words, line texts) of a page, read from
+        its characters with the doubled text layer removed.
+        """
+        # Same glyph at the same spot (to 0.1pt) is one character; cheaper
+        # than page.dedupe_chars(), which clusters by tolerance
+        unique = {}
+        for ch in page.chars:
+            unique.setdefault((ch['text'], round(ch['x0'], 1), round(ch['top'], 1)), ch)
+        words = extract_words(list(unique.values()))
+        
+        # Group words into lines by their top edge
+        lines = []
+        for word in sorted(words, key=lambda w: (round(w['top']), w['x0'])):
+            if lines and abs(lines[-1][0]['top'] - word['top']) <= 3:
+                lines[-1].append(word)
+            else:
+                lines.append([word])
+        line_texts = [' '.join(w['text'] for w in sorted(line, key=lambda w: w['x0'])) for line in lines]
+        return words, lines, line_texts
+    
+    def read_regions(self, page) -> dict:
+        """
+        Layout mode: split page 1 into regions using word bounding boxes
+        (see layout_lines). Regions are anchored on the DF/SP/WP/SZ labels
+        rather than fixed coordinates:
+        
+            cost      topmost number (or dash) above the stat block
+            stats     the number on the line above each label, nearest its center
+            banner    lines between the stat block and the first ability
+            abilities everything below the banner
+        
+        Without a stat block the banner and abilities are split from the
+        whole page.
+        """
+        words, lines, line_texts = self.layout_lines(page)
+        regions = {'cost': None, 'stats': {}, 'banner': '', 'abilities': '', 'text': '\n'.join(line_texts)}
+        labels = [w for w in words if w['text'].upper() in self.STAT_LABELS]
+        
+        for label in labels:
+            # The number on the nearest line above the label, closest to its center
+            center = (label['x0'] + label['x1']) / 2
+            values = [w for w in words
+                      if re.fullmatch(r'\d{1,2}', w['text']) and w['bottom'] <= label['top'] + 1]
+            if values:
+                line_bottom = max(w['bottom'] for w in values)
+                values = [w for w in values if w['bottom'] >= line_bottom - 3]
+                value = min(values, key=lambda w: abs((w['x0'] + w['x1']) / 2 - center))
+                regions['stats'][self.STAT_LABELS[label['text'].upper()]] = int(value['text'])
+        
+        if labels:
+            stats_top = min(w['top'] for w in labels)
+            stats_bottom = max(w['bottom'] for w in labels)
+            badge = [w for w in words if w['bottom'] <= stats_top and re.fullmatch(r'\d{1,2}|-+', w['text'])]
+            if badge:
+                regions['cost'] = min(badge, key=lambda w: (round(w['top']), w['x0']))['text']
+        else:
+            stats_bottom = float('-inf')
+        
+        below = [text for line, text in zip(lines, line_texts)
+                 if line[0]['top'] >= stats_bottom and not text.startswith('STN:')]
+        split = next((i for i, text in enumerate(below)
+                      if re.match(r"^[A-Z][A-Za-z' ]*:", text)), len(below))
+        regions['banner'] = ' '.join(below[:split])
+        regions['abilities'] = '\n'.join(below[split:])
+        return regions
+    
+    def read_layout_fields(self, regions: dict) -> dict:
+        """
+        Layout mode fields for PdfContent, each parsed from its own region
+        of read_regions(). The text is already de-duplicated, so none of
+        the doubled-text extractors are used; a field the regions do not
+        yield stays empty.
+        """
+        stats = {'cost': None, 'defense': None, 'speed': None, 'willpower': None, 'size': None}
+        cost = regions['cost']
+        if cost and re.fullmatch(r'\d{1,2}', cost):
+            stats['cost'] = int(cost)
+        stats.update(regions['stats'])
+        if len(regions['stats']) < len(self.STAT_LABELS):
+            self.log("  Layout: stat block incomplete")
+        
+        banner = regions['banner']
+        banner_lower = banner.lower()
+        hits = {kw for start, end, kw in self.keyword_matchers()[0].iter_matches(banner_lower)
+                if is_word_match(banner_lower, start, end)}
+        keywords = list(dict.fromkeys(kw for kw in self.HIRING_KEYWORDS if kw in hits))
+        characteristics, minion_limit = self.extract_characteristics_improved(banner) if banner else ([], None)
+        keywords = [kw for kw in keywords if kw not in characteristics]
+        if not keywords and not characteristics:
+            self.log("  Layout: no keywords or characteristics in the banner")
+        
+        station = re.search(r'STN:\s*(\d+)', regions['text'])
+        return {
+            'stats': stats,
+            'keywords': keywords,
+            'characteristics': characteristics,
+            'minion_limit': minion_limit,
+            'abilities': self.extract_abilities(regions['abilities'], doubled=False),
+            'station': int(station.group(1)) if station else None,
+        }
+    
+    def read_pdf(self, pdf_path: str) -> "PdfContent":
+        """
+        Read the PDF and run the text extractors.
+        Depends only on the file's bytes, so byte-identical copies share it.
+        """
+        with pdfplumber.open(pdf_path) as pdf:
+            if len(pdf.pages) < 2:
+                self.log(f"  Warning: PDF has only {len(pdf.pages)} page(s)")
+            
+            layout = None
+            if self.layout:
+                # Both pages from de-duplicated characters, page 1 split into regions
+                regions = self.read_regions(pdf.pages[0]) if len(pdf.pages) > 0 else None
+                layout = self.read_layout_fields(regions) if regions else None
+                page1_text = regions['text'] if regions else ""
+                page2_text = '\n'.join(self.layout_lines(pdf.pages[1])[2]) if len(pdf.pages) > 1 else ""
+            else:
+                # Page 1: Front of card (stats, abilities)
+                page1_text = pdf.pages[0].extract_text() if len(pdf.pages) > 0 else ""
+                
+                # Page 2: Back of card (actions)
+                page2_text = pdf.pages[1].extract_text() if len(pdf.pages) > 1 else ""
+            
+            # Health track from page 1's vector objects (no image needed)
+            vector_health, vector_soulstone = (
+                self.extract_health_from_geometry(pdf.pages[0]) if pdf.pages else (None, None))
+        
+        # Get card name from PDF (more reliable than filename)
+        # Try page 2 first (back has cleaner text without doubling)
+        pdf_name = self.extract_card_name_from_pdf(page2_text, is_back=True)
+        if not pdf_name:
+            # Fall back to page 1
+            pdf_name = self.extract_card_name_from_pdf(page1_text, is_back=False)
+        
+        attack_actions, tactical_actions = self.extract_actions(page2_text)
+        if layout:
+            return PdfContent(
+                page1_text=page1_text,
+                page2_text=page2_text,
+                pdf_name=pdf_name,
+                stats=layout['stats'],
+                keywords=self.normalize_keywords(layout['keywords']),
+                characteristics=layout['characteristics'],
+                minion_limit=layout['minion_limit'],
+                abilities=layout['abilities'],
+                attack_actions=attack_actions,
+                tactical_actions=tactical_actions,
+                base_size=self.extract_base_size(page2_text),
+                station=layout['station'],
+                vector_health=vector_health,
+                vector_soulstone=vector_soulstone,
+            )
+        
+        keywords, characteristics, minion_limit = self.extract_keywords(page1_text)
+        return PdfContent(
+            page1_text=page1_text,
+            page2_text=page2_text,
+            pdf_name=pdf_name,
+            stats=self.extract_stats_from_page1(page1_text),
+            keywords=self.normalize_keywords(keywords),  # Normalize to canonical forms
+            characteristics=characteristics,
+            minion_limit=minion_limit,
+            abilities=self.extract_abilities(page1_text),
+            attack_actions=attack_actions,
+            tactical_actions=tactical_actions,
+            base_size=self.extract_base_size(page2_text),
+            station=self.extract_station(page1_text),
+            vector_health=vector_health,
+            vector_soulstone=vector_soulstone,
+        )
+    
+    def parse_pdf(self, pdf_path: str, content: Optional["PdfContent"] = None) -> Optional[Card]:
+        """
+        Parse a single PDF and return a Card object.
+        Pass `content` (read_pdf() of a byte-identical PDF) to skip reading this one.
+        """
         self.log(f"Parsing: {pdf_path}")
         
         try:
@@ -918,23 +1256,7 @@ class MalifauxCardParser:
             file_info = self.parse_filename(pdf_path)
             
             # Extract faction and subfaction from folder structure
-            # Expected: .../images/{Faction}/{Subfaction}/filename.pdf
-            path_parts = Path(pdf_path).parts
-            faction = ""
-            subfaction = ""
-            
-            # Find "images" folder and extract faction/subfaction from path after it
-            try:
-                images_idx = [p.lower() for p in path_parts].index('images')
-                if images_idx + 1 < len(path_parts):
-                    faction = path_parts[images_idx + 1]
-                if images_idx + 2 < len(path_parts) - 1:  # -1 because last part is filename
-                    subfaction = path_parts[images_idx + 2]
-            except ValueError:
-                # "images" not in path, try to use last two directories
-                if len(path_parts) >= 3:
-                    faction = path_parts[-3]  # grandparent folder
-                    subfaction = path_parts[-2]  # parent folder
+            faction, subfaction = self.card_location(pdf_path)
             
             # Extract card type from filename (M4E_Stat_..., M4E_Crew_..., M4E_Upgrade_...)
             filename = Path(pdf_path).stem
@@ -946,38 +1268,24 @@ class MalifauxCardParser:
             elif "_Upgrade_" in filename:
                 card_type = "Upgrade"
             
-            # Read PDF
-            with pdfplumber.open(pdf_path) as pdf:
-                if len(pdf.pages) < 2:
-                    self.log(f"  Warning: PDF has only {len(pdf.pages)} page(s)")
-                
-                # Page 1: Front of card (stats, abilities)
-                page1_text = pdf.pages[0].extract_text() if len(pdf.pages) > 0 else ""
-                
-                # Page 2: Back of card (actions)
-                page2_text = pdf.pages[1].extract_text() if len(pdf.pages) > 1 else ""
-            
-            # Get card name from PDF (more reliable than filename)
-            # Try page 2 first (back has cleaner text without doubling)
-            pdf_name = self.extract_card_name_from_pdf(page2_text, is_back=True)
-            if not pdf_name:
-                # Fall back to page 1
-                pdf_name = self.extract_card_name_from_pdf(page1_text, is_back=False)
+            # Read PDF and extract all data
+            if content is None:
+                content = self.read_pdf(pdf_path)
+            page1_text, page2_text = content.page1_text, content.page2_text
             
             # Use PDF name if found, otherwise fall back to filename parsing
-            if pdf_name:
-                card_name = pdf_name
+            if content.pdf_name:
+                card_name = content.pdf_name
             else:
                 card_name = file_info['name']
             
-            # Extract all data
-            stats = self.extract_stats_from_page1(page1_text)
-            keywords, characteristics, minion_limit = self.extract_keywords(page1_text)
-            keywords = self.normalize_keywords(keywords)  # Normalize to canonical forms
-            abilities = self.extract_abilities(page1_text)
-            attack_actions, tactical_actions = self.extract_actions(page2_text)
-            base_size = self.extract_base_size(page2_text)
-            station = self.extract_station(page1_text)
+            stats = content.stats
+            keywords, characteristics = content.keywords, content.characteristics
+            minion_limit = content.minion_limit
+            abilities = content.abilities
+            attack_actions, tactical_actions = content.attack_actions, content.tactical_actions
+            base_size = content.base_size
+            station = content.station
             
             # Build relative paths for images
             # Handle variant suffix in image filename
@@ -992,30 +1300,27 @@ class MalifauxCardParser:
             # Build front image path for health extraction
             front_image_rel = f"{faction}/{subfaction}/{image_base}_front.png" if subfaction else f"{faction}/{image_base}_front.png"
             
-            # Extract health from image (primary method)
-            # Try images_dir first (separate images repo), fallback to same dir as PDF
-            front_image_path = None
-            if self.images_dir:
-                # Use the images directory with faction/subfaction structure
-                front_image_path = self.images_dir / front_image_rel
-                if not front_image_path.exists():
-                    self.log(f"  Image not found at {front_image_path}")
-                    front_image_path = None
+            # Health from the PDF's vector health track (primary method)
+            health = content.vector_health
+            if health:
+                self.log(f"  Health from PDF geometry: {health}")
             
-            # Fallback: check same directory as PDF
-            if front_image_path is None:
-                pdf_dir = Path(pdf_path).parent
-                front_image_path = pdf_dir / f"{image_base}_front.png"
-                if not front_image_path.exists():
-                    front_image_path = None
-            
-            health = None
-            if front_image_path and front_image_path.exists():
-                health = self.extract_health_from_image(str(front_image_path))
-                if health:
-                    self.log(f"  Health from image: {health}")
-            else:
-                self.log(f"  No front image found for health extraction")
+            # Decode the front image only as a fallback, or to check the
+            # geometry against it (--verify-health)
+            if health is None or self.verify_health:
+                image_health = None
+                front_image_path = self.find_front_image(pdf_path)
+                if front_image_path:
+                    image_health = self.extract_health_from_image(str(front_image_path))
+                else:
+                    self.log(f"  No front image found for health extraction")
+                if health is None:
+                    health = image_health
+                    if health:
+                        self.log(f"  Health from image: {health}")
+                elif image_health and image_health != health:
+                    print(f"Warning: {Path(pdf_path).name}: health from PDF geometry "
+                          f"({health}) disagrees with image ({image_health})")
             
             # Derive soulstone cache - ONLY Masters and Henchmen can use soulstones
             # This is the correct M4E rule: Masters and Henchmen have soulstone cache
@@ -1024,6 +1329,9 @@ class MalifauxCardParser:
                 
             if soulstone_cache:
                 self.log(f"  Soulstone user (Master/Henchman)")
+            if content.vector_soulstone is not None and content.vector_soulstone != soulstone_cache:
+                self.log(f"  Warning: soulstone icon on card ({content.vector_soulstone}) "
+                         f"disagrees with characteristics")
             
             # Fallback to PDF text extraction (rarely works)
             if health is None:
@@ -1092,39 +1400,206 @@ class MalifauxCardParser:
             traceback.print_exc()
             return None
     
-    def parse_directory(self, input_dir: str, output_file: str):
-        """Parse all PDFs in a directory and output JSON."""
-        input_path = Path(input_dir)
-        cards = []
-        
-        # Find all PDFs
-        pdf_files = list(input_path.rglob("*.pdf"))
-        print(f"Found {len(pdf_files)} PDF files")
+    def parse_files(self, groups: List[List[str]], workers: int = 1,
+                    on_result: Callable[[str, "ParseResult"], None] = None) -> Dict[str, "ParseResult"]:
+        """
+        Parse groups of byte-identical PDFs, sequentially or across a process pool.
+        
+        Each group is read once (see parse_group). Returns {pdf path:
+        ParseResult}; the card is None if parsing failed. With on_result,
+        each result is handed to on_result(path, result) as soon as it
+        arrives and not kept, so nothing accumulates. With workers > 1
+        every worker builds its own parser once (same overrides and images
+        dir) and parses one group per task. A group that kills its worker
+        process is retried alone and reported as failed if it crashes
+        again; the rest of the run carries on.
+        """
+        progress = Progress(sum(len(g) for g in groups))
+        results: Dict[str, ParseResult] = {}
         
-        for pdf_file in pdf_files:
-            card = self.parse_pdf(str(pdf_file))
-            if card:
-                cards.append(asdict(card))
+        def collect(group_results: Dict[str, ParseResult]):
+            for path, result in group_results.items():
+                if on_result:
+                    on_result(path, result)
+                else:
+                    results[path] = result
+                progress.update(result.card is not None)
+        
+        if workers <= 1 or len(groups) <= 1:
+            for group in groups:
+                collect(self.parse_group(group))
+            progress.done()
+            return results
+        
+        init_args = (self.verbose, self.overrides_file, self.images_dir and str(self.images_dir),
+                     self.layout, self.verify_health, self.image_cache_dir and str(self.image_cache_dir))
+        pending = list(reversed(groups))  # pop() from the end keeps input order
+        suspects: List[List[str]] = []
+        
+        while pending:
+            in_flight = {}
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=init_args) as pool:
+                    while pending or in_flight:
+                        # Bounded window: a pool crash only puts these in doubt
+                        while pending and len(in_flight) < workers * 2:
+                            group = pending.pop()
+                            in_flight[pool.submit(_parse_in_worker, group)] = group
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            group_results = future.result()
+                            in_flight.pop(future)
+                            collect(group_results)
+            except BrokenProcessPool:
+                suspects += in_flight.values()
+        
+        # A worker died mid-task: retry each in-flight group in its own process
+        for group in sorted(suspects):
+            try:
+                with ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                         initargs=init_args) as pool:
+                    group_results = pool.submit(_parse_in_worker, group).result()
+            except BrokenProcessPool:
+                print(f"Error parsing {group[0]}: worker process crashed")
+                group_results = {path: ParseResult(None) for path in group}
+            collect(group_results)
+        
+        progress.done()
+        return results
+    
+    def parse_group(self, paths: List[str]) -> Dict[str, "ParseResult"]:
+        """
+        Parse byte-identical PDFs: the first is read once, then every path
+        gets its own card (id, faction, keywords, images and health all come
+        from the path). Each result's `seconds` is what parsing that path
+        alone would cost; `reused_seconds` is the read time it skipped.
+        """
+        results: Dict[str, ParseResult] = {}
+        start = time.perf_counter()
+        try:
+            content = self.read_pdf(paths[0])
+        except Exception as e:
+            print(f"Error parsing {paths[0]}: {e}")
+            import traceback
+            traceback.print_exc()
+            return {path: ParseResult(None) for path in paths}
+        read_seconds = time.perf_counter() - start
+        
+        for i, path in enumerate(paths):
+            before = self.overrides_applied
+            start = time.perf_counter()
+            card = self.parse_pdf(path, content)
+            applied = self.overrides_applied - before
+            self.overrides_applied = before  # the caller totals overrides from results
+            results[path] = ParseResult(
+                asdict(card) if card else None,
+                overrides_applied=applied,
+                seconds=read_seconds + time.perf_counter() - start,
+                reused_seconds=read_seconds if i else 0.0,
+            )
+        return results
+    
+    def parse_directory(self, input_dir: str, output_file: str, workers: int = 1,
+                        cache_dir: str = None, stream_file: str = None):
+        """
+        Parse all PDFs in a directory and output JSON.
         
-        # Sort by faction, then subfaction, then name
-        cards.sort(key=lambda c: (c['faction'], c['subfaction'], c['name']))
+        With stream_file, each card is appended to that JSONL file as soon as
+        it is parsed instead of being held in memory. A rerun (e.g. after a
+        crash) skips PDFs already in the stream with unchanged content, and
+        the stream is then compacted into the usual sorted output_file.
+        """
+        input_path = Path(input_dir)
         
-        # Output JSON
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Find all PDFs (sorted, so output does not depend on filesystem order)
+        pdf_files = sorted(str(p) for p in input_path.rglob("*.pdf"))
+        print(f"Found {len(pdf_files)} PDF files" + (f" ({workers} workers)" if workers > 1 else ""))
+        
+        # Content hashes: byte-identical copies (the same card filed under
+        # several keywords) are read once and fanned out per path
+        digests = {p: file_digest(p) for p in pdf_files}
+        
+        cache = ParseCache(cache_dir, self) if cache_dir else None
+        if cache:
+            self.image_cache_dir = cache.dir / "images"
+        stream = None
+        images: Dict[str, str] = {}
+        if stream_file:
+            # Health comes from the front image: a streamed card is only
+            # reused while its image (and the images dir) is unchanged
+            stream = CardStream(stream_file, parser_identity(self),
+                                str(self.images_dir) if self.images_dir else '')
+            images = {p: self.front_image_digest(p) for p in pdf_files}
+        cards: Dict[str, dict] = {}
+        overrides: Dict[str, int] = {}
+        saved = 0.0
+        
+        def record(pdf_file: str, result: ParseResult, parsed: bool = True):
+            nonlocal saved
+            if result.card is None:
+                return
+            if parsed:
+                saved += result.reused_seconds
+                if cache:
+                    cache.put(pdf_file, result)
+            if stream:
+                stream.append(pdf_file, digests[pdf_file], images[pdf_file], result)
+            else:
+                cards[pdf_file] = result.card
+            overrides[pdf_file] = result.overrides_applied
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'version': '1.0',
-                'generated': str(Path(output_file).stat().st_mtime if output_path.exists() else ''),
-                'total_cards': len(cards),
-                'cards': cards
-            }, f, indent=2, ensure_ascii=False)
+        # Resumed (already streamed) and unchanged (cached) PDFs are not parsed
+        todo = []
+        resumed = 0
+        for pdf_file in pdf_files:
+            if stream and stream.has(pdf_file, digests[pdf_file], images[pdf_file]):
+                overrides[pdf_file] = stream.entries[pdf_file].overrides_applied
+                resumed += 1
+                if cache:
+                    cache.keep(pdf_file, digests[pdf_file], images[pdf_file])
+                continue
+            hit = cache.get(pdf_file, digests[pdf_file], images.get(pdf_file)) if cache else None
+            if hit:
+                record(pdf_file, hit, parsed=False)
+            else:
+                todo.append(pdf_file)
+        if resumed:
+            print(f"Resuming {stream.path}: {resumed} PDFs already parsed")
+        
+        groups: Dict[str, List[str]] = {}
+        for pdf_file in todo:
+            groups.setdefault(digests[pdf_file], []).append(pdf_file)
+        if groups:
+            self.parse_files(list(groups.values()), workers, on_result=record)
+        
+        duplicates = sum(len(g) - 1 for g in groups.values())
+        if duplicates:
+            print(f"Deduplicated: {len(todo)} PDFs had "
+                  f"{len(groups)} distinct contents, {duplicates} reads skipped (~{saved:.1f}s)")
+        
+        if cache:
+            cache.prune()
+            print(f"Parse cache: {cache.summary()}")
+        
+        # Sort by faction, then subfaction, then name (then path, as before)
+        if stream:
+            stream.close()
+            written = stream.compact(output_file, digests, images)
+        else:
+            order = {p: i for i, p in enumerate(pdf_files)}
+            ordered = sorted(cards, key=lambda p: (card_sort_key(cards[p]), order[p]))
+            written = write_cards_document(output_file, ((p, cards[p]) for p in ordered), len(ordered))
         
-        print(f"Wrote {len(cards)} cards to {output_file}")
+        self.overrides_applied += sum(overrides[p] for p in written)
+        failed = len(pdf_files) - len(written)
+        if failed:
+            print(f"Failed to parse {failed} PDF(s)")
+        print(f"Wrote {len(written)} cards to {output_file}")
         
         # Health extraction summary
-        stat_cards = [c for c in cards if c.get('card_type') == 'Stat']
+        summaries = list(written.values())
+        stat_cards = [c for c in summaries if c.get('card_type') == 'Stat']
         health_count = sum(1 for c in stat_cards if c.get('health') is not None)
         print(f"\nHealth extraction: {health_count}/{len(stat_cards)} model cards")
         if self.overrides_applied > 0:
@@ -1132,7 +1607,7 @@ class MalifauxCardParser:
         
         # Generate summary
         factions = {}
-        for card in cards:
+        for card in summaries:
             faction = card['faction']
             if faction not in factions:
                 factions[faction] = {'count': 0, 'subfactions': set()}
@@ -1146,6 +1621,380 @@ class MalifauxCardParser:
             print(f"  {faction}: {info['count']} cards, subfactions: {subfactions}")
 
 
+def file_digest(path) -> str:
+    """BLAKE2b-128 of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+SUMMARY_FIELDS = ('faction', 'subfaction', 'card_type', 'health')
+
+
+def card_sort_key(card: dict) -> tuple:
+    """Output order: faction, then subfaction, then name."""
+    return (card['faction'], card['subfaction'], card['name'])
+
+
+def write_cards_document(output_file: str, cards: Iterable[tuple], total: int) -> Dict[str, dict]:
+    """
+    Write the {version, total_cards, cards} document from
+    `total` (pdf path, card) pairs, one card at a time, in the given order.
+    The bytes are the same as json.dump(..., indent=2) of the whole
+    document, but cards can come from a generator. Returns {pdf path:
+    card summary}. There is no timestamp in the header, so unchanged cards
+    give byte-identical output and later build stages stay up to date.
+    """
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, dict] = {}
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        header = {
+            'version': '1.0',
+            'total_cards': total,
+        }
+        f.write('{\n')
+        for name, value in header.items():
+            f.write(f'  {json.dumps(name)}: {json.dumps(value, ensure_ascii=False)},\n')
+        f.write('  "cards": [')
+        for i, (pdf_path, card) in enumerate(cards):
+            body = json.dumps(card, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+            f.write(('\n    ' if i == 0 else ',\n    ') + body)
+            written[pdf_path] = {k: card.get(k) for k in SUMMARY_FIELDS}
+        f.write('\n  ]\n}' if written else ']\n}')
+    return written
+
+
+@functools.lru_cache(maxsize=None)
+def parser_version() -> str:
+    """Hash of this script's and the keyword matcher's source."""
+    version = hashlib.blake2b(digest_size=16)
+    for source in (__file__, sys.modules[KeywordMatcher.__module__].__file__):
+        with open(source, 'rb') as f:
+            version.update(f.read())
+    return version.hexdigest()
+
+
+def parser_identity(parser: MalifauxCardParser) -> Dict[str, object]:
+    """
+    What a card depends on besides its PDF and front image: the parser
+    version, the health overrides and the layout flag.
+    """
+    overrides = json.dumps(parser.health_overrides, sort_keys=True)
+    return {
+        'version': parser_version(),
+        'overrides': hashlib.blake2b(overrides.encode('utf-8'), digest_size=16).hexdigest(),
+        'layout': parser.layout,
+    }
+
+
+@dataclass
+class StreamEntry:
+    """Where one PDF's latest line sits in a CardStream."""
+    offset: int
+    digest: str
+    image: Optional[str]
+    images_dir: Optional[str]
+    overrides_applied: int
+    sort_key: tuple
+
+
+class CardStream:
+    """
+    Append-only JSONL of parsed cards: a {"identity": ...} header line
+    (see parser_identity), then one line per PDF:
+    {"pdf": ..., "digest": ..., "image": ..., "images_dir": ...,
+     "overrides_applied": ..., "card": {...}}
+    
+    "digest" and "image" are the content hashes of the PDF and of its
+    front image ('' if none), the same ones ParseCache keys on; a line is
+    only reused while both, and the images dir, are unchanged.
+    
+    Lines are flushed as they are written, so a crashed run keeps every
+    card it finished. On open the file is indexed (offsets only, not
+    cards); a torn last line from a crash is cut off. A PDF appended again
+    (content changed) is superseded by its later line. A stream written
+    with a different identity is discarded: its cards are stale.
+    """
+    
+    def __init__(self, path: str, identity: Dict[str, object], images_dir: str = ''):
+        self.path = Path(path)
+        self.identity = identity
+        self.images_dir = images_dir
+        self.entries: Dict[str, StreamEntry] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._index()
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(json.dumps({'identity': identity}).encode('utf-8') + b'\n')
+            self._file.flush()
+    
+    def _index(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            header = f.readline()
+            try:
+                current = json.loads(header).get('identity') == self.identity
+            except (ValueError, AttributeError):
+                current = False
+            if not current:
+                if header:
+                    print(f"Discarding {self.path}: written by a different parser version, "
+                          f"overrides or --layout")
+                f.truncate(0)
+                return
+            offset = len(header)
+            for line in iter(f.readline, b''):
+                try:
+                    entry = json.loads(line)
+                    self._add(entry, offset)
+                except (ValueError, KeyError):
+                    if line.endswith(b'\n'):
+                        print(f"Warning: skipping bad line at byte {offset} of {self.path}")
+                    else:
+                        f.truncate(offset)  # torn write from an interrupted run
+                        break
+                offset += len(line)
+    
+    def _add(self, entry: dict, offset: int):
+        self.entries[entry['pdf']] = StreamEntry(
+            offset, entry['digest'], entry.get('image'), entry.get('images_dir'),
+            entry.get('overrides_applied', 0), card_sort_key(entry['card']))
+    
+    def has(self, pdf_path: str, digest: str, image: str) -> bool:
+        entry = self.entries.get(pdf_path)
+        return (entry is not None and entry.digest == digest and entry.image == image
+                and entry.images_dir == self.images_dir)
+    
+    def append(self, pdf_path: str, digest: str, image: str, result: "ParseResult"):
+        entry = {
+            'pdf': pdf_path,
+            'digest': digest,
+            'image': image,
+            'images_dir': self.images_dir,
+            'overrides_applied': result.overrides_applied,
+            'card': result.card,
+        }
+        offset = self._file.tell()
+        self._file.write(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        self._add(entry, offset)
+    
+    def close(self):
+        self._file.close()
+    
+    def compact(self, output_file: str, digests: Dict[str, str],
+                images: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Write the sorted cards document for the PDFs in digests (path ->
+        current content digest; images: path -> front image digest),
+        reading one card at a time. Stream lines for removed or
+        since-changed PDFs are left out.
+        """
+        order = {p: i for i, p in enumerate(sorted(digests))}
+        paths = sorted((p for p in digests if self.has(p, digests[p], images[p])),
+                       key=lambda p: (self.entries[p].sort_key, order[p]))
+        with open(self.path, 'rb') as f:
+            def cards():
+                for p in paths:
+                    f.seek(self.entries[p].offset)
+                    yield p, json.loads(f.readline())['card']
+            return write_cards_document(output_file, cards(), len(paths))
+
+
+@dataclass
+class ParseResult:
+    """Outcome of parsing one PDF."""
+    card: Optional[dict]
+    overrides_applied: int = 0
+    seconds: float = 0.0
+    reused_seconds: float = 0.0
+
+
+class ParseCache:
+    """
+    Persistent per-PDF parse results, one JSON blob per entry:
+    <cache_dir>/<key[:2]>/<key>.json
+    
+    The key hashes the PDF bytes, the parser version (this script's and the
+    keyword matcher's source),
+    the health overrides, and the path context the card depends on (the PDF
+    path, which gives id/faction/keyword, and the front image used for
+    health). Entries not used by a directory run are pruned afterwards.
+    """
+    
+    def __init__(self, cache_dir: str, parser: MalifauxCardParser):
+        self.dir = Path(cache_dir)
+        self.parser = parser
+        identity = parser_identity(parser)
+        self.version = identity['version']
+        self.overrides_digest = identity['overrides']
+        self.keys: Dict[str, str] = {}
+        self.used = set()
+        self.used_images = set()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+    
+    def key(self, pdf_path: str, pdf_digest: str = None, image_digest: str = None) -> str:
+        if pdf_path in self.keys:
+            return self.keys[pdf_path]
+        if image_digest is None:
+            image_digest = self.parser.front_image_digest(pdf_path)
+        if image_digest:
+            self.used_images.add(self.parser.image_cache_key(image_digest))
+        parts = [
+            self.version,
+            self.overrides_digest,
+            f"layout={self.parser.layout}",
+            str(pdf_path),
+            pdf_digest or file_digest(pdf_path),
+            image_digest,
+        ]
+        key = hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+        self.keys[pdf_path] = key
+        return key
+    
+    def entry_path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+    
+    def get(self, pdf_path: str, pdf_digest: str = None,
+            image_digest: str = None) -> Optional[ParseResult]:
+        key = self.key(pdf_path, pdf_digest, image_digest)
+        self.used.add(key)
+        try:
+            with open(self.entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.get('seconds', 0.0)
+        return ParseResult(entry['card'], entry.get('overrides_applied', 0), 0.0)
+    
+    def keep(self, pdf_path: str, pdf_digest: str = None, image_digest: str = None):
+        """Mark an entry as used without reading it, so prune() leaves it (resumed PDFs)."""
+        self.used.add(self.key(pdf_path, pdf_digest, image_digest))
+    
+    def put(self, pdf_path: str, result: ParseResult):
+        key = self.key(pdf_path)
+        self.used.add(key)
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'pdf': str(pdf_path),
+                'seconds': round(result.seconds, 4),
+                'overrides_applied': result.overrides_applied,
+                'card': result.card,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    
+    def prune(self):
+        """
+        Delete entries this run did not use (old versions, removed PDFs),
+        and image results for front images no PDF in this run points at.
+        """
+        if not self.dir.exists():
+            return
+        for path in self.dir.glob('??/*.json'):
+            if path.stem not in self.used:
+                path.unlink()
+        for path in self.dir.glob('images/??/*.json'):
+            if path.stem not in self.used_images:
+                path.unlink()
+    
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        return (f"{self.hits}/{total} PDFs reused, {self.misses} parsed, "
+                f"~{self.saved_seconds:.1f}s of parsing saved")
+
+
+class Progress:
+    """Single-line progress/throughput display for parse runs."""
+    
+    def __init__(self, total: int):
+        self.total = total
+        self.count = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self.live = sys.stdout.isatty()
+    
+    def update(self, ok: bool = True):
+        self.count += 1
+        if not ok:
+            self.failed += 1
+        if self.live:
+            print(f"\r  {self.line()}", end='', flush=True)
+    
+    def line(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"[{self.count}/{self.total}] {rate:.1f} PDFs/s{failed}"
+    
+    def done(self):
+        elapsed = time.perf_counter() - self.start
+        if self.live:
+            print()
+        print(f"Parsed {self.count} PDFs in {elapsed:.1f}s ({self.line()})")
+
+
+# Per-process parser for parse_files(workers > 1)
+_worker_parser: Optional[MalifauxCardParser] = None
+
+
+def _init_worker(verbose: bool, overrides_file: Optional[str], images_dir: Optional[str],
+                 layout: bool, verify_health: bool, image_cache_dir: Optional[str]):
+    global _worker_parser
+    # The parent already reported loading overrides/images; don't repeat it per worker
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _worker_parser = MalifauxCardParser(verbose, overrides_file, images_dir, layout, verify_health)
+    if image_cache_dir:
+        _worker_parser.image_cache_dir = Path(image_cache_dir)
+
+
+def _parse_in_worker(paths: List[str]) -> Dict[str, ParseResult]:
+    return _worker_parser.parse_group(paths)
+
+
+def bench_image_health(parser: MalifauxCardParser, image_dir: str):
+    """Per-card time of the image health fallback: previous vs shared reduced decode vs cached."""
+    paths = sorted(str(p) for p in Path(image_dir).rglob("*_front.png"))
+    if not paths or not HAS_CV2:
+        print("No *_front.png images found" if paths or HAS_CV2 else "OpenCV not available")
+        return
+    
+    def per_card(fn) -> float:
+        start = time.perf_counter()
+        for path in paths:
+            fn(path)
+        return (time.perf_counter() - start) / len(paths) * 1000
+    
+    full = {}
+    def previous(path):
+        # Full-resolution decode, once for health and again for soulstone
+        full[path] = parser._detect_health_track(path, 1)
+        parser._detect_health_track(path, 1)
+    
+    print(f"Image health detection over {len(paths)} card fronts:")
+    print(f"  full resolution, 2 decodes: {per_card(previous):7.2f} ms/card")
+    print(f"  1/{parser.IMAGE_SCALE} resolution, 1 decode:  "
+          f"{per_card(parser.detect_health_track):7.2f} ms/card")
+    print(f"  cached (hash lookup):       {per_card(parser.detect_health_track):7.2f} ms/card")
+    agree = sum(parser.detect_health_track(p) == full[p] for p in paths)
+    print(f"  agreement with full resolution: {agree}/{len(paths)}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Parse Malifaux 4E stat card PDFs')
     parser.add_argument('--input', '-i', help='Input directory containing PDFs')
@@ -1154,23 +2003,42 @@ def main():
     parser.add_argument('--overrides', help='JSON file with health value overrides')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--single', '-s', help='Parse a single PDF file (for testing)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='Per-PDF parse cache directory; unchanged PDFs are not re-parsed')
+    parser.add_argument('--bench-images', metavar='DIR',
+                        help='Benchmark image health detection on the *_front.png files in DIR')
+    parser.add_argument('--layout', action='store_true',
+                        help='Parse page 1 by layout regions from de-duplicated characters')
+    parser.add_argument('--workers', '-w', type=int, default=1, metavar='N',
+                        help='Parse PDFs in N worker processes (default: 1)')
+    parser.add_argument('--verify-health', action='store_true',
+                        help='Also count health from the front images and warn where it '
+                             'disagrees with the PDF health track')
+    parser.add_argument('--stream', metavar='JSONL',
+                        help='Append each card to JSONL as it is parsed; rerun to resume, '
+                             'then compacted into --output')
     
     args = parser.parse_args()
     
     parser_instance = MalifauxCardParser(
         verbose=args.verbose, 
         overrides_file=args.overrides,
-        images_dir=args.images_dir
+        images_dir=args.images_dir,
+        layout=args.layout,
+        verify_health=args.verify_health,
     )
     
-    if args.single:
+    if args.bench_images:
+        bench_image_health(parser_instance, args.bench_images)
+    elif args.single:
         card = parser_instance.parse_pdf(args.single)
         if card:
             print(json.dumps(asdict(card), indent=2))
     else:
         if not args.input:
             parser.error("--input is required when not using --single")
-        parser_instance.parse_directory(args.input, args.output)
+        parser_instance.parse_directory(args.input, args.output, workers=args.workers,
+                                        cache_dir=args.cache, stream_file=args.stream)
 
 
 if __name__ == '__main__':
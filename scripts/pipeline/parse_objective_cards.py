@@ -5,19 +5,29 @@ Extracts structured data from Scheme and Strategy card images.
 
 Handles both card types with automatic detection based on card footer.
 
+Images are preprocessed before OCR (grayscale, binarized, cropped to the
+card text and footer label). OCR text can be cached by image hash and
+tesseract settings, and a directory can be OCR'd across worker processes.
+
 Usage:
     python parse_objective_cards.py --input /path/to/card/images --output objectives.json
+    python parse_objective_cards.py --input /path/to/card/images --workers 4 --cache .ocr_cache
     python parse_objective_cards.py --single /path/to/card.png
 """
 
 import json
+import os
 import re
+import time
+import hashlib
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import List, Optional, Dict, Union
 import pytesseract
-from PIL import Image
+from PIL import Image, ImageOps
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -66,6 +76,200 @@ class ObjectiveCard:
     raw_text: str = ""
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# OCR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Bump when preprocess_image changes: it is part of the OCR cache key
+PREPROCESS_VERSION = 1
+
+PANEL_LIGHT = 200       # the text panel's paper is ~250, the card frame far darker
+PANEL_FILL = 0.9        # rows/columns at least this light belong to the panel
+INK_RATIO = 0.75        # panel ink is darker than 3/4 of the paper (gold headings ~130)
+LABEL_INK = 215         # footer label is white on the frame; its ornaments stay below ~190
+CROP_MARGIN = 12
+
+
+def crop_to_ink(binary: Image.Image) -> Optional[Image.Image]:
+    """Crop a black-on-white image to its ink plus a margin; None if blank."""
+    bbox = ImageOps.invert(binary).getbbox()
+    if not bbox:
+        return None
+    left, top, right, bottom = bbox
+    return binary.crop((max(0, left - CROP_MARGIN), max(0, top - CROP_MARGIN),
+                        min(binary.width, right + CROP_MARGIN),
+                        min(binary.height, bottom + CROP_MARGIN)))
+
+
+def median_level(img: Image.Image) -> int:
+    """Median gray level, from the histogram."""
+    hist = img.histogram()
+    half = sum(hist) / 2
+    count = 0
+    for level, n in enumerate(hist):
+        count += n
+        if count >= half:
+            return level
+    return 255
+
+
+def binarize_whole(gray: Image.Image) -> Image.Image:
+    """Binarize a whole grayscale image relative to its median and crop to the ink."""
+    threshold = median_level(gray) * INK_RATIO
+    return crop_to_ink(gray.point(lambda v: 0 if v < threshold else 255)) or gray
+
+
+def preprocess_image(img: Image.Image) -> Image.Image:
+    """
+    Black-on-white text for tesseract: the card's light text panel,
+    binarized relative to its paper and cropped to the ink, with the
+    footer label ("Scheme"/"Strategy", white on the dark frame) inverted
+    and stacked below it so it is still the last OCR line.
+    
+    Images without a card frame (no panel found, e.g. light bands but no
+    light column, or a panel too small to inset) are binarized whole.
+    """
+    gray = img.convert('L')
+    w, h = gray.size
+    light = gray.point(lambda v: 255 if v > PANEL_LIGHT else 0)
+    # BOX-resizing to one column/row averages each row/column
+    rows = light.resize((1, h), Image.Resampling.BOX).tobytes()
+    panel_rows = [y for y, v in enumerate(rows) if v >= 255 * PANEL_FILL]
+    if not panel_rows:
+        return binarize_whole(gray)
+    top, bottom = panel_rows[0], panel_rows[-1]
+    cols = light.crop((0, top, w, bottom + 1)).resize((w, 1), Image.Resampling.BOX).tobytes()
+    panel_cols = [x for x, v in enumerate(cols) if v >= 255 * PANEL_FILL]
+    if not panel_cols:
+        return binarize_whole(gray)
+    left, right = panel_cols[0], panel_cols[-1]
+    
+    # Inset past the panel's rounded corners
+    inset = round(w * 0.02)
+    box = (left + inset, top + inset, right - inset + 1, bottom - inset + 1)
+    if box[2] <= box[0] or box[3] <= box[1]:
+        return binarize_whole(gray)
+    panel = gray.crop(box)
+    threshold = median_level(panel) * INK_RATIO
+    text = crop_to_ink(panel.point(lambda v: 0 if v < threshold else 255))
+    # Middle half of the frame below the panel: the label, not the corners
+    footer = gray.crop((w // 4, bottom + 1, w - w // 4, h))
+    label = crop_to_ink(footer.point(lambda v: 0 if v > LABEL_INK else 255))
+    
+    parts = [part for part in (text, label) if part]
+    if not parts:
+        return gray
+    out = Image.new('L', (max(p.width for p in parts), sum(p.height for p in parts)), 255)
+    y = 0
+    for part in parts:
+        out.paste(part, (0, y))
+        y += part.height
+    return out
+
+
+def ocr_image(image_path: str, preprocess: bool = True, config: str = '') -> str:
+    """Tesseract text of an image, preprocessed unless preprocess=False."""
+    with Image.open(image_path) as img:
+        img = preprocess_image(img) if preprocess else img.copy()
+    return pytesseract.image_to_string(img, config=config)
+
+
+def file_digest(path) -> str:
+    """BLAKE2b-128 of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class OcrResult:
+    """OCR text of one image (None if OCR failed)."""
+    text: Optional[str]
+    seconds: float = 0.0
+    error: str = ""
+
+
+class OcrCache:
+    """
+    OCR text per image, one JSON blob per entry:
+    <cache_dir>/<key[:2]>/<key>.json
+    
+    The key hashes the image bytes, the tesseract version and config, and
+    the preprocessing (PREPROCESS_VERSION, or none). Card parsing is not
+    part of it, so editing the parser re-parses cached text without
+    running OCR again.
+    """
+    
+    def __init__(self, cache_dir: str, preprocess: bool = True, config: str = ''):
+        self.dir = Path(cache_dir)
+        try:
+            tesseract = str(pytesseract.get_tesseract_version())
+        except Exception:
+            tesseract = 'unknown'
+        self.settings = '\0'.join([
+            f"tesseract={tesseract}",
+            f"config={config}",
+            f"preprocess={PREPROCESS_VERSION if preprocess else 'none'}",
+        ])
+        self.keys: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+    
+    def key(self, image_path: str) -> str:
+        if image_path not in self.keys:
+            parts = [self.settings, file_digest(image_path)]
+            self.keys[image_path] = hashlib.blake2b('\0'.join(parts).encode('utf-8'),
+                                                    digest_size=16).hexdigest()
+        return self.keys[image_path]
+    
+    def entry_path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+    
+    def get(self, image_path: str) -> Optional[OcrResult]:
+        try:
+            with open(self.entry_path(self.key(image_path)), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.get('seconds', 0.0)
+        return OcrResult(entry['text'])
+    
+    def put(self, image_path: str, result: OcrResult):
+        path = self.entry_path(self.key(image_path))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'image': str(image_path),
+                'seconds': round(result.seconds, 4),
+                'text': result.text,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    
+    def summary(self) -> str:
+        return (f"{self.hits}/{self.hits + self.misses} images from OCR cache, "
+                f"~{self.saved_seconds:.1f}s of OCR saved")
+
+
+def _init_ocr_worker():
+    # Tesseract's OpenMP threads would oversubscribe the cores the pool already uses
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _ocr_in_worker(image_path: str, preprocess: bool, config: str) -> OcrResult:
+    start = time.perf_counter()
+    try:
+        text = ocr_image(image_path, preprocess, config)
+    except Exception as e:
+        return OcrResult(None, time.perf_counter() - start, str(e))
+    return OcrResult(text, time.perf_counter() - start)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # UNIFIED CARD PARSER
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -102,14 +306,18 @@ class ObjectiveCardParser:
         'NEXT AVAILABLE SCHEMES',
     ]
     
-    def __init__(self):
+    def __init__(self, preprocess: bool = True, tesseract_config: str = ''):
         self.vp_pattern = re.compile(r'SCORED\s*VP[:\s]*([□LJ\[\]O0\s]+)', re.IGNORECASE)
+        self.preprocess = preprocess
+        self.tesseract_config = tesseract_config
     
     def parse_image(self, image_path: str) -> ObjectiveCard:
         """Parse an objective card image (scheme or strategy)."""
-        img = Image.open(image_path)
-        raw_text = pytesseract.image_to_string(img)
-        
+        raw_text = ocr_image(image_path, self.preprocess, self.tesseract_config)
+        return self.parse_ocr_text(raw_text, image_path)
+    
+    def parse_ocr_text(self, raw_text: str, image_path: str) -> ObjectiveCard:
+        """Parse the OCR text of an objective card image."""
         # Detect card type from footer
         card_type = self._detect_card_type(raw_text)
         
@@ -412,8 +620,78 @@ class ObjectiveCardParser:
 class ObjectiveCardBatchProcessor:
     """Process directories of objective card images."""
     
-    def __init__(self):
-        self.parser = ObjectiveCardParser()
+    def __init__(self, workers: int = 1, cache_dir: str = None,
+                 preprocess: bool = True, tesseract_config: str = ''):
+        self.parser = ObjectiveCardParser(preprocess, tesseract_config)
+        self.workers = workers
+        self.cache = OcrCache(cache_dir, preprocess, tesseract_config) if cache_dir else None
+    
+    def ocr_files(self, image_files: List[str]) -> Dict[str, OcrResult]:
+        """
+        OCR text for each image: from the cache where possible, the rest
+        sequentially or across a process pool. Returns {image path:
+        OcrResult}, so callers see the same result whatever order the
+        workers finish in. An image that kills its worker process (e.g. a
+        tesseract crash) is retried alone and reported as failed if it
+        crashes again; the rest of the run carries on.
+        """
+        results: Dict[str, OcrResult] = {}
+        todo = []
+        for path in image_files:
+            cached = self.cache.get(path) if self.cache else None
+            if cached is not None:
+                results[path] = cached
+            else:
+                todo.append(path)
+        
+        start = time.perf_counter()
+        
+        def collect(path: str, result: OcrResult):
+            results[path] = result
+            if self.cache and result.text is not None:
+                self.cache.put(path, result)
+            print(f"  OCR [{len(results)}/{len(image_files)}] {Path(path).name} "
+                  f"({result.seconds:.1f}s)")
+        
+        args = (self.parser.preprocess, self.parser.tesseract_config)
+        if self.workers <= 1 or len(todo) <= 1:
+            for path in todo:
+                collect(path, _ocr_in_worker(path, *args))
+        else:
+            pending = list(reversed(todo))  # pop() from the end keeps input order
+            suspects: List[str] = []
+            while pending:
+                in_flight = {}
+                try:
+                    with ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_ocr_worker) as pool:
+                        while pending or in_flight:
+                            # Bounded window: a pool crash only puts these in doubt
+                            while pending and len(in_flight) < self.workers * 2:
+                                path = pending.pop()
+                                in_flight[pool.submit(_ocr_in_worker, path, *args)] = path
+                            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                result = future.result()
+                                collect(in_flight.pop(future), result)
+                except BrokenProcessPool:
+                    suspects += in_flight.values()
+            
+            # A worker died mid-image: retry each in-flight image in its own process
+            for path in sorted(suspects):
+                try:
+                    with ProcessPoolExecutor(max_workers=1, initializer=_init_ocr_worker) as pool:
+                        result = pool.submit(_ocr_in_worker, path, *args).result()
+                except BrokenProcessPool:
+                    result = OcrResult(None, error="worker process crashed")
+                collect(path, result)
+        
+        if todo:
+            workers = f" ({self.workers} workers)" if self.workers > 1 else ""
+            print(f"OCR'd {len(todo)} images in {time.perf_counter() - start:.1f}s{workers}")
+        if self.cache:
+            print(self.cache.summary())
+        return results
     
     def process_directory(self, input_dir: str, recursive: bool = True) -> List[ObjectiveCard]:
         """Process all card images in a directory (and subdirectories if recursive)."""
@@ -430,14 +708,19 @@ class ObjectiveCardBatchProcessor:
                 image_files.extend(input_path.glob(pattern))   # flat
         
         # Filter to only front images (skip backs)
-        image_files = [f for f in image_files if '_back' not in f.name.lower()]
+        image_files = sorted(str(f) for f in image_files if '_back' not in f.name.lower())
         
         print(f"Found {len(image_files)} card images in {input_dir}")
+        texts = self.ocr_files(image_files)
         
-        for img_path in sorted(image_files):
-            print(f"  Parsing: {img_path.name}", end=" ... ")
+        for img_path in image_files:
+            print(f"  Parsing: {Path(img_path).name}", end=" ... ")
+            ocr = texts[img_path]
+            if ocr.text is None:
+                print(f"FAIL ERROR: {ocr.error}")
+                continue
             try:
-                card = self.parser.parse_image(str(img_path))
+                card = self.parser.parse_ocr_text(ocr.text, img_path)
                 results.append(card)
                 print(f"OK {card.card_type}: {card.name}")
             except Exception as e:
@@ -556,6 +839,9 @@ Examples:
   
   # Parse schemes and strategies from separate directories
   python parse_objective_cards.py --input "./Scheme Cards" --input "./Strategy Cards" -o all.json
+  
+  # OCR in 4 processes; re-runs reuse cached OCR text
+  python parse_objective_cards.py --input ./cards --workers 4 --cache .ocr_cache
         """
     )
     
@@ -564,10 +850,23 @@ Examples:
     parser.add_argument('--output', '-o', default='objectives.json', help='Output JSON file')
     parser.add_argument('--no-recursive', action='store_true', help='Do not scan subdirectories')
     parser.add_argument('--summary', action='store_true', help='Print summary after parsing')
+    parser.add_argument('--workers', '-w', type=int, default=1, metavar='N',
+                        help='OCR images in N worker processes (default: 1)')
+    parser.add_argument('--cache', metavar='DIR',
+                        help='OCR text cache directory; unchanged images are not OCR\'d again')
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help='OCR the full-color image as-is (no grayscale/binarize/crop)')
+    parser.add_argument('--tesseract-config', default='', metavar='FLAGS',
+                        help='Extra tesseract flags, e.g. "--psm 6"')
     
     args = parser.parse_args()
     
-    processor = ObjectiveCardBatchProcessor()
+    processor = ObjectiveCardBatchProcessor(
+        workers=args.workers,
+        cache_dir=args.cache,
+        preprocess=not args.no_preprocess,
+        tesseract_config=args.tesseract_config,
+    )
     cards = []
     
     if args.single:
@@ -14,6 +14,8 @@ import re
 import sys
 from collections import Counter
 
+from keyword_matcher import KeywordMatcher
+
 KEYWORD_PATTERNS = {
     # ARCANISTS
     'Academic': ['AAccaaddeemmiicc'],
@@ -115,6 +117,19 @@ KEYWORD_PATTERNS = {
 }
 
 
+_matcher = None
+
+
+def keyword_matcher():
+    """All KEYWORD_PATTERNS spellings in one automaton, built once per process."""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher((pattern.lower(), keyword)
+                                  for keyword, patterns in KEYWORD_PATTERNS.items()
+                                  for pattern in patterns)
+    return _matcher
+
+
 def extract_keywords(raw_text):
     if not raw_text:
         return []
@@ -125,12 +140,10 @@ def extract_keywords(raw_text):
     raw_joined = keyword_section.replace('\n', '').replace(' ', '')
     raw_joined_lower = raw_joined.lower()
     
-    for keyword, patterns in KEYWORD_PATTERNS.items():
-        for pattern in patterns:
-            if pattern.lower() in raw_joined_lower:
-                if keyword not in keywords_found:
-                    keywords_found.append(keyword)
-                break
+    found = keyword_matcher().values(raw_joined_lower)
+    for keyword in KEYWORD_PATTERNS:
+        if keyword in found:
+            keywords_found.append(keyword)
     
     return keywords_found
 
@@ -20,7 +20,9 @@ import json
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from card_cache import CardResultCache
 
 
 # =============================================================================
@@ -295,8 +297,19 @@ def apply_corrections(card: dict, corrections: dict) -> List[str]:
 # MAIN CLASSIFIER
 # =============================================================================
 
-def classify_all_cards(cards: List[dict], corrections: dict = None) -> Tuple[List[dict], dict]:
-    """Classify all cards and return updated cards + stats."""
+# Fields written by classify_all_cards - excluded from the per-card cache key
+OUTPUT_FIELDS = ['roles', '_role_scores']
+
+
+def classify_all_cards(cards: List[dict], corrections: dict = None,
+                       cache: Optional[CardResultCache] = None) -> Tuple[List[dict], dict]:
+    """
+    Classify all cards and return updated cards + stats.
+    
+    If a cache is given, unchanged cards reuse their stored classification.
+    Corrections are applied after the cache lookup, so editing
+    corrections_roles.json never requires re-classifying.
+    """
     stats = {
         'total': len(cards),
         'role_counts': defaultdict(int),
@@ -306,7 +319,13 @@ def classify_all_cards(cards: List[dict], corrections: dict = None) -> Tuple[Lis
     }
     
     for card in cards:
-        result = classify_card(card)
+        cached = cache.get(card) if cache else None
+        if cached is not None:
+            result = dict(cached)
+        else:
+            result = classify_card(card)
+            if cache:
+                cache.put(card, {'roles': result['roles'], 'role_scores': result['role_scores']})
         
         # Apply corrections if available
         if corrections:
@@ -378,13 +397,16 @@ def main():
                         help='Manual corrections file')
     parser.add_argument('--dry-run', action='store_true', help='Show stats only')
     parser.add_argument('--debug', type=str, metavar='NAME', help='Debug a specific card')
+    parser.add_argument('--cache', type=Path, help='Per-card result cache file')
     
     args = parser.parse_args()
     
     # Load cards
     print(f"Loading: {args.input}")
     with open(args.input, 'r', encoding='utf-8') as f:
-        cards = json.load(f)
+        data = json.load(f)
+    # Handle both list and {cards: [...]} formats
+    cards = data.get('cards', []) if isinstance(data, dict) else data
     print(f"Loaded {len(cards)} cards")
     
     # Debug mode
@@ -398,9 +420,15 @@ def main():
         corrections = load_corrections(args.corrections)
         print(f"Loaded {len(corrections)} corrections")
     
+    cache = CardResultCache.for_stage(args.cache, 'role_classifier_v2', __file__,
+                                      output_fields=OUTPUT_FIELDS)
+    
     # Classify
     print(f"\nClassifying cards using Malifaux roles...")
-    cards, stats = classify_all_cards(cards, corrections)
+    cards, stats = classify_all_cards(cards, corrections, cache)
+    if cache.enabled:
+        cache.save()
+        print(f"Cache: {cache.summary()}")
     
     # Print stats
     print(f"\n{'='*60}")
@@ -438,7 +466,7 @@ def main():
             print(f"\n{role.upper()} (canonical: {', '.join(examples)}):")
             for c in samples:
                 score = c.get('_role_scores', {}).get(role, 0)
-                print(f"  - {c['name']} ({c['station']}) [score: {score:.1f}]")
+                print(f"  - {c['name']} ({c.get('station')}) [score: {score:.1f}]")
     
     # Cards with no roles
     no_role_cards = [c for c in cards if not c.get('roles')]
@@ -459,7 +487,7 @@ def main():
         if leaders:
             print(f"\n[!] UNCLASSIFIED LEADERS ({len(leaders)}):")
             for c in leaders[:10]:
-                print(f"  - {c['name']} ({c['station']})")
+                print(f"  - {c['name']} ({c.get('station')})")
     
     # Save output
     if args.output and not args.dry_run:
@@ -468,7 +496,7 @@ def main():
             card.pop('_role_scores', None)
         
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(cards, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"\nSaved to: {args.output}")
     elif not args.dry_run:
         print(f"\nUse -o FILE to save output")
@@ -27,6 +27,8 @@ from dataclasses import dataclass, field, asdict
 from typing import Optional, List, Dict, Set, Tuple
 from collections import Counter
 
+from card_cache import CardResultCache
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAXONOMY - The controlled vocabulary for all tags
@@ -572,7 +574,7 @@ class TagExtractor:
         # Raw text fallback
         texts.append(card.get('raw_text', ''))
         
-        combined = ' '.join(texts)
+        combined = ' '.join(t for t in texts if t)
         
         # Extract all tag categories
         result = {
@@ -683,10 +685,10 @@ class RoleInferencer:
         has_ranged = False
         max_range = 0
         for action in card.get('attack_actions', []):
-            skill = action.get('skill')
-            if skill and skill.isdigit():
+            skill = str(action.get('skill') or '')
+            if skill.isdigit():
                 attack_stat = max(attack_stat, int(skill))
-            rng = action.get('range', '')
+            rng = str(action.get('range') or '')
             # Ranged = starts with a number, not 'y' (melee)
             # Format is like "8"" or "12"" or "y1"" or "y2""
             if rng:
@@ -788,7 +790,7 @@ class RoleInferencer:
         tactical_ranged = False
         tactical_max_range = 0
         for action in card.get('tactical_actions', []):
-            rng = action.get('range', '')
+            rng = str(action.get('range') or '')
             desc = (action.get('description', '') or '').lower()
             if rng and not rng.startswith('y'):
                 range_match = re.match(r'^(\d+)', rng)
@@ -834,7 +836,7 @@ class RoleInferencer:
         
         # ─── Melee Damage ───
         has_melee = any(
-            a.get('range', '').startswith('y') 
+            str(a.get('range') or '').startswith('y') 
             for a in card.get('attack_actions', [])
         )
         if has_melee and attack_stat >= 6:
@@ -917,14 +919,22 @@ class RoleInferencer:
 # ENRICHMENT PIPELINE
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Fields written by enrich_cards - excluded from the per-card cache key
+OUTPUT_FIELDS = ['extracted_tags', 'inferred_roles', 'roles', 'role_confidence']
+
+
 def enrich_cards(
     cards: List[dict],
     extractor: TagExtractor,
-    inferencer: RoleInferencer
+    inferencer: RoleInferencer,
+    cache: Optional[CardResultCache] = None
 ) -> Tuple[List[dict], List[dict]]:
     """
     Enrich all cards with extracted tags and inferred roles.
     
+    If a cache is given, cards whose source fields are unchanged reuse
+    their stored tags/roles and only dirty cards are re-extracted.
+    
     Returns:
         Tuple of (enriched_cards, review_queue)
     """
@@ -937,11 +947,19 @@ def enrich_cards(
             enriched.append(card)
             continue
         
-        # Extract tags
-        extracted = extractor.extract_all_from_card(card)
-        
-        # Infer roles
-        inferred_roles = inferencer.infer_roles(card, extracted)
+        cached = cache.get(card) if cache else None
+        if cached is not None:
+            extracted = cached['extracted_tags']
+            inferred_roles = cached['inferred_roles']
+        else:
+            # Extract tags
+            extracted = extractor.extract_all_from_card(card)
+            
+            # Infer roles
+            inferred_roles = inferencer.infer_roles(card, extracted)
+            
+            if cache:
+                cache.put(card, {'extracted_tags': extracted, 'inferred_roles': inferred_roles})
         
         # Add to card
         card['extracted_tags'] = extracted
@@ -1049,6 +1067,10 @@ def main():
         action='store_true',
         help='Print extraction report'
     )
+    parser.add_argument(
+        '--cache',
+        help='Per-card result cache file (reuses results for unchanged cards)'
+    )
     
     args = parser.parse_args()
     
@@ -1057,7 +1079,8 @@ def main():
     with open(args.input, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    cards = data.get('cards', [])
+    # Handle both list and {cards: [...]} formats
+    cards = data.get('cards', []) if isinstance(data, dict) else data
     print(f"Loaded {len(cards)} cards")
     
     # Load custom taxonomy if provided
@@ -1070,13 +1093,24 @@ def main():
     extractor = TagExtractor(taxonomy)
     inferencer = RoleInferencer()
     
+    cache = CardResultCache.for_stage(
+        args.cache, 'tag_extractor', __file__,
+        salt=taxonomy, output_fields=OUTPUT_FIELDS
+    )
+    
     # Enrich cards
     print("Extracting tags and inferring roles...")
-    enriched, review_queue = enrich_cards(cards, extractor, inferencer)
+    enriched, review_queue = enrich_cards(cards, extractor, inferencer, cache)
+    if cache.enabled:
+        cache.save()
+        print(f"  Cache: {cache.summary()}")
     
     # Update data
-    data['cards'] = enriched
-    data['enrichment_version'] = '1.0'
+    if isinstance(data, dict):
+        data['cards'] = enriched
+        data['enrichment_version'] = '1.0'
+    else:
+        data = enriched
     
     # Write output
     print(f"Writing enriched data to {args.output}...")
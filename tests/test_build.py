@@ -0,0 +1,63 @@
+"""Tests for build.py (stage fingerprints)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build
+from build import BuildState, Config, build_stage_graph, output_hashes, stage_fingerprint, stage_is_current
+
+
+def parse_stage(config: Config) -> build.Stage:
+    return next(s for s in build_stage_graph(config) if s.name == "parse")
+
+
+def test_changed_front_image_marks_parse_dirty(tmp_path):
+    pdfs = tmp_path / "data" / "raw" / "card_pdfs" / "Guild" / "Guard"
+    pdfs.mkdir(parents=True)
+    (pdfs / "M4E_Stat_Guard_One.pdf").write_bytes(b"%PDF guard")
+    images = tmp_path / "images" / "Guild" / "Guard"
+    images.mkdir(parents=True)
+    front = images / "M4E_Stat_Guard_One_front.png"
+    front.write_bytes(b"PNG 8 pips")
+
+    config = Config(tmp_path, tmp_path / "images")
+    config.ensure_dirs()
+    stage = parse_stage(config)
+    for output in stage.outputs:
+        output.write_text("{}")
+    state = BuildState()
+    state.stages[stage.name] = dict(stage_fingerprint(config, stage),
+                                    outputs=output_hashes(config, stage))
+    assert stage_is_current(config, stage, state, stage_fingerprint(config, stage))
+
+    front.write_bytes(b"PNG 9 pips")
+
+    stage = parse_stage(config)
+    assert not stage_is_current(config, stage, state, stage_fingerprint(config, stage))
+
+
+def test_memory_stage_reruns_only_when_kept_cards_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, "CARD_MEMORY", build.CardMemory())
+    config = Config(tmp_path)
+    stage = next(s for s in build.memory_stages(config, build_stage_graph(config))
+                 if s.name == "fix_cards")
+    assert stage.memory_inputs == ["repair_all"]
+
+    build.CARD_MEMORY.put("repair_all", {}, [{"id": "guard_one", "health": 8}])
+    fingerprint = stage_fingerprint(config, stage)
+    build.CARD_MEMORY.put("fix_cards", fingerprint, [{"id": "guard_one", "health": 8}])
+    state = BuildState()
+    state.stages[stage.name] = dict(fingerprint, outputs={})
+    assert stage_is_current(config, stage, state, stage_fingerprint(config, stage))
+
+    build.CARD_MEMORY.put("repair_all", {}, [{"id": "guard_one", "health": 8}])
+    assert stage_is_current(config, stage, state, stage_fingerprint(config, stage))
+
+    build.CARD_MEMORY.put("repair_all", {}, [{"id": "guard_one", "health": 9}])
+    assert not stage_is_current(config, stage, state, stage_fingerprint(config, stage))
+
+    monkeypatch.setattr(build, "CARD_MEMORY", build.CardMemory())
+    build.CARD_MEMORY.put("repair_all", {}, [{"id": "guard_one", "health": 8}])
+    assert not stage_is_current(config, stage, state, stage_fingerprint(config, stage))
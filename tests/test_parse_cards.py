@@ -0,0 +1,77 @@
+"""Tests for scripts/pipeline/parse_cards.py (streamed, cached directory runs)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts" / "pipeline"))
+pytest.importorskip("pdfplumber")
+
+import parse_cards
+from parse_cards import CardStream, MalifauxCardParser, ParseCache, ParseResult, file_digest, parser_identity
+
+
+def card(name: str) -> dict:
+    return {'id': name, 'name': name, 'faction': 'Guild', 'subfaction': 'Guard',
+            'card_type': 'Stat', 'health': 8}
+
+
+@pytest.fixture
+def warm_run(tmp_path):
+    """Two PDFs (with front images), already in a --stream file and a warm --cache."""
+    pdf_dir = tmp_path / "pdfs" / "Guild" / "Guard"
+    pdf_dir.mkdir(parents=True)
+    pdfs = []
+    for name in ("M4E_Stat_Guard_One", "M4E_Stat_Guard_Two"):
+        pdf = pdf_dir / f"{name}.pdf"
+        pdf.write_bytes(f"%PDF {name}".encode())
+        (pdf_dir / f"{name}_front.png").write_bytes(f"PNG {name}".encode())
+        pdfs.append(str(pdf))
+
+    parser = MalifauxCardParser()
+    cache_dir = tmp_path / "cache"
+    cache = ParseCache(str(cache_dir), parser)
+    stream = CardStream(str(tmp_path / "cards.jsonl"), parser_identity(parser))
+    for pdf in pdfs:
+        result = ParseResult(card(Path(pdf).stem))
+        cache.put(pdf, result)
+        stream.append(pdf, file_digest(pdf), parser.front_image_digest(pdf), result)
+        entry = cache_dir / "images" / "xx" / f"{parser.image_cache_key(parser.front_image_digest(pdf))}.json"
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        entry.write_text("[8, false]")
+    stream.close()
+    return tmp_path, cache_dir
+
+
+def run(tmp_path, cache_dir):
+    MalifauxCardParser().parse_directory(
+        str(tmp_path / "pdfs"), str(tmp_path / "cards.json"),
+        cache_dir=str(cache_dir), stream_file=str(tmp_path / "cards.jsonl"))
+
+
+def test_resumed_stream_keeps_cache_entries(warm_run, monkeypatch):
+    tmp_path, cache_dir = warm_run
+    monkeypatch.setattr(parse_cards.MalifauxCardParser, 'read_pdf',
+                        lambda self, path: pytest.fail(f"resumed PDF was parsed: {path}"))
+
+    run(tmp_path, cache_dir)
+
+    assert len(list(cache_dir.glob('??/*.json'))) == 2
+    assert len(list(cache_dir.glob('images/??/*.json'))) == 2
+
+
+def test_changed_front_image_is_not_resumed(warm_run, monkeypatch):
+    tmp_path, cache_dir = warm_run
+    changed = tmp_path / "pdfs" / "Guild" / "Guard" / "M4E_Stat_Guard_Two_front.png"
+    changed.write_bytes(b"PNG redrawn health track")
+    parsed = []
+
+    def parse_group(self, paths):
+        parsed.extend(paths)
+        return {p: ParseResult(card(Path(p).stem)) for p in paths}
+    monkeypatch.setattr(parse_cards.MalifauxCardParser, 'parse_group', parse_group)
+
+    run(tmp_path, cache_dir)
+
+    assert [Path(p).name for p in parsed] == ["M4E_Stat_Guard_Two.pdf"]